@@ -11,9 +11,11 @@
 #
 # http://www.cecill.info
 
+from pixano.analytics.duplicates import find_duplicates
 from pixano.analytics.feature_statistics import compute_additional_data, compute_stats
 
 __all__ = [
     "compute_additional_data",
     "compute_stats",
+    "find_duplicates",
 ]
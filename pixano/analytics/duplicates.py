@@ -0,0 +1,306 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+from collections.abc import Iterator
+from typing import Optional
+
+import lance
+import numpy as np
+import pyarrow as pa
+
+from pixano.data import Dataset, DatasetTable, Fields
+from pixano.utils import dequantize_vectors
+
+DUPLICATES_TABLE = "duplicates"
+
+# Tables searched with exact distances, as a float32 matrix of all their vectors
+EXACT_MAX_ROWS = 50000
+
+
+def _find_root(parents: dict[str, str], id: str) -> str:
+    """Find cluster representative of an item, compressing the path to it
+
+    Args:
+        parents (dict[str, str]): Parent item ID by item ID
+        id (str): Item ID
+
+    Returns:
+        str: Representative item ID
+    """
+
+    root = id
+    while parents.get(root, root) != root:
+        root = parents[root]
+    while id != root:
+        parents[id], id = root, parents[id]
+    return root
+
+
+def _union(parents: dict[str, str], id_1: str, id_2: str):
+    """Merge clusters of two items, keeping the first item in (length, ID) order as representative
+
+    Args:
+        parents (dict[str, str]): Parent item ID by item ID
+        id_1 (str): First item ID
+        id_2 (str): Second item ID
+    """
+
+    root_1, root_2 = _find_root(parents, id_1), _find_root(parents, id_2)
+    if root_1 != root_2:
+        if (len(root_2), root_2) < (len(root_1), root_1):
+            root_1, root_2 = root_2, root_1
+        parents[root_2] = root_1
+
+
+def _read_vectors(
+    batch: pa.RecordBatch,
+    view: str,
+    scale: Optional[float] = None,
+) -> np.ndarray:
+    """Read a batch of vectors as a float32 matrix
+
+    Args:
+        batch (pa.RecordBatch): Batch of embeddings table rows
+        view (str): View vector column
+        scale (float, optional): int8 quantization scale. Defaults to None.
+
+    Returns:
+        np.ndarray: Vectors, one per row
+    """
+
+    return dequantize_vectors(
+        batch[view].flatten().to_numpy().reshape(batch.num_rows, -1), scale
+    )
+
+
+def _exact_neighbors(
+    lance_table: lance.LanceDataset,
+    view: str,
+    scale: Optional[float],
+    threshold: float,
+    k: int,
+    batch_size: int,
+) -> Iterator[tuple[str, str]]:
+    """Find pairs of close items with exact distances, for tables small enough to fit in memory
+
+    Vectors are read once as a float32 matrix, then the distances between each
+    pair of blocks of vectors are computed with one matrix product.
+
+    Args:
+        lance_table (lance.LanceDataset): Embeddings table
+        view (str): View vector column
+        scale (float, optional): int8 quantization scale
+        threshold (float): Maximum distance between duplicates (squared L2)
+        k (int): Number of neighbors searched per item, including itself
+        batch_size (int): Number of vectors per block
+
+    Yields:
+        Iterator[tuple[str, str]]: Item ID and close neighbor ID
+    """
+
+    ids, blocks = [], []
+    for batch in lance_table.to_batches(
+        columns=["id", view], filter=f"{view} IS NOT NULL", batch_size=batch_size
+    ):
+        if batch.num_rows > 0:
+            ids.extend(batch["id"].to_pylist())
+            blocks.append(_read_vectors(batch, view, scale))
+    if not blocks:
+        return
+    vectors = np.concatenate(blocks)
+    norms = np.square(vectors).sum(axis=1)
+    k = min(k, len(vectors))
+
+    for start in range(0, len(vectors), batch_size):
+        block = vectors[start : start + batch_size]
+
+        # Squared L2 distances between the block and all vectors
+        distances = norms[start : start + batch_size, None] + norms[None, :]
+        distances -= 2 * block @ vectors.T
+        np.maximum(distances, 0, out=distances)
+
+        # Keep the k best neighbors of each vector of the block
+        best = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        best_distances = np.take_along_axis(distances, best, axis=1)
+        own_positions = np.arange(start, start + len(block))[:, None]
+        rows, cols = np.nonzero((best != own_positions) & (best_distances <= threshold))
+        for row, col in zip(rows, cols):
+            yield ids[start + row], ids[best[row, col]]
+
+
+def _ann_neighbors(
+    lance_table: lance.LanceDataset,
+    view: str,
+    scale: Optional[float],
+    threshold: float,
+    k: int,
+    batch_size: int,
+    nprobes: Optional[int] = None,
+    refine_factor: Optional[int] = 1,
+) -> Iterator[tuple[str, str]]:
+    """Find pairs of close items with the ANN index of the view, reading each block of vectors once
+
+    Args:
+        lance_table (lance.LanceDataset): Embeddings table
+        view (str): View vector column, with an ANN index
+        scale (float, optional): int8 quantization scale
+        threshold (float): Maximum distance between duplicates (squared L2)
+        k (int): Number of neighbors searched per item, including itself
+        batch_size (int): Number of vectors read at once
+        nprobes (int, optional): Number of IVF partitions searched. Defaults to None for Lance default.
+        refine_factor (int, optional): Re-rank refine_factor * k candidates with exact distances. Defaults to 1 to compare exact distances to the threshold.
+
+    Yields:
+        Iterator[tuple[str, str]]: Item ID and close neighbor ID
+    """
+
+    value_type = lance_table.schema.field(view).type.value_type.to_pandas_dtype()
+    for batch in lance_table.to_batches(
+        columns=["id", view], filter=f"{view} IS NOT NULL", batch_size=batch_size
+    ):
+        if batch.num_rows == 0:
+            continue
+        vectors = _read_vectors(batch, view, scale).astype(value_type)
+        for id, vector in zip(batch["id"].to_pylist(), vectors):
+            nearest = {"column": view, "q": vector, "k": k}
+            if nprobes is not None:
+                nearest["nprobes"] = nprobes
+            if refine_factor is not None:
+                nearest["refine_factor"] = refine_factor
+            results = lance_table.to_table(columns=["id"], nearest=nearest)
+            for distance, neighbor_id in zip(
+                results["_distance"].to_pylist(), results["id"].to_pylist()
+            ):
+                if neighbor_id != id and distance <= threshold:
+                    yield id, neighbor_id
+
+
+def find_duplicates(
+    dataset: Dataset,
+    model: Optional[str] = None,
+    view: Optional[str] = None,
+    threshold: float = 0.05,
+    k: int = 10,
+    batch_size: int = 1024,
+    nprobes: Optional[int] = None,
+    refine_factor: Optional[int] = 1,
+) -> pa.Table:
+    """Find near-duplicate items from semantic search embeddings, and save duplicate clusters to an active learning table
+
+    Tables of at most EXACT_MAX_ROWS rows are searched with exact distances,
+    computed block by block with matrix products on vectors read once. Larger
+    tables are searched item by item with the ANN index of the view, which is
+    created if missing. Items closer than the threshold are merged into the
+    same cluster.
+
+    Args:
+        dataset (Dataset): Dataset
+        model (str, optional): Model of semantic search embeddings. Defaults to None for the first embeddings table.
+        view (str, optional): View vector column. Defaults to None for the first view of the embeddings table.
+        threshold (float, optional): Maximum distance between duplicates, as returned by Lance (squared L2). Defaults to 0.05.
+        k (int, optional): Number of neighbors searched per item, including itself. Defaults to 10.
+        batch_size (int, optional): Number of vectors read at once. Defaults to 1024.
+        nprobes (int, optional): Number of IVF partitions searched with the ANN index. Defaults to None for Lance default.
+        refine_factor (int, optional): Re-rank refine_factor * k ANN candidates with exact distances. Defaults to 1.
+
+    Returns:
+        pa.Table: Duplicates table, with the cluster representative ID of each item and whether it is a duplicate
+    """
+
+    # Find semantic search embeddings table
+    ds_tables = dataset.open_tables()
+    emb_table = next(
+        (
+            table
+            for table in dataset.info.tables.get("embeddings", [])
+            if table.type == "search"
+            and (model is None or table.source == model)
+            and table.source in ds_tables["embeddings"]
+        ),
+        None,
+    )
+    if emb_table is None:
+        raise ValueError(f"No semantic search embeddings found for model '{model}'")
+    views = [
+        field_name
+        for field_name, field_type in emb_table.fields.items()
+        if field_type.startswith("vector(")
+    ]
+    view = view if view is not None else views[0]
+    if view not in views:
+        raise ValueError(f"No semantic search embeddings found for view '{view}'")
+    lance_table: lance.LanceDataset = ds_tables["embeddings"][
+        emb_table.source
+    ].to_lance()
+
+    # Search neighbors exactly in small tables, or with the ANN index of the view
+    scale = (emb_table.scales or {}).get(view)
+    search_kwargs = dict(
+        lance_table=lance_table,
+        view=view,
+        scale=scale,
+        threshold=threshold,
+        k=k,
+        batch_size=batch_size,
+    )
+    if lance_table.count_rows() > EXACT_MAX_ROWS:
+        if not any(index.column == view for index in emb_table.indexes or []):
+            dataset.create_vector_indexes([emb_table.name])
+        if any(index.column == view for index in emb_table.indexes or []):
+            search_kwargs["lance_table"] = ds_tables["embeddings"][
+                emb_table.source
+            ].to_lance()
+            neighbors = _ann_neighbors(
+                **search_kwargs, nprobes=nprobes, refine_factor=refine_factor
+            )
+        else:
+            # int8 vectors have no ANN index
+            neighbors = _exact_neighbors(**search_kwargs)
+    else:
+        neighbors = _exact_neighbors(**search_kwargs)
+
+    # Merge clusters of close items
+    parents: dict[str, str] = {}
+    for id, neighbor_id in neighbors:
+        _union(parents, id, neighbor_id)
+
+    # Write cluster representative of each item
+    ids = dataset.open_table("db").to_lance().to_table(columns=["id"])["id"]
+    clusters = [_find_root(parents, id) for id in ids.to_pylist()]
+    table = DatasetTable(
+        name=DUPLICATES_TABLE,
+        fields={"id": "str", "duplicate_cluster": "str", "is_duplicate": "bool"},
+        source="Duplicates",
+    )
+    duplicates = pa.Table.from_pydict(
+        {
+            "id": ids,
+            "duplicate_cluster": clusters,
+            "is_duplicate": [
+                cluster != id for id, cluster in zip(ids.to_pylist(), clusters)
+            ],
+        },
+        schema=Fields(table.fields).to_schema(),
+    )
+    dataset.connect().create_table(DUPLICATES_TABLE, duplicates, mode="overwrite")
+
+    # Add table to DatasetInfo, replacing previous duplicates table
+    dataset.info.tables["active_learning"] = [
+        al_table
+        for al_table in dataset.info.tables.get("active_learning", [])
+        if al_table.name != DUPLICATES_TABLE
+    ] + [table]
+    dataset.save_info()
+    dataset.build_order()
+
+    return duplicates
@@ -15,7 +15,7 @@ from functools import lru_cache
 
 from fastapi import APIRouter, HTTPException
 
-from pixano.data import Dataset, DatasetInfo, Settings
+from pixano.data import DatasetInfo, DatasetRegistry, Settings
 
 router = APIRouter(tags=["datasets"])
 
@@ -31,6 +31,16 @@ def get_settings():
     return Settings()
 
 
+def get_registry() -> DatasetRegistry:
+    """Get dataset registry shared by the app
+
+    Returns:
+        DatasetRegistry: Dataset registry
+    """
+
+    return DatasetRegistry.from_directory(get_settings().data_dir)
+
+
 @router.get("/datasets", response_model=list[DatasetInfo])
 async def get_datasets() -> list[DatasetInfo]:
     """Load dataset list
@@ -67,7 +77,7 @@ async def get_dataset(ds_id: str) -> DatasetInfo:
     """
 
     # Load dataset
-    dataset = Dataset.find(ds_id, get_settings().data_dir)
+    dataset = get_registry().find(ds_id)
 
     # Return dataset info
     if dataset:
@@ -12,15 +12,31 @@
 # http://www.cecill.info
 
 from functools import lru_cache
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Response
 from fastapi_pagination import Page, Params
 from fastapi_pagination.api import create_page, resolve_params
-
-from pixano.data import Dataset, DatasetItem, Settings
+from fastapi_pagination.cursor import CursorPage, CursorParams
+
+from pixano.data import (
+    Dataset,
+    DatasetItem,
+    DatasetQuery,
+    DatasetRegistry,
+    DatasetSearchQuery,
+    Settings,
+)
 
 router = APIRouter(tags=["items"], prefix="/datasets/{ds_id}")
 
+# Maximum number of items loaded from their IDs at once, same as maximum page size
+MAX_BATCH_SIZE = 100
+
+# Table groups read by item list endpoints and by the item endpoint
+LIST_GROUPS = ["main", "media", "active_learning"]
+ITEM_GROUPS = ["main", "media", "active_learning", "objects"]
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -33,6 +49,40 @@ def get_settings() -> Settings:
     return Settings()
 
 
+def get_registry() -> DatasetRegistry:
+    """Get dataset registry shared by the app
+
+    Returns:
+        DatasetRegistry: Dataset registry
+    """
+
+    return DatasetRegistry.from_directory(get_settings().data_dir)
+
+
+def item_columns(dataset: Dataset, groups: list[str]) -> dict[str, list[str]]:
+    """Get columns read by an item endpoint, as dataset item loading reads all columns by default
+
+    Args:
+        dataset (Dataset): Dataset
+        groups (list[str]): Table groups whose fields are returned by the endpoint
+
+    Returns:
+        dict[str, list[str]]: Fields of dataset tables in given groups, and only key columns in other groups
+    """
+
+    columns = {
+        group: []
+        for group in ["main", "media", "active_learning", "objects", "embeddings"]
+    }
+    for group in groups:
+        for table in dataset.info.tables.get(group, []):
+            columns[group].extend(
+                field for field in table.fields if field not in columns[group]
+            )
+
+    return columns
+
+
 @router.get("/items", response_model=Page[DatasetItem])
 async def get_dataset_items(
     ds_id: str,
@@ -49,7 +99,7 @@ async def get_dataset_items(
     """
 
     # Load dataset
-    dataset = Dataset.find(ds_id, get_settings().data_dir)
+    dataset = get_registry().find(ds_id)
 
     if dataset:
         # Get page parameters
@@ -67,7 +117,11 @@ async def get_dataset_items(
             )
 
         # Load dataset items
-        items = dataset.load_items(raw_params.limit, raw_params.offset)
+        items = dataset.load_items(
+            raw_params.limit,
+            raw_params.offset,
+            columns=item_columns(dataset, LIST_GROUPS),
+        )
 
         # Return dataset items
         if items:
@@ -84,31 +138,144 @@ async def get_dataset_items(
         )
 
 
+@router.get("/items/cursor", response_model=CursorPage[DatasetItem])
+async def get_dataset_items_cursor(
+    ds_id: str,
+    params: CursorParams = Depends(),
+) -> CursorPage[DatasetItem]:
+    """Load dataset items following a cursor
+
+    Args:
+        ds_id (str): Dataset ID
+        params (CursorParams, optional): Pagination parameters (cursor and size). Defaults to Depends().
+
+    Returns:
+        CursorPage[DatasetItem]: Dataset items page
+    """
+
+    # Load dataset
+    dataset = get_registry().find(ds_id)
+
+    if dataset:
+        # Get page parameters
+        raw_params = params.to_raw_params()
+
+        # Load dataset items
+        items = dataset.load_items_after(
+            raw_params.size,
+            raw_params.cursor,
+            columns=item_columns(dataset, LIST_GROUPS),
+        )
+
+        # Return dataset items, with an empty last page after a cursor
+        if items or raw_params.cursor is not None:
+            items = items or []
+            return create_page(
+                items,
+                params=params,
+                current=raw_params.cursor,
+                next_=items[-1].id if items and len(items) == raw_params.size else None,
+            )
+        else:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No items found after cursor '{raw_params.cursor}' in dataset",
+            )
+    else:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Dataset {ds_id} not found in {get_settings().data_dir.absolute()}",
+        )
+
+
+@router.post("/items/batch", response_model=list[DatasetItem])
+async def get_dataset_items_batch(
+    ds_id: str,
+    ids: list[str],
+    load_objects: bool = False,
+) -> list[DatasetItem]:
+    """Load dataset items from their IDs
+
+    Args:
+        ds_id (str): Dataset ID
+        ids (list[str]): Item IDs, at most MAX_BATCH_SIZE
+        load_objects (bool, optional): Load item objects. Defaults to False.
+
+    Returns:
+        list[DatasetItem]: Dataset items found, in the order of the given IDs
+    """
+
+    # Check number of IDs, as filtering on IDs gets slower with their number
+    if len(ids) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many item IDs ({len(ids)}), please request at most {MAX_BATCH_SIZE} items at once",
+        )
+
+    # Load dataset
+    dataset = get_registry().find(ds_id)
+
+    if dataset:
+        # Load dataset items
+        items = dataset.load_items_by_ids(
+            ids,
+            load_objects=load_objects,
+            columns=item_columns(dataset, ITEM_GROUPS if load_objects else LIST_GROUPS),
+        )
+
+        # Return dataset items
+        if items:
+            return items
+        else:
+            raise HTTPException(
+                status_code=404,
+                detail="No items found with given IDs in dataset",
+            )
+    else:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Dataset {ds_id} not found in {get_settings().data_dir.absolute()}",
+        )
+
+
 @router.post("/search", response_model=Page[DatasetItem])
 async def search_dataset_items(
     ds_id: str,
-    query: dict[str, str],
+    query: DatasetSearchQuery,
     params: Params = Depends(),
+    nprobes: Optional[int] = None,
+    refine_factor: Optional[int] = None,
 ) -> Page[DatasetItem]:
     """Load dataset items with a query
 
     Args:
         ds_id (str): Dataset ID
-        query (dict[str, str]): Search query
+        query (DatasetSearchQuery): Search query, with optional filters
         params (Params, optional): Pagination parameters (offset and limit). Defaults to Depends().
+        nprobes (int, optional): Number of IVF partitions searched in indexed views. Defaults to None.
+        refine_factor (int, optional): Re-rank factor for candidates of indexed views. Defaults to None.
 
     Returns:
         Page[DatasetItem]: Dataset items page
     """
 
     # Load dataset
-    dataset = Dataset.find(ds_id, get_settings().data_dir)
+    dataset = get_registry().find(ds_id)
 
     if dataset:
         # Get page parameters
         params = resolve_params(params)
         raw_params = params.to_raw_params()
-        total = dataset.num_rows
+
+        # Count items matching filters
+        try:
+            total = (
+                dataset.count_search_items(query.model, query.filters)
+                if query.filters
+                else dataset.num_rows
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
 
         # Check page parameters
         start = raw_params.offset
@@ -117,14 +284,26 @@ async def search_dataset_items(
             raise HTTPException(status_code=404, detail="Invalid page parameters")
 
         # Load dataset items
-        items = dataset.search_items(raw_params.limit, raw_params.offset, query)
+        try:
+            items = dataset.search_items(
+                raw_params.limit,
+                raw_params.offset,
+                {"model": query.model, "search": query.search},
+                nprobes=nprobes,
+                refine_factor=refine_factor,
+                filters=query.filters,
+                columns=item_columns(dataset, LIST_GROUPS),
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
 
         # Return dataset items
         if items:
             return create_page(items, total=total, params=params)
         else:
             raise HTTPException(
-                status_code=404, detail=f"No items found for query '{query}' in dataset"
+                status_code=404,
+                detail=f"No items found for query '{query.search}' in dataset",
             )
     else:
         raise HTTPException(
@@ -133,6 +312,58 @@ async def search_dataset_items(
         )
 
 
+@router.post("/query", response_model=CursorPage[DatasetItem])
+async def query_dataset_items(
+    ds_id: str,
+    query: DatasetQuery,
+    params: CursorParams = Depends(),
+) -> CursorPage[DatasetItem]:
+    """Load dataset items matching filters, sorted by a feature
+
+    Args:
+        ds_id (str): Dataset ID
+        query (DatasetQuery): Filters and sort order
+        params (CursorParams, optional): Pagination parameters (cursor and size). Defaults to Depends().
+
+    Returns:
+        CursorPage[DatasetItem]: Dataset items page
+    """
+
+    # Load dataset
+    dataset = get_registry().find(ds_id)
+
+    if dataset:
+        # Get page parameters
+        raw_params = params.to_raw_params()
+
+        # Load dataset items
+        try:
+            items = dataset.query_items(
+                raw_params.size,
+                filters=query.filters,
+                order_by=query.order_by,
+                descending=query.descending,
+                cursor=raw_params.cursor,
+                columns=item_columns(dataset, LIST_GROUPS),
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+
+        # Return dataset items, with an empty page if no items match
+        items = items or []
+        return create_page(
+            items,
+            params=params,
+            current=raw_params.cursor,
+            next_=items[-1].id if items and len(items) == raw_params.size else None,
+        )
+    else:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Dataset {ds_id} not found in {get_settings().data_dir.absolute()}",
+        )
+
+
 @router.get("/items/{item_id}", response_model=DatasetItem)
 async def get_dataset_item(ds_id: str, item_id: str) -> DatasetItem:
     """Load dataset item
@@ -146,11 +377,15 @@ async def get_dataset_item(ds_id: str, item_id: str) -> DatasetItem:
     """
 
     # Load dataset
-    dataset = Dataset.find(ds_id, get_settings().data_dir)
+    dataset = get_registry().find(ds_id)
 
     if dataset:
         # Load dataset item
-        item = dataset.load_item(item_id, load_objects=True)
+        item = dataset.load_item(
+            item_id,
+            load_objects=True,
+            columns=item_columns(dataset, ITEM_GROUPS),
+        )
 
         # Return dataset item
         if item:
@@ -177,7 +412,7 @@ async def post_dataset_item(ds_id: str, item: DatasetItem):
     """
 
     # Load dataset
-    dataset = Dataset.find(ds_id, get_settings().data_dir)
+    dataset = get_registry().find(ds_id)
 
     if dataset:
         # Save dataset item
@@ -192,6 +427,61 @@ async def post_dataset_item(ds_id: str, item: DatasetItem):
         )
 
 
+@router.get("/items/{item_id}/similar", response_model=list[DatasetItem])
+async def get_similar_items(
+    ds_id: str,
+    item_id: str,
+    view: str,
+    k: int = 20,
+    model: Optional[str] = None,
+    nprobes: Optional[int] = None,
+    refine_factor: Optional[int] = None,
+) -> list[DatasetItem]:
+    """Load dataset items most similar to an item, from its stored search embedding
+
+    Args:
+        ds_id (str): Dataset ID
+        item_id (str): Item ID
+        view (str): Item view
+        k (int, optional): Number of similar items. Defaults to 20.
+        model (str, optional): Model of semantic search embeddings. Defaults to None.
+        nprobes (int, optional): Number of IVF partitions searched in indexed views. Defaults to None.
+        refine_factor (int, optional): Re-rank factor for candidates of indexed views. Defaults to None.
+
+    Returns:
+        list[DatasetItem]: Similar items, by increasing distance
+    """
+
+    # Load dataset
+    dataset = get_registry().find(ds_id)
+
+    if dataset:
+        # Load similar items
+        items = dataset.similar_items(
+            item_id,
+            view,
+            k,
+            model=model,
+            nprobes=nprobes,
+            refine_factor=refine_factor,
+            columns=item_columns(dataset, LIST_GROUPS),
+        )
+
+        # Return similar items
+        if items:
+            return items
+        else:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No similar items found for item '{item_id}' and view '{view}' in dataset",
+            )
+    else:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Dataset {ds_id} not found in {get_settings().data_dir.absolute()}",
+        )
+
+
 @router.get(
     "/items/{item_id}/embeddings/{model_id}",
     response_model=DatasetItem,
@@ -206,7 +496,7 @@ async def get_item_embeddings(ds_id: str, item_id: str, model_id: str) -> Datase
     """
 
     # Load dataset
-    dataset = Dataset.find(ds_id, get_settings().data_dir)
+    dataset = get_registry().find(ds_id)
 
     if dataset:
         item = dataset.load_item(
@@ -215,6 +505,7 @@ async def get_item_embeddings(ds_id: str, item_id: str, model_id: str) -> Datase
             load_active_learning=False,
             load_embeddings=True,
             model_id=model_id,
+            columns={"main": []},
         )
 
         # Return dataset item embeddings
@@ -12,6 +12,8 @@
 # http://www.cecill.info
 
 
+import threading
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -19,6 +21,7 @@ from fastapi_pagination.api import add_pagination
 
 from pixano.apps.api import datasets, items, models
 from pixano.data import Settings
+from pixano.models import EncoderRegistry
 
 
 def create_app(settings: Settings = Settings()) -> FastAPI:
@@ -61,5 +64,11 @@ def create_app(settings: Settings = Settings()) -> FastAPI:
     app.include_router(items.router)
     app.include_router(models.router)
 
+    @app.on_event("startup")
+    def warm_encoders():
+        """Load semantic search encoders in the background at startup"""
+
+        threading.Thread(target=EncoderRegistry.default().warm, daemon=True).start()
+
     add_pagination(app)
     return app
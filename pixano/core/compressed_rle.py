@@ -19,6 +19,7 @@ from pydantic import BaseModel, PrivateAttr
 from pixano.core.pixano_type import PixanoType, create_pyarrow_type
 from pixano.utils import (
     encode_rle,
+    encode_rle_batch,
     mask_to_rle,
     polygons_to_rle,
     rle_to_mask,
@@ -163,6 +164,32 @@ class CompressedRLE(PixanoType, BaseModel):
 
         return CompressedRLE.from_dict(encode_rle(mask, height, width))
 
+    @staticmethod
+    def encode_batch(
+        masks: list[list[list] | dict],
+        heights: int | list[int],
+        widths: int | list[int],
+    ) -> pa.ExtensionArray:
+        """Create PyArrow array of compressed RLE masks from polygons / uncompressed RLE / compressed RLE,
+        encoding masks of a given image size at once without creating CompressedRLE objects
+
+        Args:
+            masks (list[list[list] | dict]): Masks as polygons / uncompressed RLE / compressed RLE, or None
+            heights (int | list[int]): Image height, or image height of each mask
+            widths (int | list[int]): Image width, or image width of each mask
+
+        Returns:
+            pa.ExtensionArray: Compressed RLE masks, null for masks that are None
+        """
+
+        return pa.ExtensionArray.from_storage(
+            CompressedRLEType,
+            pa.array(
+                encode_rle_batch(masks, heights, widths),
+                type=CompressedRLE.to_struct(),
+            ),
+        )
+
     @staticmethod
     def to_struct() -> pa.StructType:
         """Return CompressedRLE type as PyArrow Struct
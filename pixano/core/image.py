@@ -11,20 +11,21 @@
 #
 # http://www.cecill.info
 
+from io import BytesIO
 from pathlib import Path
-from typing import IO, Optional
+from typing import IO, Any, Optional
 from urllib.parse import urlparse
-from urllib.request import urlopen
+from urllib.request import url2pathname, urlopen
 
 import cv2
 import numpy as np
 import pyarrow as pa
 from IPython.core.display import Image as IPyImage
 from PIL import Image as PILImage
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 from pixano.core.pixano_type import PixanoType, create_pyarrow_type
-from pixano.utils import binary_to_url
+from pixano.utils import binary_to_url, image_header
 
 
 class Image(PixanoType, BaseModel):
@@ -35,12 +36,18 @@ class Image(PixanoType, BaseModel):
         bytes (bytes): Image bytes
         preview_bytes (bytes): Image preview bytes
         uri_prefix (str): URI prefix for relative URIs
+        _width (int): Image width, read from image header if unknown
+        _height (int): Image height, read from image header if unknown
+        _format (str): Image format, read from image header if unknown
     """
 
     uri: str
     bytes: Optional[bytes]
     preview_bytes: Optional[bytes]
     uri_prefix: Optional[str]
+    _width: Optional[int] = PrivateAttr(default=None)
+    _height: Optional[int] = PrivateAttr(default=None)
+    _format: Optional[str] = PrivateAttr(default=None)
 
     def __init__(
         self,
@@ -48,6 +55,9 @@ class Image(PixanoType, BaseModel):
         bytes: bytes = None,
         preview_bytes: bytes = None,
         uri_prefix: str = None,
+        width: int = None,
+        height: int = None,
+        format: str = None,
     ):
         """Initialize Image
 
@@ -56,6 +66,9 @@ class Image(PixanoType, BaseModel):
             bytes (bytes, optional): Image bytes. Defaults to None.
             preview_bytes (bytes, optional): Image preview bytes. Defaults to None.
             uri_prefix (str, optional): URI prefix for relative URIs. Defaults to None.
+            width (int, optional): Image width. Defaults to None to read it from image header when needed.
+            height (int, optional): Image height. Defaults to None to read it from image header when needed.
+            format (str, optional): Image format. Defaults to None to read it from image header when needed.
         """
 
         # Define public attributes through Pydantic BaseModel
@@ -66,6 +79,54 @@ class Image(PixanoType, BaseModel):
             uri_prefix=uri_prefix,
         )
 
+        # Define private attributes manually
+        self._width = width
+        self._height = height
+        self._format = format
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return image as dict based on corresponding PyArrow Struct,
+        with stored width, height and format only
+
+        Returns:
+            dict[str, Any]: Image as dict
+        """
+
+        return {
+            "uri": self.uri,
+            "bytes": self.bytes,
+            "preview_bytes": self.preview_bytes,
+            "width": self._width,
+            "height": self._height,
+            "format": self._format,
+        }
+
+    @property
+    def has_size(self) -> bool:
+        """Return True if image width and height are known without reading the image
+
+        Returns:
+            bool: True if image width and height are known
+        """
+
+        return self._width is not None and self._height is not None
+
+    def probe(self):
+        """Read image width, height and format from image header, without decoding pixels"""
+
+        if self.bytes is not None:
+            f = BytesIO(self.bytes)
+        else:
+            # Open local files directly, so only their header is read
+            uri = urlparse(self.get_uri())
+            f = (
+                open(url2pathname(uri.path), "rb")
+                if uri.scheme == "file"
+                else self.open()
+            )
+        with f:
+            self._width, self._height, self._format = image_header(f)
+
     @property
     def url(self) -> str:
         """Return image base 64 URL
@@ -97,14 +158,14 @@ class Image(PixanoType, BaseModel):
         return Path(urlparse(self.uri).path).name
 
     @property
-    def size(self) -> list[int]:
+    def size(self) -> tuple[int, int]:
         """Return image size
 
         Returns:
-            list[int]: Image size
+            tuple[int, int]: Image width and height
         """
 
-        return self.as_pillow().size
+        return self.width, self.height
 
     @property
     def width(self) -> int:
@@ -114,7 +175,9 @@ class Image(PixanoType, BaseModel):
             int: Image width
         """
 
-        return self.as_pillow().width
+        if self._width is None:
+            self.probe()
+        return self._width
 
     @property
     def height(self) -> int:
@@ -124,7 +187,21 @@ class Image(PixanoType, BaseModel):
             int: Image height
         """
 
-        return self.as_pillow().height
+        if self._height is None:
+            self.probe()
+        return self._height
+
+    @property
+    def format(self) -> str:
+        """Return image format
+
+        Returns:
+            str: Image format, like "JPEG" or "PNG"
+        """
+
+        if self._format is None:
+            self.probe()
+        return self._format
 
     def get_uri(self) -> str:
         """Return complete image URI from URI and URI prefix
@@ -221,6 +298,9 @@ class Image(PixanoType, BaseModel):
                 pa.field("uri", pa.utf8()),
                 pa.field("bytes", pa.binary()),
                 pa.field("preview_bytes", pa.binary()),
+                pa.field("width", pa.int32()),
+                pa.field("height", pa.int32()),
+                pa.field("format", pa.utf8()),
             ]
         )
 
@@ -143,7 +143,8 @@ def create_pyarrow_type(
 
         @classmethod
         def __arrow_ext_deserialize__(cls, storage_type, serialized):
-            return cls(struct_type, name)
+            # Keep stored struct type to read data written with previous versions
+            return cls(storage_type, name)
 
         def __arrow_ext_serialize__(self):
             return b""
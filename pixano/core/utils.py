@@ -78,9 +78,12 @@ def is_image_type(t: pa.DataType) -> bool:
         bool: True if DataType is an Image
     """
 
+    # Images from datasets created before width, height and format were stored
+    # keep their previous struct type
     return (
         ImageType.equals(t)
-        or str(t) == "struct<uri: string, bytes: binary, preview_bytes: binary>"
+        or (isinstance(t, pa.ExtensionType) and t.extension_name == "Image")
+        or str(t).startswith("struct<uri: string, bytes: binary, preview_bytes: binary")
     )
 
 
@@ -14,8 +14,14 @@
 from pixano.data.dataset import (
     Dataset,
     DatasetCategory,
+    DatasetFilter,
+    DatasetIndex,
     DatasetInfo,
     DatasetItem,
+    DatasetMedia,
+    DatasetQuery,
+    DatasetSearchQuery,
+    DatasetRegistry,
     DatasetStat,
     DatasetTable,
 )
@@ -28,8 +34,14 @@ from pixano.data.settings import Settings
 __all__ = [
     "Dataset",
     "DatasetCategory",
+    "DatasetFilter",
+    "DatasetIndex",
     "DatasetInfo",
     "DatasetItem",
+    "DatasetMedia",
+    "DatasetQuery",
+    "DatasetSearchQuery",
+    "DatasetRegistry",
     "DatasetStat",
     "DatasetTable",
     "ItemEmbedding",
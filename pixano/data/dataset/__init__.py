@@ -13,16 +13,30 @@
 
 from pixano.data.dataset.dataset import Dataset
 from pixano.data.dataset.dataset_category import DatasetCategory
+from pixano.data.dataset.dataset_index import DatasetIndex
 from pixano.data.dataset.dataset_info import DatasetInfo
 from pixano.data.dataset.dataset_item import DatasetItem
+from pixano.data.dataset.dataset_media import DatasetMedia
+from pixano.data.dataset.dataset_query import (
+    DatasetFilter,
+    DatasetQuery,
+    DatasetSearchQuery,
+)
+from pixano.data.dataset.dataset_registry import DatasetRegistry
 from pixano.data.dataset.dataset_stat import DatasetStat
 from pixano.data.dataset.dataset_table import DatasetTable
 
 __all__ = [
     "Dataset",
     "DatasetCategory",
+    "DatasetFilter",
+    "DatasetIndex",
     "DatasetInfo",
     "DatasetItem",
+    "DatasetMedia",
+    "DatasetQuery",
+    "DatasetSearchQuery",
+    "DatasetRegistry",
     "DatasetStat",
     "DatasetTable",
 ]
@@ -11,21 +11,290 @@
 #
 # http://www.cecill.info
 
+import heapq
+import inspect
+import json
+import math
 from collections import defaultdict
+from collections.abc import Collection
+from datetime import timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import duckdb
+import lance
 import lancedb
+import numpy as np
 import pyarrow as pa
-import pyarrow.dataset as pa_ds
-from pydantic import BaseModel
+import pyarrow.compute as pc
+from pydantic import BaseModel, PrivateAttr
 
-from pixano.core import Image
+from pixano.core import Image, ImageType
+from pixano.data.dataset.dataset_index import DatasetIndex
 from pixano.data.dataset.dataset_info import DatasetInfo
 from pixano.data.dataset.dataset_item import DatasetItem
+from pixano.data.dataset.dataset_query import QUERY_TYPES, DatasetFilter, sql_value
 from pixano.data.dataset.dataset_stat import DatasetStat
+from pixano.data.dataset.dataset_table import DatasetTable
 from pixano.data.fields import Fields
+from pixano.data.item import ItemFeature
+from pixano.utils import TTLCache, dequantize_vectors, file_version
+
+
+KEY_COLUMNS = ["id", "item_id", "view_id", "split"]
+
+# Ranked search results shared by all datasets, so later pages skip the search
+SEARCH_CACHE = TTLCache(maxsize=64, ttl=600.0)
+
+# Vector search can be restricted to filtered rows with installed Lance version
+LANCE_PREFILTER = (
+    "prefilter" in inspect.signature(lance.LanceDataset.scanner).parameters
+)
+
+# Results fetched per expected result when filtering vector search results afterwards,
+# on top of the ratio of all items to filtered items
+SEARCH_OVERFETCH = 4
+
+# Item row moves recorded next to the item order table before it is built again
+ORDER_MAX_MOVES = 1024
+
+
+def project_columns(
+    table: lance.LanceDataset,
+    columns: Optional[list[str]],
+) -> Optional[list[str]]:
+    """Return table columns to read for a projection, always keeping key columns
+
+    Args:
+        table (lance.LanceDataset): Table
+        columns (list[str]): Columns to read, None for all columns
+
+    Returns:
+        list[str]: Table columns to read, None for all columns
+    """
+
+    if columns is None:
+        return None
+    return [
+        name for name in table.schema.names if name in KEY_COLUMNS or name in columns
+    ]
+
+
+def merge_search_results(
+    results: list[list[tuple[float, str]]],
+    k: int,
+) -> list[tuple[float, str]]:
+    """Merge search results of several views into the k best items by distance
+
+    Each view results must be sorted by distance. They are merged lazily with a
+    heap holding one candidate per view, and each item is kept at its best distance.
+
+    Args:
+        results (list[list[tuple[float, str]]]): Distance and item ID search results, for each view
+        k (int): Number of items to return
+
+    Returns:
+        list[tuple[float, str]]: Distance and item ID of the k best distinct items
+    """
+
+    merged = []
+    seen_ids = set()
+    for distance, id in heapq.merge(*results):
+        if id not in seen_ids:
+            seen_ids.add(id)
+            merged.append((distance, id))
+            if len(merged) == k:
+                break
+
+    return merged
+
+
+def sql_in_filter(column: str, values: list[str]) -> str:
+    """Return SQL filter selecting rows with column value in given values
+
+    Args:
+        column (str): Column name
+        values (list[str]): Column values
+
+    Returns:
+        str: SQL filter
+    """
+
+    # Escape single quotes
+    values = [str(value).replace("'", "''") for value in values]
+    return f"{column} in ('" + "', '".join(values) + "')"
+
+
+def count_order_rows(order: lance.LanceDataset | pa.Table) -> int:
+    """Return number of rows of a stored or in-memory item order table
+
+    Args:
+        order (lance.LanceDataset | pa.Table): Item order table
+
+    Returns:
+        int: Number of rows
+    """
+
+    return order.num_rows if isinstance(order, pa.Table) else order.count_rows()
+
+
+def take_order_rows(
+    order: lance.LanceDataset | pa.Table,
+    positions: list[int],
+    columns: Optional[list[str]] = None,
+) -> pa.Table:
+    """Take rows of a stored or in-memory item order table
+
+    Args:
+        order (lance.LanceDataset | pa.Table): Item order table
+        positions (list[int]): Row positions
+        columns (list[str], optional): Columns to read. Defaults to None for all columns.
+
+    Returns:
+        pa.Table: Item order table rows
+    """
+
+    if isinstance(order, pa.Table):
+        rows = order.take(positions)
+        return rows.select(columns) if columns is not None else rows
+    return order.take(positions, columns=columns)
+
+
+def apply_order_moves(
+    positions: pa.ChunkedArray,
+    moves: list[int],
+    num_rows: int,
+) -> pa.Array:
+    """Apply item row moves to main table positions of an item order table
+
+    Each moved row goes to the end of the main table, and the rows after its
+    previous position shift down by one.
+
+    Args:
+        positions (pa.ChunkedArray): Main table positions
+        moves (list[int]): Previous main table position of each moved row, in move order
+        num_rows (int): Number of main table rows
+
+    Returns:
+        pa.Array: Main table positions after the moves
+    """
+
+    positions = positions.to_numpy()
+    for previous in moves:
+        positions = np.where(
+            positions == previous, num_rows - 1, positions - (positions > previous)
+        )
+    return pa.array(positions, type=pa.int64())
+
+
+MIN_VECTOR_INDEX_ROWS = 256
+
+
+def create_vector_index(
+    table: lance.LanceDataset,
+    column: str,
+    metric: str = "L2",
+) -> Optional[DatasetIndex]:
+    """Create IVF_PQ index on table vector column
+
+    Tables with too few rows to train product quantization are left unindexed,
+    brute-force search being fast enough for them.
+
+    Args:
+        table (lance.LanceDataset): Table
+        column (str): Vector column name
+        metric (str, optional): Distance metric. Defaults to "L2".
+
+    Returns:
+        DatasetIndex: Index parameters, None if table was left unindexed
+    """
+
+    num_rows = table.count_rows()
+    if column not in table.schema.names or num_rows < MIN_VECTOR_INDEX_ROWS:
+        return None
+
+    # Lance ANN indexes need float vectors, int8 vectors are searched exhaustively
+    if not pa.types.is_floating(table.schema.field(column).type.value_type):
+        return None
+
+    # About sqrt(rows) partitions, and 16 dimensions per sub-vector
+    dim = table.schema.field(column).type.list_size
+    num_partitions = max(1, min(256, round(math.sqrt(num_rows))))
+    num_sub_vectors = next(n for n in range(max(1, dim // 16), 0, -1) if dim % n == 0)
+
+    table.create_index(
+        column,
+        index_type="IVF_PQ",
+        metric=metric,
+        num_partitions=num_partitions,
+        num_sub_vectors=num_sub_vectors,
+        replace=True,
+    )
+
+    return DatasetIndex(
+        column=column,
+        type="IVF_PQ",
+        metric=metric,
+        num_partitions=num_partitions,
+        num_sub_vectors=num_sub_vectors,
+        num_rows=num_rows,
+    )
+
+
+def brute_force_search(
+    table: lance.LanceDataset,
+    column: str,
+    vector: Any,
+    k: int,
+    scale: Optional[float] = None,
+    filter: Optional[str] = None,
+    ids: Optional[pa.Array] = None,
+    batch_size: int = 8192,
+) -> list[tuple[float, str]]:
+    """Search the k rows nearest to a vector with exact squared L2 distances,
+    dequantizing int8 vectors batch by batch
+
+    Args:
+        table (lance.LanceDataset): Table
+        column (str): Vector column name
+        vector (Any): Query vector
+        k (int): Number of rows to return
+        scale (float, optional): int8 quantization scale. Defaults to None.
+        filter (str, optional): SQL filter on rows to search in. Defaults to None.
+        ids (pa.Array, optional): IDs of rows to search in, matched batch by batch. Defaults to None.
+        batch_size (int, optional): Rows read at once. Defaults to 8192.
+
+    Returns:
+        list[tuple[float, str]]: Distance and ID of the k nearest rows, by increasing distance
+    """
+
+    query = np.asarray(vector, dtype=np.float32)
+    not_null = f"{column} IS NOT NULL"
+    filter = f"({filter}) AND {not_null}" if filter is not None else not_null
+
+    # Max-heap of the k best rows
+    best: list[tuple[float, str]] = []
+    for batch in table.to_batches(
+        columns=["id", column], filter=filter, batch_size=batch_size
+    ):
+        if ids is not None:
+            batch = batch.filter(pc.is_in(batch["id"], value_set=ids))
+        if batch.num_rows == 0:
+            continue
+        vectors = dequantize_vectors(
+            batch[column].flatten().to_numpy().reshape(batch.num_rows, -1), scale
+        )
+        distances = np.square(vectors - query).sum(axis=1)
+        candidates = np.argsort(distances)[:k]
+        batch_ids = batch["id"].to_pylist()
+        for i in candidates:
+            result = (-float(distances[i]), batch_ids[i])
+            if len(best) < k:
+                heapq.heappush(best, result)
+            elif result > best[0]:
+                heapq.heapreplace(best, result)
+
+    return sorted((-distance, id) for distance, id in best)
 
 
 class Dataset(BaseModel):
@@ -43,6 +312,13 @@ class Dataset(BaseModel):
     stats: Optional[list[DatasetStat]] = None
     thumbnail: Optional[str] = None
 
+    _connection: Optional[lancedb.DBConnection] = PrivateAttr(default=None)
+    _tables: dict[str, tuple[int, lancedb.db.LanceTable]] = PrivateAttr(
+        default_factory=dict
+    )
+    _num_rows: Optional[tuple[int, int]] = PrivateAttr(default=None)
+    _info_version: Optional[tuple[int, int]] = PrivateAttr(default=None)
+
     def __init__(
         self,
         path: Path,
@@ -56,6 +332,7 @@ class Dataset(BaseModel):
         info_file = path / "db.json"
         stats_file = path / "stats.json"
         thumb_file = path / "preview.png"
+        info_version = file_version(info_file)
 
         # Define public attributes through Pydantic BaseModel
         super().__init__(
@@ -66,6 +343,7 @@ class Dataset(BaseModel):
             if thumb_file.is_file()
             else None,
         )
+        self._info_version = info_version
 
     @property
     def media_dir(self) -> Path:
@@ -79,16 +357,178 @@ class Dataset(BaseModel):
 
     @property
     def num_rows(self) -> int:
-        """Return number of rows in dataset
+        """Return number of rows in dataset, cached per main table version
 
         Returns:
             int: Number of rows
         """
 
-        ds = self.connect()
+        main_table = self.open_table("db").to_lance()
+
+        # Count rows from fragment metadata only once per main table version
+        if self._num_rows is None or self._num_rows[0] != main_table.version:
+            self._num_rows = (main_table.version, main_table.count_rows())
+
+        return self._num_rows[1]
+
+    def create_vector_indexes(
+        self,
+        table_names: list[str] = None,
+        stale_only: bool = False,
+    ):
+        """Create ANN indexes on vector columns of semantic search embeddings tables, and record them in dataset info
+
+        Args:
+            table_names (list[str], optional): Names of tables to index, all tables if None. Defaults to None.
+            stale_only (bool, optional): Only create missing indexes and rebuild indexes that do not cover current table rows. Defaults to False.
+        """
+
+        updated = False
+        for table in self.info.tables.get("embeddings", []):
+            if table.type != "search" or (
+                table_names is not None and table.name not in table_names
+            ):
+                continue
+            try:
+                lance_table = self.open_table(table.name).to_lance()
+            except FileNotFoundError:
+                continue
+
+            num_rows = lance_table.count_rows()
+            indexes = {index.column: index for index in table.indexes or []}
+            for field_name, field_type in table.fields.items():
+                if field_type.startswith("vector("):
+                    index = indexes.get(field_name)
+                    if (
+                        stale_only
+                        and index is not None
+                        and not index.is_stale(num_rows)
+                    ):
+                        continue
+                    index = create_vector_index(lance_table, field_name)
+                    if index is not None:
+                        indexes[field_name] = index
+                        updated = True
+            table.indexes = list(indexes.values()) if indexes else None
+
+        if updated:
+            self.save_info()
+
+    def stale_vector_indexes(self) -> list[tuple[str, str]]:
+        """Return vector indexes that do not cover current table rows
+
+        Returns:
+            list[tuple[str, str]]: Table name and column of stale indexes
+        """
+
+        stale_indexes = []
+        for table in self.info.tables.get("embeddings", []):
+            if table.indexes:
+                try:
+                    num_rows = self.open_table(table.name).to_lance().count_rows()
+                except FileNotFoundError:
+                    continue
+                stale_indexes.extend(
+                    (table.name, index.column)
+                    for index in table.indexes
+                    if index.is_stale(num_rows)
+                )
+
+        return stale_indexes
+
+    def broken_media_links(self) -> list[Path]:
+        """Return media files symlinked to source files which do not exist anymore
+
+        Returns:
+            list[Path]: Broken media files
+        """
+
+        broken = []
+        for field_name, field_media in (self.info.media or {}).items():
+            if any(media.depends_on_source for media in field_media):
+                broken.extend(
+                    path
+                    for path in sorted((self.media_dir / field_name).rglob("*"))
+                    if path.is_symlink() and not path.exists()
+                )
+
+        return broken
+
+    def backfill_image_info(self) -> list[str]:
+        """Store width, height and format of images in media tables of datasets
+        imported before they were stored, reading image headers only
+
+        Returns:
+            list[str]: Names of rewritten media tables
+        """
+
+        updated = []
+        for table in self.info.tables.get("media", []):
+            try:
+                lance_table = self.open_table(table.name).to_lance()
+            except FileNotFoundError:
+                continue
 
-        # Return number of rows of main table
-        return len(ds.open_table("db"))
+            schema = Fields(table.fields).to_schema()
+            image_fields = [
+                field.name for field in schema if ImageType.equals(field.type)
+            ]
+            if not image_fields:
+                continue
+
+            # Skip tables with current image type and no missing image info
+            if all(
+                ImageType.equals(lance_table.schema.field(field).type)
+                for field in image_fields
+            ) and not any(
+                pc.any(
+                    pc.and_(
+                        batch.column(field).storage.is_valid(),
+                        batch.column(field).storage.field("width").is_null(),
+                    )
+                ).as_py()
+                for batch in lance_table.to_batches(columns=image_fields)
+                for field in image_fields
+            ):
+                continue
+
+            def backfill(batch: pa.RecordBatch) -> pa.RecordBatch:
+                columns = []
+                for field in schema:
+                    column = batch.column(field.name)
+                    if field.name in image_fields:
+                        images = []
+                        for im in column.to_pylist():
+                            if im is None:
+                                images.append(None)
+                                continue
+                            if not isinstance(im, Image):
+                                im = Image.from_dict(im)
+                            if not im.has_size:
+                                im.uri_prefix = self.media_dir.absolute().as_uri()
+                                im.probe()
+                            images.append(im.to_dict())
+                        column = pa.ExtensionArray.from_storage(
+                            ImageType, pa.array(images, type=ImageType.storage_type)
+                        )
+                    columns.append(column)
+                return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+            reader = pa.RecordBatchReader.from_batches(
+                schema,
+                (backfill(batch) for batch in lance_table.to_batches()),
+            )
+            lance_table = lance.write_dataset(
+                reader, lance_table.uri, schema=schema, mode="overwrite"
+            )
+            lance_table.cleanup_old_versions(older_than=timedelta(0))
+            updated.append(table.name)
+
+        # Rewritten media tables have new versions
+        if updated:
+            self.build_order()
+
+        return updated
 
     def load_info(
         self,
@@ -111,10 +551,26 @@ class Dataset(BaseModel):
             load_thumbnail=load_thumbnail,
         )
 
+    def reload_info(self) -> DatasetInfo:
+        """Reload dataset info, only if info file has changed since it was last loaded or saved
+
+        Returns:
+            DatasetInfo: Dataset info
+        """
+
+        # Check version before reading, so a concurrent change triggers another reload
+        info_version = file_version(self.path / "db.json")
+        if self.info is None or info_version != self._info_version:
+            self.info = self.load_info()
+            self._info_version = info_version
+
+        return self.info
+
     def save_info(self):
         """Save updated dataset info"""
 
         self.info.save(self.path)
+        self._info_version = file_version(self.path / "db.json")
 
     def connect(self) -> lancedb.DBConnection:
         """Connect to dataset with LanceDB
@@ -123,66 +579,365 @@ class Dataset(BaseModel):
             lancedb.DBConnection: Dataset LanceDB connection
         """
 
-        return lancedb.connect(self.path)
+        if self._connection is None:
+            self._connection = lancedb.connect(self.path)
+
+        return self._connection
+
+    def open_table(self, name: str) -> lancedb.db.LanceTable:
+        """Open dataset table with LanceDB, reusing it if its Lance version has not changed
+
+        Args:
+            name (str): Table name
+
+        Returns:
+            lancedb.db.LanceTable: Dataset table
+        """
+
+        # Lance rewrites the latest manifest on every new table version
+        try:
+            version = (
+                (self.path / f"{name}.lance" / "_latest.manifest").stat().st_mtime_ns
+            )
+        except FileNotFoundError:
+            version = None
+
+        cached = self._tables.get(name)
+        if version is not None and cached is not None and cached[0] == version:
+            return cached[1]
+
+        table = self.connect().open_table(name)
+        if version is not None:
+            self._tables[name] = (version, table)
+        return table
 
     def open_tables(self) -> dict[str, dict[str, lancedb.db.LanceTable]]:
         """Open dataset tables with LanceDB
 
+        Tables listed in dataset info but missing on disk are skipped, without changing dataset info.
+
         Returns:
             dict[str, dict[str, lancedb.db.LanceTable]]: Dataset tables
         """
 
-        ds = self.connect()
-
         ds_tables: dict[str, dict[str, lancedb.db.LanceTable]] = defaultdict(dict)
 
         # Open main table
-        ds_tables["main"]["db"] = ds.open_table("db")
+        ds_tables["main"]["db"] = self.open_table("db")
 
         # Open media tables
         if "media" in self.info.tables:
             for table in self.info.tables["media"]:
-                ds_tables["media"][table.name] = ds.open_table(table.name)
+                ds_tables["media"][table.name] = self.open_table(table.name)
 
         # Open objects tables
         if "objects" in self.info.tables:
             for table in self.info.tables["objects"]:
                 try:
-                    ds_tables["objects"][table.source] = ds.open_table(table.name)
+                    ds_tables["objects"][table.source] = self.open_table(table.name)
                 except FileNotFoundError:
-                    # Remove missing objects tables from DatasetInfo
-                    self.info.tables["objects"].remove(table)
-                    self.save_info()
+                    # Skip missing objects tables
+                    continue
 
         # Open active learning tables
         if "active_learning" in self.info.tables:
             for table in self.info.tables["active_learning"]:
                 try:
-                    ds_tables["active_learning"][table.source] = ds.open_table(
+                    ds_tables["active_learning"][table.source] = self.open_table(
                         table.name
                     )
                 except FileNotFoundError:
-                    # Remove missing Active Learning tables from DatasetInfo
-                    self.info.tables["active_learning"].remove(table)
-                    self.save_info()
+                    # Skip missing Active Learning tables
+                    continue
 
         # Open embeddings tables
         if "embeddings" in self.info.tables:
             for table in self.info.tables["embeddings"]:
                 try:
-                    ds_tables["embeddings"][table.source] = ds.open_table(table.name)
+                    ds_tables["embeddings"][table.source] = self.open_table(table.name)
                 except FileNotFoundError:
-                    # Remove missing embeddings tables from DatasetInfo
-                    self.info.tables["embeddings"].remove(table)
-                    self.save_info()
+                    # Skip missing embeddings tables
+                    continue
 
         return ds_tables
 
+    def _order_tables(
+        self,
+        ds_tables: dict[str, dict[str, lancedb.db.LanceTable]],
+    ) -> dict[str, lance.LanceDataset]:
+        """Return the tables with one row per item, by table name
+
+        Args:
+            ds_tables (dict[str, dict[str, lancedb.db.LanceTable]]): Dataset tables
+
+        Returns:
+            dict[str, lance.LanceDataset]: Main, media and active learning tables
+        """
+
+        order_tables = {"db": ds_tables["main"]["db"].to_lance()}
+        for group_name in ["media", "active_learning"]:
+            if group_name in self.info.tables:
+                for table in self.info.tables[group_name]:
+                    source = table.name if group_name == "media" else table.source
+                    if source in ds_tables[group_name]:
+                        order_tables[table.name] = ds_tables[group_name][
+                            source
+                        ].to_lance()
+
+        return order_tables
+
+    @staticmethod
+    def _order_versions(order_tables: dict[str, lance.LanceDataset]) -> dict[str, str]:
+        """Return the Lance versions of the tables of the item order table
+
+        Args:
+            order_tables (dict[str, lance.LanceDataset]): Main, media and active learning tables
+
+        Returns:
+            dict[str, str]: Table version by table name
+        """
+
+        return {name: str(table.version) for name, table in order_tables.items()}
+
+    def _compute_order(self, order_tables: dict[str, lance.LanceDataset]) -> pa.Table:
+        """Compute dataset item order table in memory
+
+        Args:
+            order_tables (dict[str, lance.LanceDataset]): Main, media and active learning tables
+
+        Returns:
+            pa.Table: Item order table, tagged with table versions
+        """
+
+        # Sort main table item IDs
+        ids = order_tables["db"].to_table(columns=["id"])["id"]
+        order = pa.table(
+            {
+                "id": ids,
+                "id_length": pc.utf8_length(ids),
+                "db": pa.array(np.arange(len(ids), dtype=np.int64)),
+            }
+        )
+        order = order.sort_by([("id_length", "ascending"), ("id", "ascending")])
+        order = order.drop(["id_length"])
+
+        # Find item row positions in other tables
+        for table_name, table in order_tables.items():
+            if table_name != "db":
+                table_ids = table.to_table(columns=["id"])["id"].combine_chunks()
+                positions = pc.index_in(order["id"], value_set=table_ids)
+                order = order.append_column(table_name, positions.cast(pa.int64()))
+
+        # Tag order table with table versions
+        return order.replace_schema_metadata(self._order_versions(order_tables))
+
+    def _write_order(self, order: pa.Table) -> lance.LanceDataset:
+        """Write dataset item order table next to the dataset tables
+
+        Args:
+            order (pa.Table): Item order table
+
+        Returns:
+            lance.LanceDataset: Item order table
+        """
+
+        order_ds = lance.write_dataset(
+            order, self.path / "db_order.lance", mode="overwrite"
+        )
+        order_ds.cleanup_old_versions(older_than=timedelta(0))
+        (self.path / "db_order_moves.json").unlink(missing_ok=True)
+
+        return order_ds
+
+    def _order_moves(self, order_ds: lance.LanceDataset) -> Optional[dict]:
+        """Return item row moves recorded since the item order table was stored
+
+        Args:
+            order_ds (lance.LanceDataset): Item order table
+
+        Returns:
+            dict: Table versions after the moves and previous main table position of each moved row, None if no moves
+        """
+
+        moves_file = self.path / "db_order_moves.json"
+        if not moves_file.is_file():
+            return None
+
+        with open(moves_file, "r", encoding="utf-8") as f:
+            moves = json.load(f)
+        return moves if moves["order_version"] == order_ds.version else None
+
+    def _stored_order(
+        self,
+        order_tables: dict[str, lance.LanceDataset],
+    ) -> Optional[lance.LanceDataset]:
+        """Return stored item order table if it is up to date with dataset tables
+
+        Args:
+            order_tables (dict[str, lance.LanceDataset]): Main, media and active learning tables
+
+        Returns:
+            lance.LanceDataset: Item order table, None if missing or out of date
+        """
+
+        if not (self.path / "db_order.lance").exists():
+            return None
+
+        order_ds = self.open_table("db_order").to_lance()
+        moves = self._order_moves(order_ds)
+        if moves is not None:
+            versions = moves["versions"]
+        else:
+            metadata = order_ds.schema.metadata or {}
+            versions = {k.decode(): v.decode() for k, v in metadata.items()}
+        return order_ds if versions == self._order_versions(order_tables) else None
+
+    def build_order(self) -> lance.LanceDataset:
+        """Build dataset item order table
+
+        The item order table lists item IDs sorted by ID length then ID,
+        with the row position of each item in the main, media, and active
+        learning tables. It is stored next to the dataset tables and tagged
+        with the Lance versions of the tables it was built from.
+
+        Returns:
+            lance.LanceDataset: Item order table
+        """
+
+        order_tables = self._order_tables(self.open_tables())
+        return self._write_order(self._compute_order(order_tables))
+
+    def load_order(self) -> lance.LanceDataset:
+        """Load dataset item order table
+
+        If dataset tables have changed since the order table was stored, the
+        order table is built again and stored, so following requests read it.
+
+        Returns:
+            lance.LanceDataset: Item order table
+        """
+
+        order_tables = self._order_tables(self.open_tables())
+        order_ds = self._stored_order(order_tables)
+
+        return (
+            order_ds
+            if order_ds is not None
+            else self._write_order(self._compute_order(order_tables))
+        )
+
+    def _take_order_page(
+        self,
+        order: lance.LanceDataset | pa.Table,
+        positions: list[int],
+    ) -> pa.Table:
+        """Take rows of item order table, with main table positions after recorded item row moves
+
+        Args:
+            order (lance.LanceDataset | pa.Table): Item order table
+            positions (list[int]): Row positions
+
+        Returns:
+            pa.Table: Item order table rows
+        """
+
+        page = take_order_rows(order, positions)
+        moves = (
+            self._order_moves(order) if isinstance(order, lance.LanceDataset) else None
+        )
+        if moves is not None:
+            page = page.set_column(
+                page.schema.get_field_index("db"),
+                "db",
+                apply_order_moves(page["db"], moves["moves"], count_order_rows(order)),
+            )
+
+        return page
+
+    def _move_order_row(self, order_ds: lance.LanceDataset, item_id: str):
+        """Record the move of an item row to the end of the main table
+
+        The item order table is not rewritten: moves are recorded next to it
+        and applied to the main table positions read from it, until
+        ORDER_MAX_MOVES moves are recorded and the order table is built again.
+
+        Args:
+            order_ds (lance.LanceDataset): Item order table, up to date before the move
+            item_id (str): Moved item ID
+        """
+
+        moves = self._order_moves(order_ds)
+        moves = moves["moves"] if moves is not None else []
+        positions = self._order_positions(order_ds, [item_id])
+        if not positions or len(moves) >= ORDER_MAX_MOVES:
+            self.build_order()
+            return
+
+        previous_position = self._take_order_page(order_ds, positions)["db"][0]
+        order_tables = self._order_tables(self.open_tables())
+        with open(self.path / "db_order_moves.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "order_version": order_ds.version,
+                    "versions": self._order_versions(order_tables),
+                    "moves": moves + [previous_position.as_py()],
+                },
+                f,
+            )
+
+    @staticmethod
+    def _take_rows(
+        table: lance.LanceDataset,
+        positions: pa.ChunkedArray,
+        columns: Optional[list[str]] = None,
+    ) -> pa.Table:
+        """Take table rows at the given positions, ignoring missing positions
+
+        Args:
+            table (lance.LanceDataset): Table
+            positions (pa.ChunkedArray): Row positions
+            columns (list[str], optional): Columns to read, key columns are always read. Defaults to None for all columns.
+
+        Returns:
+            pa.Table: Table rows
+        """
+
+        columns = project_columns(table, columns)
+        positions = pc.drop_null(positions).to_pylist()
+        if positions:
+            return table.take(positions, columns=columns)
+        schema = table.schema
+        if columns is not None:
+            schema = pa.schema([schema.field(name) for name in columns])
+        return schema.empty_table()
+
+    @staticmethod
+    def _scan_rows(
+        table: lance.LanceDataset,
+        filter: str,
+        columns: Optional[list[str]] = None,
+    ) -> pa.Table:
+        """Scan table rows matching a filter
+
+        Args:
+            table (lance.LanceDataset): Table
+            filter (str): SQL filter
+            columns (list[str], optional): Columns to read, key columns are always read. Defaults to None for all columns.
+
+        Returns:
+            pa.Table: Table rows
+        """
+
+        return table.scanner(
+            columns=project_columns(table, columns), filter=filter
+        ).to_table()
+
     def load_items(
         self,
         limit: int,
         offset: int,
         load_active_learning: bool = True,
+        columns: Optional[dict[str, list[str]]] = None,
     ) -> list[DatasetItem]:
         """Load dataset items in selected tables
 
@@ -190,78 +945,610 @@ class Dataset(BaseModel):
             limit (int): Items limit
             offset (int): Items offset
             load_active_learning (bool, optional): Load item active learning info. Defaults to True.
+            columns (dict[str, list[str]], optional): Columns to read per table group ("main", "media", ...), key columns are always read. Defaults to None for all columns of all tables.
         Returns:
             list[DatasetItem]: List of dataset items
         """
 
         # Update info in case of change
-        self.info = self.load_info()
+        self.reload_info()
 
         # Load tables
         ds_tables = self.open_tables()
 
+        # Resolve page to row positions with item order table
+        order = self.load_order()
+        stop = min(offset + limit, count_order_rows(order))
+        if offset >= stop:
+            return None
+        page = self._take_order_page(order, list(range(offset, stop)))
+
+        return self._load_page(page, ds_tables, load_active_learning, columns)
+
+    def load_items_after(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        load_active_learning: bool = True,
+        columns: Optional[dict[str, list[str]]] = None,
+    ) -> list[DatasetItem]:
+        """Load dataset items following a cursor in selected tables
+
+        Unlike offsets, the cursor is the ID of the last item seen, so each page
+        costs the same regardless of its depth and is not shifted by inserts.
+
+        Args:
+            limit (int): Items limit
+            cursor (str, optional): ID of the last item of the previous page. Defaults to None for the first page.
+            load_active_learning (bool, optional): Load item active learning info. Defaults to True.
+            columns (dict[str, list[str]], optional): Columns to read per table group ("main", "media", ...), key columns are always read. Defaults to None for all columns of all tables.
+        Returns:
+            list[DatasetItem]: List of dataset items
+        """
+
+        # Update info in case of change
+        self.reload_info()
+
+        # Load tables
+        ds_tables = self.open_tables()
+
+        # Resolve cursor to row positions with item order table
+        order = self.load_order()
+        start = self._cursor_position(order, cursor) if cursor is not None else 0
+        stop = min(start + limit, count_order_rows(order))
+        if start >= stop:
+            return None
+        page = self._take_order_page(order, list(range(start, stop)))
+
+        return self._load_page(page, ds_tables, load_active_learning, columns)
+
+    @staticmethod
+    def _cursor_position(order: lance.LanceDataset | pa.Table, cursor: str) -> int:
+        """Return position of the first item after a cursor in item order table
+
+        Items are sorted by ID length then ID, so the position is found by
+        binary search, reading one order table row per step.
+
+        Args:
+            order (lance.LanceDataset | pa.Table): Item order table
+            cursor (str): Item ID
+
+        Returns:
+            int: Position of the first item after the cursor
+        """
+
+        cursor_key = (len(cursor), cursor)
+        low, high = 0, count_order_rows(order)
+        while low < high:
+            middle = (low + high) // 2
+            middle_id = take_order_rows(order, [middle], ["id"])["id"][0].as_py()
+            if (len(middle_id), middle_id) <= cursor_key:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    @classmethod
+    def _order_positions(
+        cls,
+        order: lance.LanceDataset | pa.Table,
+        ids: list[str],
+    ) -> list[int]:
+        """Return positions of items in item order table
+
+        Each item is found by binary search on its ID, reading a few order
+        table rows instead of scanning dataset tables.
+
+        Args:
+            order (lance.LanceDataset | pa.Table): Item order table
+            ids (list[str]): Item IDs
+
+        Returns:
+            list[int]: Positions of the items found, in order table order
+        """
+
+        positions = []
+        for id in sorted(set(ids), key=lambda id: (len(id), id)):
+            position = cls._cursor_position(order, id) - 1
+            if (
+                position >= 0
+                and take_order_rows(order, [position], ["id"])["id"][0].as_py() == id
+            ):
+                positions.append(position)
+
+        return positions
+
+    def _load_page(
+        self,
+        page: pa.Table,
+        ds_tables: dict[str, dict[str, lancedb.db.LanceTable]],
+        load_active_learning: bool = True,
+        columns: Optional[dict[str, list[str]]] = None,
+    ) -> list[DatasetItem]:
+        """Load dataset items from a page of item order table
+
+        Args:
+            page (pa.Table): Item order table rows
+            ds_tables (dict[str, dict[str, lancedb.db.LanceTable]]): Dataset tables
+            load_active_learning (bool, optional): Load item active learning info. Defaults to True.
+            columns (dict[str, list[str]], optional): Columns to read per table group ("main", "media", ...), key columns are always read. Defaults to None for all columns of all tables.
+        Returns:
+            list[DatasetItem]: List of dataset items
+        """
+
         # Load PyArrow items from tables
         pyarrow_items: dict[str, dict[str, pa.Table]] = defaultdict(dict)
+        columns = columns if columns is not None else {}
 
         # Load PyArrow items from main table
-        lance_table = ds_tables["main"]["db"].to_lance()
-        pyarrow_items["main"]["db"] = duckdb.query(
-            f"SELECT * FROM lance_table ORDER BY len(id), id LIMIT {limit} OFFSET {offset}"
-        ).to_arrow_table()
+        pyarrow_items["main"]["db"] = self._take_rows(
+            ds_tables["main"]["db"].to_lance(), page["db"], columns.get("main")
+        )
 
         # Media tables
         for media_source, media_table in ds_tables["media"].items():
-            lance_table = media_table.to_lance()
-            pyarrow_items["media"][media_source] = duckdb.query(
-                f"SELECT * FROM lance_table ORDER BY len(id), id LIMIT {limit} OFFSET {offset}"
-            ).to_arrow_table()
+            pyarrow_items["media"][media_source] = self._take_rows(
+                media_table.to_lance(), page[media_source], columns.get("media")
+            )
 
         # Active Learning tables
         if load_active_learning:
-            for al_source, al_table in ds_tables["active_learning"].items():
-                lance_table = al_table.to_lance()
-                pyarrow_items["active_learning"][al_source] = duckdb.query(
-                    f"SELECT * FROM lance_table ORDER BY len(id), id LIMIT {limit} OFFSET {offset}"
-                ).to_arrow_table()
+            for table in self.info.tables.get("active_learning", []):
+                if table.source in ds_tables["active_learning"]:
+                    pyarrow_items["active_learning"][table.source] = self._take_rows(
+                        ds_tables["active_learning"][table.source].to_lance(),
+                        page[table.name],
+                        columns.get("active_learning"),
+                    )
 
         if pyarrow_items["main"]["db"].num_rows > 0:
-            # Split results
-            pyarrow_item_list: list[dict[str, dict[str, pa.Table]]] = []
-            for index in range(pyarrow_items["main"]["db"].num_rows):
-                pyarrow_item_list.append(defaultdict(dict))
-                # Main table
-                pyarrow_item_list[index]["main"]["db"] = pyarrow_items["main"][
-                    "db"
-                ].take([index])
-                item_id = pyarrow_item_list[index]["main"]["db"].to_pylist()[0]["id"]
-                # Media tables
-                for media_source in ds_tables["media"].keys():
-                    pyarrow_item_list[index]["media"][media_source] = (
-                        pa_ds.dataset(pyarrow_items["media"][media_source])
-                        .scanner(filter=pa_ds.field("id") == item_id)
-                        .to_table()
-                    )
-                # Active Learning tables
-                if load_active_learning:
-                    for al_source in ds_tables["active_learning"].keys():
-                        pyarrow_item_list[index]["active_learning"][al_source] = (
-                            pa_ds.dataset(pyarrow_items["active_learning"][al_source])
-                            .scanner(filter=pa_ds.field("id") == item_id)
-                            .to_table()
-                        )
-            return [
-                DatasetItem.from_pyarrow(pyarrow_item, self.info, self.media_dir)
-                for pyarrow_item in pyarrow_item_list
-            ]
+            # Join tables on item ID and split results
+            return DatasetItem.from_pyarrow_batch(
+                pyarrow_items, self.info, self.media_dir
+            )
         else:
             return None
 
+    def _query_fields(self) -> dict[str, str]:
+        """Return features that items can be queried on, with the name of their table
+
+        Returns:
+            dict[str, str]: Main and active learning table name by feature name
+        """
+
+        query_fields = {}
+        for group_name in ["main", "active_learning"]:
+            for table in self.info.tables.get(group_name, []):
+                for field_name, field_type in table.fields.items():
+                    if field_name != "id" and field_type in QUERY_TYPES:
+                        query_fields.setdefault(field_name, table.name)
+
+        return query_fields
+
+    def query_items(
+        self,
+        limit: int,
+        filters: Optional[list[DatasetFilter]] = None,
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        cursor: Optional[str] = None,
+        load_active_learning: bool = True,
+        columns: Optional[dict[str, list[str]]] = None,
+    ) -> list[DatasetItem]:
+        """Load dataset items matching filters, sorted by a feature
+
+        Filters are pushed into the Lance scanner of the table of their feature,
+        reading only item IDs and queried features. DuckDB joins the results on
+        item ID and sorts them, and only the page items are loaded.
+
+        Args:
+            limit (int): Items limit
+            filters (list[DatasetFilter], optional): Filters that items must all match. Defaults to None.
+            order_by (str, optional): Feature name to sort items by. Defaults to None to sort by ID.
+            descending (bool, optional): Sort items in descending order. Defaults to False.
+            cursor (str, optional): ID of the last item of the previous page. Defaults to None for the first page.
+            load_active_learning (bool, optional): Load item active learning info. Defaults to True.
+            columns (dict[str, list[str]], optional): Columns to read per table group ("main", "media", ...), key columns are always read. Defaults to None for all columns of all tables.
+        Returns:
+            list[DatasetItem]: List of dataset items
+        """
+
+        # Update info in case of change
+        self.reload_info()
+
+        # Load tables
+        ds_tables = self.open_tables()
+        order_tables = self._order_tables(ds_tables)
+
+        # Check queried features
+        filters = filters if filters is not None else []
+        query_fields = self._query_fields()
+        for field_name in [f.field for f in filters] + [order_by]:
+            if field_name is not None and (
+                field_name not in query_fields
+                or query_fields[field_name] not in order_tables
+            ):
+                raise ValueError(f"Unknown feature '{field_name}' in query")
+
+        # Queried features by table, main table first
+        table_fields: dict[str, list[str]] = {"db": []}
+        for field_name in [f.field for f in filters] + [order_by]:
+            if field_name is not None:
+                fields = table_fields.setdefault(query_fields[field_name], [])
+                if field_name not in fields:
+                    fields.append(field_name)
+
+        # Scan tables with filters pushed down, then join them on item ID
+        con = duckdb.connect()
+        joins = []
+        for i, (table_name, fields) in enumerate(table_fields.items()):
+            table_filters = [
+                f.to_sql() for f in filters if query_fields[f.field] == table_name
+            ]
+            results = (
+                order_tables[table_name]
+                .scanner(
+                    columns=["id"] + fields,
+                    filter=" AND ".join(table_filters) if table_filters else None,
+                )
+                .to_table()
+            )
+            con.register(f"table_{i}", results)
+            if i > 0:
+                # Items without active learning rows only match if not filtered on them
+                join_type = "JOIN" if table_filters else "LEFT JOIN"
+                joins.append(f"{join_type} table_{i} USING (id)")
+
+        # Resume after cursor, sorting items by feature then ID length then ID
+        conditions = []
+        if cursor is not None:
+            id_after = (
+                f"(len(id) > {len(cursor)} OR "
+                f"(len(id) = {len(cursor)} AND id > {sql_value(cursor)}))"
+            )
+            if order_by is None:
+                conditions.append(id_after)
+            else:
+                cursor_table = order_tables[query_fields[order_by]].scanner(
+                    columns=[order_by], filter=sql_in_filter("id", [cursor])
+                )
+                cursor_values = cursor_table.to_table()[order_by].to_pylist()
+                cursor_value = cursor_values[0] if cursor_values else None
+                if cursor_value is None:
+                    conditions.append(f'("{order_by}" IS NULL AND {id_after})')
+                else:
+                    value = sql_value(cursor_value)
+                    operator = "<" if descending else ">"
+                    conditions.append(
+                        f'("{order_by}" {operator} {value} OR "{order_by}" IS NULL '
+                        f'OR ("{order_by}" = {value} AND {id_after}))'
+                    )
+
+        order = ["len(id)", "id"]
+        if order_by is not None:
+            direction = "DESC" if descending else "ASC"
+            order.insert(0, f'"{order_by}" {direction} NULLS LAST')
+
+        sql = f"SELECT id FROM table_0 {' '.join(joins)}"
+        if conditions:
+            sql += f" WHERE {' AND '.join(conditions)}"
+        sql += f" ORDER BY {', '.join(order)} LIMIT {limit}"
+        ids = con.execute(sql).arrow()["id"].to_pylist()
+        con.close()
+
+        # Load page items only
+        return self.load_items_by_ids(
+            ids,
+            load_active_learning=load_active_learning,
+            columns=columns,
+        )
+
+    @staticmethod
+    def _vector_search(
+        table: lance.LanceDataset,
+        views: list[str],
+        vector: Any,
+        k: int,
+        nprobes: Optional[int] = None,
+        refine_factor: Optional[int] = None,
+        ids: Optional[Collection[str]] = None,
+        scales: Optional[dict[str, float]] = None,
+        filter: Optional[str] = None,
+    ) -> list[tuple[float, str]]:
+        """Search the k items nearest to a vector over several view columns
+
+        int8 quantized views are searched exhaustively, as Lance ANN search needs float vectors.
+        The SQL filter is pushed into the embeddings table scan. Item IDs are matched against
+        search results instead, over-fetching results until k items match.
+
+        Args:
+            table (lance.LanceDataset): Embeddings table
+            views (list[str]): View vector columns
+            vector (Any): Query vector
+            k (int): Number of items to return
+            nprobes (int, optional): Number of IVF partitions searched when view is indexed. Defaults to None for Lance default.
+            refine_factor (int, optional): Re-rank refine_factor * k candidates with exact distances when view is indexed. Defaults to None for no re-ranking.
+            ids (Collection[str], optional): IDs of items to search in. Defaults to None for all items.
+            scales (dict[str, float], optional): int8 views quantization scales. Defaults to None.
+            filter (str, optional): SQL filter on embeddings table rows to search in. Defaults to None.
+
+        Returns:
+            list[tuple[float, str]]: Distance and item ID of the k best distinct items
+        """
+
+        if ids is not None:
+            if not ids:
+                return []
+            k = min(k, len(ids))
+            id_set = ids if isinstance(ids, (set, frozenset)) else set(ids)
+            id_values = pa.array(list(id_set), type=pa.string())
+
+        def search_view(view: str, view_k: int):
+            # Query vector with the view float type
+            value_type = table.schema.field(view).type.value_type
+            q = np.asarray(vector, dtype=value_type.to_pandas_dtype())
+            nearest = {"column": view, "q": q, "k": view_k}
+            if nprobes is not None:
+                nearest["nprobes"] = nprobes
+            if refine_factor is not None:
+                nearest["refine_factor"] = refine_factor
+            kwargs = (
+                {"prefilter": True} if filter is not None and LANCE_PREFILTER else {}
+            )
+            results_table = table.to_table(
+                columns=["id"], nearest=nearest, filter=filter, **kwargs
+            )
+            return sorted(
+                zip(
+                    results_table["_distance"].to_pylist(),
+                    results_table["id"].to_pylist(),
+                )
+            )
+
+        # Perform semantic search on each view, reading only IDs and distances
+        # The k best items all rank in the k best results of their best view
+        view_results = []
+        num_rows = None
+        for view in views:
+            if not pa.types.is_floating(table.schema.field(view).type.value_type):
+                view_results.append(
+                    brute_force_search(
+                        table,
+                        view,
+                        vector,
+                        k,
+                        scale=(scales or {}).get(view),
+                        filter=filter,
+                        ids=id_values if ids is not None else None,
+                    )
+                )
+            elif ids is None and (filter is None or LANCE_PREFILTER):
+                view_results.append(search_view(view, k))
+            else:
+                # Filter results afterwards, over-fetching by filter selectivity
+                # and doubling the number of results until k items match
+                if num_rows is None:
+                    num_rows = table.count_rows()
+                selectivity = max(1, num_rows // len(id_set)) if ids is not None else 1
+                view_k = min(k * SEARCH_OVERFETCH * selectivity, num_rows)
+                while True:
+                    results = search_view(view, view_k)
+                    if ids is not None:
+                        results = [r for r in results if r[1] in id_set]
+                    if len(results) >= k or view_k >= num_rows:
+                        break
+                    view_k = min(2 * view_k, num_rows)
+                view_results.append(results[:k])
+
+        # Merge view results into the k best items
+        return merge_search_results(view_results, k)
+
+    def _filter_versions(
+        self,
+        ds_tables: dict[str, dict[str, lancedb.db.LanceTable]],
+    ) -> tuple[tuple[str, str], ...]:
+        """Return the Lance versions of the tables that item filters read
+
+        Args:
+            ds_tables (dict[str, dict[str, lancedb.db.LanceTable]]): Dataset tables
+
+        Returns:
+            tuple[tuple[str, str], ...]: Table name and version of main, active learning and objects tables
+        """
+
+        versions = self._order_versions(self._order_tables(ds_tables))
+        for source, table in ds_tables.get("objects", {}).items():
+            versions[f"objects/{source}"] = str(table.to_lance().version)
+
+        return tuple(sorted(versions.items()))
+
+    def filter_item_ids(self, filters: list[DatasetFilter]) -> list[str]:
+        """Return IDs of items matching all filters
+
+        Filters on main and active learning features are pushed into the scanner
+        of their table. Filters on object features are pushed into the objects
+        tables, an item matching if one of its objects matches them all.
+
+        Args:
+            filters (list[DatasetFilter]): Filters on item or object features
+
+        Returns:
+            list[str]: Matching item IDs, sorted by ID length then ID
+        """
+
+        ids = self._filter_id_set(filters, self.open_tables())
+
+        return sorted(ids, key=lambda id: (len(id), id))
+
+    def _filter_id_set(
+        self,
+        filters: list[DatasetFilter],
+        ds_tables: dict[str, dict[str, lancedb.db.LanceTable]],
+    ) -> set[str]:
+        """Return IDs of items matching all filters, kept in cache until the filtered tables change
+
+        Args:
+            filters (list[DatasetFilter]): Filters on item or object features
+            ds_tables (dict[str, dict[str, lancedb.db.LanceTable]]): Dataset tables
+
+        Returns:
+            set[str]: Matching item IDs
+        """
+
+        cache_key = (
+            str(self.path),
+            tuple(f.to_sql() for f in filters),
+            self._filter_versions(ds_tables),
+        )
+        ids = SEARCH_CACHE.get(cache_key)
+        if ids is not None:
+            return ids
+
+        order_tables = self._order_tables(ds_tables)
+        query_fields = self._query_fields()
+        object_fields = [
+            field_name
+            for table in self.info.tables.get("objects", [])
+            for field_name, field_type in table.fields.items()
+            if field_name not in KEY_COLUMNS and field_type in QUERY_TYPES
+        ]
+
+        # Group filters by table
+        item_filters: dict[str, list[str]] = defaultdict(list)
+        object_filters: list[DatasetFilter] = []
+        for f in filters:
+            if f.field in query_fields and query_fields[f.field] in order_tables:
+                item_filters[query_fields[f.field]].append(f.to_sql())
+            elif f.field in object_fields:
+                object_filters.append(f)
+            else:
+                raise ValueError(f"Unknown feature '{f.field}' in query")
+
+        ids = None
+        for table_name, table_filters in item_filters.items():
+            table_ids = order_tables[table_name].to_table(
+                columns=["id"], filter=" AND ".join(table_filters)
+            )["id"]
+            table_ids = set(table_ids.to_pylist())
+            ids = table_ids if ids is None else ids & table_ids
+
+        if object_filters:
+            object_item_ids = set()
+            for table in self.info.tables.get("objects", []):
+                if table.source in ds_tables["objects"] and all(
+                    f.field in table.fields for f in object_filters
+                ):
+                    table_ids = (
+                        ds_tables["objects"][table.source]
+                        .to_lance()
+                        .to_table(
+                            columns=["item_id"],
+                            filter=" AND ".join(f.to_sql() for f in object_filters),
+                        )["item_id"]
+                    )
+                    object_item_ids.update(table_ids.to_pylist())
+            ids = object_item_ids if ids is None else ids & object_item_ids
+
+        if ids is None:
+            ids = set(order_tables["db"].to_table(columns=["id"])["id"].to_pylist())
+
+        SEARCH_CACHE.set(cache_key, ids)
+        return ids
+
+    def _search_filters(
+        self,
+        filters: Optional[list[DatasetFilter]],
+        sem_search_table: lance.LanceDataset,
+        sem_search_views: list[str],
+        ds_tables: dict[str, dict[str, lancedb.db.LanceTable]],
+    ) -> tuple[Optional[str], Optional[set[str]]]:
+        """Split search filters into a SQL filter pushed into the embeddings table scan,
+        and the IDs of items matching filters on other tables
+
+        Args:
+            filters (list[DatasetFilter], optional): Filters on item or object features
+            sem_search_table (lance.LanceDataset): Semantic search embeddings table
+            sem_search_views (list[str]): Semantic search view vector columns
+            ds_tables (dict[str, dict[str, lancedb.db.LanceTable]]): Dataset tables
+
+        Returns:
+            tuple[Optional[str], Optional[set[str]]]: SQL filter on embeddings table, and matching item IDs, None without such filters
+        """
+
+        embedding_filters, other_filters = [], []
+        for f in filters or []:
+            if (
+                f.field in sem_search_table.schema.names
+                and f.field not in sem_search_views
+            ):
+                embedding_filters.append(f)
+            else:
+                other_filters.append(f)
+
+        return (
+            " AND ".join(f.to_sql() for f in embedding_filters)
+            if embedding_filters
+            else None,
+            self._filter_id_set(other_filters, ds_tables) if other_filters else None,
+        )
+
+    def count_search_items(
+        self,
+        model: str,
+        filters: Optional[list[DatasetFilter]] = None,
+    ) -> int:
+        """Count dataset items that a semantic search with filters can return
+
+        Args:
+            model (str): Model of semantic search embeddings
+            filters (list[DatasetFilter], optional): Filters on item or object features that items must all match. Defaults to None.
+
+        Returns:
+            int: Number of items with search embeddings matching all filters
+        """
+
+        # Update info in case of change
+        self.reload_info()
+
+        # Load tables
+        ds_tables = self.open_tables()
+
+        for table in self.info.tables.get("embeddings", []):
+            if (
+                table.type == "search"
+                and table.source == model
+                and table.source in ds_tables["embeddings"]
+            ):
+                sem_search_table = ds_tables["embeddings"][table.source].to_lance()
+                sem_search_views = [
+                    field_name
+                    for field_name, field_type in table.fields.items()
+                    if field_type.startswith("vector(")
+                ]
+                filter, ids = self._search_filters(
+                    filters, sem_search_table, sem_search_views, ds_tables
+                )
+
+                # Read only IDs of matching embeddings
+                matches = sem_search_table.to_table(columns=["id"], filter=filter)["id"]
+                if ids is None:
+                    return len(matches)
+                id_values = pa.array(list(ids), type=pa.string())
+                return pc.sum(pc.is_in(matches, value_set=id_values)).as_py() or 0
+
+        return 0
+
     def search_items(
         self,
         limit: int,
         offset: int,
         query: dict[str, str],
         load_active_learning: bool = True,
+        nprobes: Optional[int] = None,
+        refine_factor: Optional[int] = None,
+        filters: Optional[list[DatasetFilter]] = None,
+        columns: Optional[dict[str, list[str]]] = None,
     ):
         """Search for dataset items in selected tables
 
@@ -270,201 +1557,344 @@ class Dataset(BaseModel):
             offset (int): Items offset
             query (dict[str, str]): Search query
             load_active_learning (bool, optional): Load item active learning info. Defaults to True.
+            nprobes (int, optional): Number of IVF partitions searched when view is indexed. Defaults to None for LanceDB default.
+            refine_factor (int, optional): Re-rank refine_factor * k candidates with exact distances when view is indexed. Defaults to None for no re-ranking.
+            filters (list[DatasetFilter], optional): Filters on item or object features that items must all match. Defaults to None.
+            columns (dict[str, list[str]], optional): Columns to read per table group ("main", "media", ...), key columns are always read. Defaults to None for all columns of all tables.
         Returns:
             list[DatasetItem]: List of dataset items
         """
 
         # Update info in case of change
-        self.info = self.load_info()
+        self.reload_info()
 
         # Load tables
         ds_tables = self.open_tables()
 
-        # Load PyArrow items from tables
-        pyarrow_items: dict[str, dict[str, pa.Table]] = defaultdict(dict)
-
         if "embeddings" not in self.info.tables:
             return None
 
         for table in self.info.tables["embeddings"]:
-            if table.type == "search" and table.source == query["model"]:
+            if (
+                table.type == "search"
+                and table.source == query["model"]
+                and table.source in ds_tables["embeddings"]
+            ):
                 sem_search_table = ds_tables["embeddings"][table.source]
                 sem_search_views = [
                     field_name
                     for field_name, field_type in table.fields.items()
-                    if field_type == "vector(512)"
+                    if field_type.startswith("vector(")
                 ]
-                # Initialize CLIP model
-                try:
-                    from pixano_inference.transformers import CLIP
-                except ImportError as e:
-                    raise ImportError(
-                        "Please install the pixano-inference module to perform semantic search with CLIP"
-                    ) from e
+                # Reuse ranked results of previous pages for this table version,
+                # and for the versions of filtered tables as saving items edits them
+                stop = min(offset + limit, self.num_rows)
+                cache_key = (
+                    str(self.path),
+                    table.name,
+                    sem_search_table.to_lance().version,
+                    query["model"],
+                    query["search"],
+                    nprobes,
+                    refine_factor,
+                    tuple(f.to_sql() for f in filters) if filters else None,
+                    self._filter_versions(ds_tables) if filters else None,
+                )
+                ranked = SEARCH_CACHE.get(cache_key)
+
+                # Search again only if page goes past ranked results that were not exhaustive,
+                # at least doubling the number of results to keep deep paging cheap
+                if ranked is None or (ranked[1] < stop and len(ranked[0]) == ranked[1]):
+                    k = min(max(stop, 2 * ranked[1]) if ranked else stop, self.num_rows)
+
+                    # Filters on embeddings table, and items matching other filters
+                    filter, ids = self._search_filters(
+                        filters,
+                        sem_search_table.to_lance(),
+                        sem_search_views,
+                        ds_tables,
+                    )
 
-                model = CLIP()
-                model_query = model.semantic_search(query["search"])
+                    # Encode query with shared encoder and query embedding cache
+                    # (imported here as pixano.models depends on pixano.data)
+                    from pixano.models import EncoderRegistry
 
-                # Perform semantic search
-                stop = min(offset + limit, self.num_rows)
-                results_table = (
-                    sem_search_table.search(model_query, sem_search_views[0])
-                    .limit(stop)
-                    .to_arrow()
+                    model_query = EncoderRegistry.default().encode(
+                        query["model"], query["search"]
+                    )
+
+                    ranked = (
+                        self._vector_search(
+                            sem_search_table.to_lance(),
+                            sem_search_views,
+                            model_query,
+                            k,
+                            nprobes=nprobes,
+                            refine_factor=refine_factor,
+                            ids=ids,
+                            scales=table.scales,
+                            filter=filter,
+                        ),
+                        k,
+                    )
+                    SEARCH_CACHE.set(cache_key, ranked)
+
+                # Load ranked results of page
+                return self._load_ranked_items(
+                    ranked[0][offset:stop], load_active_learning, columns
                 )
 
-                # If more than one view, search on all views and select the best results based on distance
-                if len(sem_search_views) > 1:
-                    for view in sem_search_views[1:]:
-                        view_results_table = (
-                            sem_search_table.search(model_query, view)
-                            .limit(stop)
-                            .to_arrow()
-                        )
-                        results_table = duckdb.query(
-                            "SELECT id, results_table._distance as distance_1, view_results_table._distance as distance_2 FROM results_table LEFT JOIN view_results_table USING (id)"
-                        ).to_arrow_table()
-
-                        results_table = duckdb.query(
-                            "SELECT (id), (SELECT Min(v) FROM (VALUES (distance_1), (distance_2)) AS value(v)) as _distance FROM results_table"
-                        ).to_arrow_table()
-
-                # Filter results to page
-                results_table = duckdb.query(
-                    f"SELECT id, _distance as distance FROM results_table ORDER BY _distance ASC LIMIT {limit} OFFSET {offset}"
-                ).to_arrow_table()
-
-                # Join with main table
-                main_table = ds_tables["main"]["db"].to_lance()
-                pyarrow_items["main"]["db"] = duckdb.query(
-                    "SELECT * FROM results_table LEFT JOIN main_table USING (id) ORDER BY distance ASC"
-                ).to_arrow_table()
-
-                if pyarrow_items["main"]["db"].num_rows > 0:
-                    # Split results
-                    pyarrow_item_list: list[dict[str, dict[str, pa.Table]]] = []
-                    for index in range(pyarrow_items["main"]["db"].num_rows):
-                        pyarrow_item_list.append(defaultdict(dict))
-                        # Main table
-                        pyarrow_item_list[index]["main"]["db"] = pyarrow_items["main"][
-                            "db"
-                        ].take([index])
-                        item_id = pyarrow_item_list[index]["main"]["db"].to_pylist()[0][
-                            "id"
-                        ]
-                        # Media tables
-                        for media_source, media_table in ds_tables["media"].items():
-                            lance_scanner = media_table.to_lance().scanner(
-                                filter=f"id in ('{item_id}')"
-                            )
-                            pyarrow_item_list[index]["media"][
-                                media_source
-                            ] = lance_scanner.to_table()
-
-                        # Active learning tables
-                        if load_active_learning:
-                            for al_source, al_table in ds_tables[
-                                "active_learning"
-                            ].items():
-                                lance_scanner = al_table.to_lance().scanner(
-                                    filter=f"id in ('{item_id}')"
-                                )
-                                pyarrow_item_list[index]["active_learning"][
-                                    al_source
-                                ] = lance_scanner.to_table()
-
-                    return [
-                        DatasetItem.from_pyarrow(
-                            pyarrow_item, self.info, self.media_dir
-                        )
-                        for pyarrow_item in pyarrow_item_list
-                    ]
-                else:
+    def similar_items(
+        self,
+        item_id: str,
+        view: str,
+        k: int,
+        model: Optional[str] = None,
+        load_active_learning: bool = True,
+        nprobes: Optional[int] = None,
+        refine_factor: Optional[int] = None,
+        columns: Optional[dict[str, list[str]]] = None,
+    ) -> list[DatasetItem]:
+        """Find the dataset items most similar to an item, from its stored search embedding
+
+        No model is loaded, the item view vector is read from the semantic
+        search embeddings table and used as query vector.
+
+        Args:
+            item_id (str): Item ID
+            view (str): Item view
+            k (int): Number of similar items
+            model (str, optional): Model of semantic search embeddings. Defaults to None for the first embeddings table with the view.
+            load_active_learning (bool, optional): Load item active learning info. Defaults to True.
+            nprobes (int, optional): Number of IVF partitions searched when view is indexed. Defaults to None for Lance default.
+            refine_factor (int, optional): Re-rank refine_factor * k candidates with exact distances when view is indexed. Defaults to None for no re-ranking.
+            columns (dict[str, list[str]], optional): Columns to read per table group ("main", "media", ...), key columns are always read. Defaults to None for all columns of all tables.
+        Returns:
+            list[DatasetItem]: Similar items, by increasing distance
+        """
+
+        # Update info in case of change
+        self.reload_info()
+
+        # Load tables
+        ds_tables = self.open_tables()
+
+        for table in self.info.tables.get("embeddings", []):
+            if (
+                table.type == "search"
+                and (model is None or table.source == model)
+                and table.source in ds_tables["embeddings"]
+                and table.fields.get(view, "").startswith("vector(")
+            ):
+                sem_search_table = ds_tables["embeddings"][table.source].to_lance()
+
+                # Read item vector
+                vectors = self._scan_rows(
+                    sem_search_table, sql_in_filter("id", [item_id]), [view]
+                )[view].to_pylist()
+                if not vectors or vectors[0] is None:
                     return None
+                value_type = sem_search_table.schema.field(view).type.value_type
+                vector = dequantize_vectors(
+                    np.array(vectors[0], dtype=value_type.to_pandas_dtype()),
+                    (table.scales or {}).get(view),
+                )
 
-    def load_item(
+                # Search one more item to leave out the item itself
+                results = self._vector_search(
+                    sem_search_table,
+                    [view],
+                    vector,
+                    k + 1,
+                    nprobes=nprobes,
+                    refine_factor=refine_factor,
+                    scales=table.scales,
+                )
+                results = [result for result in results if result[1] != item_id][:k]
+
+                return self._load_ranked_items(results, load_active_learning, columns)
+
+        return None
+
+    def _load_ranked_items(
         self,
-        item_id: str,
+        results: list[tuple[float, str]],
+        load_active_learning: bool = True,
+        columns: Optional[dict[str, list[str]]] = None,
+    ) -> list[DatasetItem]:
+        """Load dataset items from search results, with their search distance as feature
+
+        Args:
+            results (list[tuple[float, str]]): Distance and item ID search results
+            load_active_learning (bool, optional): Load item active learning info. Defaults to True.
+            columns (dict[str, list[str]], optional): Columns to read per table group ("main", "media", ...), key columns are always read. Defaults to None for all columns of all tables.
+        Returns:
+            list[DatasetItem]: Dataset items, in search results order
+        """
+
+        distances = {id: distance for distance, id in results}
+        items = self.load_items_by_ids(
+            list(distances.keys()),
+            load_active_learning=load_active_learning,
+            columns=columns,
+        )
+
+        if items:
+            # Add search distance to item features
+            for item in items:
+                item.features["search distance"] = ItemFeature(
+                    name="search distance",
+                    dtype="number",
+                    value=round(distances[item.id], 2),
+                )
+            return items
+        else:
+            return None
+
+    def load_items_by_ids(
+        self,
+        ids: list[str],
         load_media: bool = True,
         load_objects: bool = False,
         load_active_learning: bool = True,
         load_embeddings: bool = False,
         model_id: str = None,
-    ) -> DatasetItem:
-        """Find dataset item in selected tables
+        media_features: bool = False,
+        columns: Optional[dict[str, list[str]]] = None,
+    ) -> list[DatasetItem]:
+        """Find dataset items in selected tables
+
+        Item rows are taken at their positions in the main, media and active
+        learning tables, found in the item order table. Objects and
+        embeddings tables, which are not in the item order table, are scanned
+        once for all items.
 
         Args:
-            item_id (str): Dataset item ID
-            load_media (bool, optional): Load item media. Defaults to True.
-            load_objects (bool, optional): Load item objects. Defaults to False.
-            load_active_learning (bool, optional): Load item active learning info. Defaults to True.
-            load_embeddings (bool, optional): Load item embeddings. Defaults to False.
+            ids (list[str]): Dataset item IDs
+            load_media (bool, optional): Load items media. Defaults to True.
+            load_objects (bool, optional): Load items objects. Defaults to False.
+            load_active_learning (bool, optional): Load items active learning info. Defaults to True.
+            load_embeddings (bool, optional): Load items embeddings. Defaults to False.
             model_id (str, optional): Model ID (ONNX file path) of embeddings to load. Defaults to None.
+            media_features (bool, optional): Load media features like image width and height (slow for large item batches). Defaults to False.
+            columns (dict[str, list[str]], optional): Columns to read per table group ("main", "media", ...), key columns are always read. Defaults to None for all columns of all tables.
         Returns:
-            DatasetItem: Dataset item
+            list[DatasetItem]: Dataset items found, in the order of the given IDs
         """
 
+        if not ids:
+            return None
+
         # Update info in case of change
-        self.info = self.load_info()
+        self.reload_info()
 
         # Load tables
         ds_tables = self.open_tables()
 
-        # Load PyArrow item from tables
-        pyarrow_item: dict[str, dict[str, pa.Table]] = defaultdict(dict)
+        # Resolve IDs to row positions with item order table
+        order = self.load_order()
+        positions = self._order_positions(order, ids)
+        if not positions:
+            return None
+        rows = self._take_order_page(order, positions)
 
-        # Load PyArrow item from main table
-        lance_scanner = (
-            ds_tables["main"]["db"].to_lance().scanner(filter=f"id in ('{item_id}')")
+        # Load PyArrow items from tables
+        pyarrow_items: dict[str, dict[str, pa.Table]] = defaultdict(dict)
+        id_filter = sql_in_filter("id", ids)
+        columns = columns if columns is not None else {}
+
+        # Load PyArrow items from main table
+        pyarrow_items["main"]["db"] = self._take_rows(
+            ds_tables["main"]["db"].to_lance(), rows["db"], columns.get("main")
         )
-        pyarrow_item["main"]["db"] = lance_scanner.to_table()
 
-        # Load PyArrow item from media tables
+        # Load PyArrow items from media tables
         if load_media:
             for media_source, media_table in ds_tables["media"].items():
-                lance_scanner = media_table.to_lance().scanner(
-                    filter=f"id in ('{item_id}')"
+                pyarrow_items["media"][media_source] = self._take_rows(
+                    media_table.to_lance(), rows[media_source], columns.get("media")
                 )
-                pyarrow_item["media"][media_source] = lance_scanner.to_table()
 
-        # Load PyArrow item from objects tables
+        # Load PyArrow items from objects tables
         if load_objects:
             for obj_source, obj_table in ds_tables["objects"].items():
-                lance_scanner = obj_table.to_lance().scanner(
-                    filter=f"item_id in ('{item_id}')"
+                pyarrow_items["objects"][obj_source] = self._scan_rows(
+                    obj_table.to_lance(),
+                    sql_in_filter("item_id", ids),
+                    columns.get("objects"),
                 )
-                pyarrow_item["objects"][obj_source] = lance_scanner.to_table()
 
-        # Load PyArrow item from active learning tables
+        # Load PyArrow items from active learning tables
         if load_active_learning:
-            for al_source, al_table in ds_tables["active_learning"].items():
-                lance_scanner = al_table.to_lance().scanner(
-                    filter=f"id in ('{item_id}')"
-                )
-                pyarrow_item["active_learning"][al_source] = lance_scanner.to_table()
+            for table in self.info.tables.get("active_learning", []):
+                if table.source in ds_tables["active_learning"]:
+                    pyarrow_items["active_learning"][table.source] = self._take_rows(
+                        ds_tables["active_learning"][table.source].to_lance(),
+                        rows[table.name],
+                        columns.get("active_learning"),
+                    )
 
-        # Load PyArrow item from segmentation embeddings tables
+        # Load PyArrow items from segmentation embeddings tables
         found_embeddings = False if load_embeddings else True
         if load_embeddings:
             for emb_source, emb_table in ds_tables["embeddings"].items():
                 if emb_source.lower() in model_id.lower():
                     found_embeddings = True
-                    lance_scanner = emb_table.to_lance().scanner(
-                        filter=f"id in ('{item_id}')"
+                    pyarrow_items["embeddings"][emb_source] = self._scan_rows(
+                        emb_table.to_lance(), id_filter, columns.get("embeddings")
                     )
-                    pyarrow_item["embeddings"][emb_source] = lance_scanner.to_table()
 
-        if pyarrow_item["main"]["db"].num_rows > 0 and found_embeddings:
-            return DatasetItem.from_pyarrow(
-                pyarrow_item,
+        if pyarrow_items["main"]["db"].num_rows > 0 and found_embeddings:
+            items = DatasetItem.from_pyarrow_batch(
+                pyarrow_items,
                 self.info,
                 self.media_dir,
-                media_features=True,
+                media_features=media_features,
                 model_id=model_id,
             )
+            # Restore order of given IDs
+            items_by_id = {item.id: item for item in items}
+            return [items_by_id[id] for id in ids if id in items_by_id]
         else:
             return None
 
+    def load_item(
+        self,
+        item_id: str,
+        load_media: bool = True,
+        load_objects: bool = False,
+        load_active_learning: bool = True,
+        load_embeddings: bool = False,
+        model_id: str = None,
+        columns: Optional[dict[str, list[str]]] = None,
+    ) -> DatasetItem:
+        """Find dataset item in selected tables
+
+        Args:
+            item_id (str): Dataset item ID
+            load_media (bool, optional): Load item media. Defaults to True.
+            load_objects (bool, optional): Load item objects. Defaults to False.
+            load_active_learning (bool, optional): Load item active learning info. Defaults to True.
+            load_embeddings (bool, optional): Load item embeddings. Defaults to False.
+            model_id (str, optional): Model ID (ONNX file path) of embeddings to load. Defaults to None.
+            columns (dict[str, list[str]], optional): Columns to read per table group ("main", "media", ...), key columns are always read. Defaults to None for all columns of all tables.
+        Returns:
+            DatasetItem: Dataset item
+        """
+
+        items = self.load_items_by_ids(
+            [item_id],
+            load_media=load_media,
+            load_objects=load_objects,
+            load_active_learning=load_active_learning,
+            load_embeddings=load_embeddings,
+            model_id=model_id,
+            media_features=True,
+            columns=columns,
+        )
+
+        return items[0] if items else None
+
     def save_item(self, item: DatasetItem):
         """Save dataset item features and objects
 
@@ -473,13 +1903,16 @@ class Dataset(BaseModel):
         """
 
         # Update info in case of change
-        self.info = self.load_info()
+        self.reload_info()
 
         # Load dataset
         ds_tables = self.open_tables()
 
         # Save item label if it exists
         if "label" in item.features:
+            # Item order table before the update, to move the item row in it
+            order_ds = self._stored_order(self._order_tables(ds_tables))
+
             # If label not in main table, add label field
             if "label" not in ds_tables["main"]["db"].schema.names:
                 main_table_ds = ds_tables["main"]["db"].to_lance()
@@ -511,6 +1944,12 @@ class Dataset(BaseModel):
             # Clear change history to prevent dataset from becoming too large
             ds_tables["main"]["db"].to_lance().cleanup_old_versions()
 
+            # Update item order as updated item row has moved
+            if order_ds is not None:
+                self._move_order_row(order_ds, item.id)
+            else:
+                self.build_order()
+
         # Get current item objects
         current_obj_tables = {}
         for source, table in ds_tables["objects"].items():
@@ -566,11 +2005,11 @@ class Dataset(BaseModel):
                         "category_id": "int",
                         "category_name": "str",
                     }
-                    annotator_table = {
-                        "name": "obj_annotator",
-                        "source": source,
-                        "fields": annnotator_fields,
-                    }
+                    annotator_table = DatasetTable(
+                        name="obj_annotator",
+                        source=source,
+                        fields=annnotator_fields,
+                    )
 
                     # Create new objects table
                     ds = self.connect()
@@ -0,0 +1,46 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+from pydantic import BaseModel
+
+
+class DatasetIndex(BaseModel):
+    """DatasetIndex
+
+    Attributes:
+        column (str): Indexed column
+        type (str): Index type
+        metric (str): Distance metric
+        num_partitions (int): Number of IVF partitions
+        num_sub_vectors (int): Number of PQ sub-vectors
+        num_rows (int): Number of table rows when index was built
+    """
+
+    column: str
+    type: str
+    metric: str
+    num_partitions: int
+    num_sub_vectors: int
+    num_rows: int
+
+    def is_stale(self, num_rows: int) -> bool:
+        """Check if rows were added to or removed from table since index was built
+
+        Args:
+            num_rows (int): Current number of table rows
+
+        Returns:
+            bool: True if index does not cover current table rows
+        """
+
+        return num_rows != self.num_rows
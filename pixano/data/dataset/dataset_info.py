@@ -19,6 +19,7 @@ from pydantic import BaseModel
 
 from pixano.core import Image
 from pixano.data.dataset.dataset_category import DatasetCategory
+from pixano.data.dataset.dataset_media import DatasetMedia
 from pixano.data.dataset.dataset_stat import DatasetStat
 from pixano.data.dataset.dataset_table import DatasetTable
 
@@ -37,6 +38,7 @@ class DatasetInfo(BaseModel):
         categories (list[DatasetCategory], optional): Dataset categories
         preview (str, optional): Dataset preview
         stats (list[DatasetStat], optional): Dataset stats
+        media (dict[str, list[DatasetMedia]], optional): Media ingestion methods and sources by media field
     """
 
     id: str
@@ -49,6 +51,7 @@ class DatasetInfo(BaseModel):
     categories: Optional[list[DatasetCategory]] = None
     preview: Optional[str] = None
     stats: Optional[list[DatasetStat]] = None
+    media: Optional[dict[str, list[DatasetMedia]]] = None
 
     def save(self, save_dir: Path):
         """Save DatasetInfo to json file"""
@@ -11,8 +11,9 @@
 #
 # http://www.cecill.info
 
+from collections import defaultdict
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import pyarrow as pa
 from pydantic import BaseModel
@@ -62,63 +63,141 @@ class DatasetItem(BaseModel):
             DatasetItem: Formatted item
         """
 
-        item_info = pyarrow_item["main"]["db"].to_pylist()[0]
+        return DatasetItem.from_pyarrow_batch(
+            pyarrow_item,
+            info,
+            media_dir,
+            media_features,
+            model_id,
+        )[0]
 
-        # Create item
-        item = DatasetItem(
-            id=item_info["id"],
-            split=item_info["split"],
-        )
+    @staticmethod
+    def from_pyarrow_batch(
+        pyarrow_items: dict[str, dict[str, pa.Table]],
+        info: DatasetInfo,
+        media_dir: Path,
+        media_features: bool = False,
+        model_id: str = None,
+    ) -> list["DatasetItem"]:
+        """Format PyArrow items from tables containing the rows of several items
 
-        for group_name, table_group in info.tables.items():
-            # Main table
-            if group_name == "main":
-                for table in table_group:
-                    if table.name == "db":
-                        # Item features
-                        item.features = ItemFeature.from_pyarrow(
-                            pyarrow_item["main"]["db"],
-                            Fields(table.fields).to_schema(),
-                        )
+        Each table is converted once, and its rows are joined to the main table rows on item ID.
+        Tables can be column projections, only the loaded columns are formatted.
 
-            # Media tables
-            if group_name == "media" and "media" in pyarrow_item:
-                item.views = {}
-                for table in table_group:
-                    item.views = item.views | ItemView.from_pyarrow(
-                        pyarrow_item["media"][table.name],
-                        Fields(table.fields).to_schema(),
-                        media_dir,
-                        media_features,
-                    )
+        Args:
+            pyarrow_items (dict[str, dict[str, pa.Table]]): PyArrow items
+            info (DatasetInfo): Dataset info
+            media_dir (Path): Dataset media directory
+            media_features (bool, optional): Load media features like image width and height (slow for large item batches)
+            model_id (str, optional): Model ID (ONNX file path) of embeddings to load. Defaults to None.
 
-            # Objects
-            if group_name == "objects" and "objects" in pyarrow_item:
-                item.objects = {}
-                for table in table_group:
-                    item.objects = item.objects | ItemObject.from_pyarrow(
-                        pyarrow_item["objects"][table.source],
-                        Fields(table.fields).to_schema(),
-                        table.source,
-                    )
+        Returns:
+            list[DatasetItem]: Formatted items, in main table order
+        """
 
-            # Active Learning
-            if group_name == "active_learning" and "active_learning" in pyarrow_item:
-                for table in table_group:
-                    al_features = ItemFeature.from_pyarrow(
-                        pyarrow_item["active_learning"][table.source],
-                        Fields(table.fields).to_schema(),
+        # Index table rows by item ID
+        rows: dict[str, dict[str, dict[str, Any]]] = defaultdict(dict)
+        for group_name, tables in pyarrow_items.items():
+            if group_name != "main":
+                for table_name, table in tables.items():
+                    if group_name == "objects":
+                        rows[group_name][table_name] = defaultdict(list)
+                        for row in table.to_pylist():
+                            rows[group_name][table_name][row["item_id"]].append(row)
+                    else:
+                        rows[group_name][table_name] = {
+                            row["id"]: row for row in table.to_pylist()
+                        }
+
+        # Convert table fields to schemas once, keeping only loaded columns
+        schemas: dict[str, dict[str, pa.schema]] = defaultdict(dict)
+        for group_name, table_group in info.tables.items():
+            for table in table_group:
+                schema = Fields(table.fields).to_schema()
+                loaded_table = pyarrow_items.get(group_name, {}).get(
+                    table.name if group_name in ["main", "media"] else table.source
+                )
+                if loaded_table is not None:
+                    schema = pa.schema(
+                        [
+                            field
+                            for field in schema
+                            if field.name in loaded_table.column_names
+                        ]
                     )
-                    item.features = item.features | al_features
-
-            # Segmentation embeddings
-            if group_name == "embeddings" and "embeddings" in pyarrow_item:
-                item.embeddings = {}
-                for table in table_group:
-                    if table.source.lower() in model_id.lower():
-                        item.embeddings = item.embeddings | ItemEmbedding.from_pyarrow(
-                            pyarrow_item["embeddings"][table.source],
-                            Fields(table.fields).to_schema(),
+                schemas[group_name][table.name] = schema
+
+        items = []
+        for item_info in pyarrow_items["main"]["db"].to_pylist():
+            # Create item
+            item = DatasetItem(
+                id=item_info["id"],
+                split=item_info["split"],
+            )
+
+            for group_name, table_group in info.tables.items():
+                # Main table
+                if group_name == "main":
+                    for table in table_group:
+                        if table.name == "db":
+                            # Item features
+                            item.features = ItemFeature.from_row(
+                                item_info,
+                                schemas[group_name][table.name],
+                            )
+
+                # Media tables
+                if group_name == "media" and "media" in pyarrow_items:
+                    item.views = {}
+                    for table in table_group:
+                        row = rows["media"].get(table.name, {}).get(item.id)
+                        if row is not None:
+                            item.views = item.views | ItemView.from_row(
+                                row,
+                                schemas[group_name][table.name],
+                                media_dir,
+                                media_features,
+                            )
+
+                # Objects
+                if group_name == "objects" and "objects" in pyarrow_items:
+                    item.objects = {}
+                    for table in table_group:
+                        item.objects = item.objects | ItemObject.from_rows(
+                            rows["objects"].get(table.source, {}).get(item.id, []),
+                            schemas[group_name][table.name],
+                            table.source,
                         )
 
-        return item
+                # Active Learning
+                if (
+                    group_name == "active_learning"
+                    and "active_learning" in pyarrow_items
+                ):
+                    for table in table_group:
+                        row = rows["active_learning"].get(table.source, {}).get(item.id)
+                        if row is not None:
+                            al_features = ItemFeature.from_row(
+                                row,
+                                schemas[group_name][table.name],
+                            )
+                            item.features = item.features | al_features
+
+                # Segmentation embeddings
+                if group_name == "embeddings" and "embeddings" in pyarrow_items:
+                    item.embeddings = {}
+                    for table in table_group:
+                        if table.source.lower() in model_id.lower():
+                            row = rows["embeddings"].get(table.source, {}).get(item.id)
+                            if row is not None:
+                                item.embeddings = (
+                                    item.embeddings
+                                    | ItemEmbedding.from_row(
+                                        row,
+                                        schemas[group_name][table.name],
+                                    )
+                                )
+
+            items.append(item)
+
+        return items
@@ -0,0 +1,41 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class DatasetMedia(BaseModel):
+    """DatasetMedia
+
+    Attributes:
+        method (str): Media ingestion method ("copy", "move", "reflink", "hardlink" or "symlink")
+        source (str, optional): Source directory, for media files linked to their source
+    """
+
+    method: str
+    source: Optional[str] = None
+
+    @property
+    def depends_on_source(self) -> bool:
+        """Return True if media files depend on their source directory (symlinks)
+
+        Hardlinks and reflinks are independent from their source once created.
+
+        Returns:
+            bool: True if media files are symlinks
+        """
+
+        return self.method == "symlink"
@@ -0,0 +1,91 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+QUERY_TYPES = ["int", "float", "bool", "str"]
+
+
+def sql_value(value: str | int | float | bool) -> str:
+    """Return value as SQL literal
+
+    Args:
+        value (str | int | float | bool): Value
+
+    Returns:
+        str: SQL literal
+    """
+
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    # Escape single quotes
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+class DatasetFilter(BaseModel):
+    """DatasetFilter
+
+    Attributes:
+        field (str): Feature name, from main or active learning tables
+        operator (str, optional): Comparison operator ("=", "!=", "<", "<=", ">", ">=", "in")
+        value (str | int | float | bool | list[str | int | float | bool]): Value to compare to, list of values for "in" operator
+    """
+
+    field: str
+    operator: Literal["=", "!=", "<", "<=", ">", ">=", "in"] = "="
+    value: str | int | float | bool | list[str | int | float | bool]
+
+    def to_sql(self) -> str:
+        """Return filter as SQL predicate
+
+        Returns:
+            str: SQL predicate
+        """
+
+        if self.operator == "in":
+            values = self.value if isinstance(self.value, list) else [self.value]
+            return f"{self.field} in (" + ", ".join(sql_value(v) for v in values) + ")"
+
+        return f"{self.field} {self.operator} {sql_value(self.value)}"
+
+
+class DatasetQuery(BaseModel):
+    """DatasetQuery
+
+    Attributes:
+        filters (list[DatasetFilter], optional): Filters that items must all match
+        order_by (str, optional): Feature name to sort items by, items are sorted by ID if None
+        descending (bool, optional): Sort items in descending order
+    """
+
+    filters: list[DatasetFilter] = []
+    order_by: Optional[str] = None
+    descending: bool = False
+
+
+class DatasetSearchQuery(BaseModel):
+    """DatasetSearchQuery
+
+    Attributes:
+        model (str): Model of semantic search embeddings
+        search (str): Search text
+        filters (list[DatasetFilter], optional): Filters on item or object features that items must all match
+    """
+
+    model: str
+    search: str
+    filters: list[DatasetFilter] = []
@@ -0,0 +1,149 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from pixano.data.dataset.dataset import Dataset
+from pixano.data.dataset.dataset_info import DatasetInfo
+from pixano.utils import file_version
+
+
+class DatasetRegistry:
+    """Process-wide registry of the datasets in a library directory
+
+    Keeps a dataset ID to dataset path index and cached Dataset objects,
+    invalidated when the dataset files change on disk.
+
+    Attributes:
+        directory (Path): Dataset library directory
+    """
+
+    def __init__(self, directory: Path):
+        """Initialize DatasetRegistry
+
+        Args:
+            directory (Path): Dataset library directory
+        """
+
+        self.directory = directory
+
+        self._lock = threading.Lock()
+        # Dataset ID to dataset path index
+        self._paths: dict[str, Path] = {}
+        # Dataset path to dataset ID and db.json version when indexed
+        self._ids: dict[Path, tuple[str, tuple[int, int]]] = {}
+        # Dataset path to dataset files versions and cached Dataset
+        self._datasets: dict[Path, tuple[tuple, Dataset]] = {}
+
+    @staticmethod
+    @lru_cache
+    def from_directory(directory: Path) -> "DatasetRegistry":
+        """Return the registry shared by the whole process for a library directory
+
+        Args:
+            directory (Path): Dataset library directory
+
+        Returns:
+            DatasetRegistry: Dataset registry
+        """
+
+        return DatasetRegistry(directory)
+
+    def find(self, id: str) -> Optional[Dataset]:
+        """Find Dataset in library
+
+        Args:
+            id (str): Dataset ID
+
+        Returns:
+            Dataset: Dataset, None if not found
+        """
+
+        with self._lock:
+            path = self._paths.get(id)
+
+            # Check that indexed dataset has not changed, otherwise update index
+            if path is None or self._ids.get(path, (None, None))[1] != file_version(
+                path / "db.json"
+            ):
+                self._update_index()
+                path = self._paths.get(id)
+
+            if path is None:
+                return None
+
+            return self._load(path)
+
+    def clear(self):
+        """Clear index and cached datasets"""
+
+        with self._lock:
+            self._paths.clear()
+            self._ids.clear()
+            self._datasets.clear()
+
+    def _update_index(self):
+        """Update dataset ID to dataset path index, only reading changed info files"""
+
+        paths: dict[str, Path] = {}
+        ids: dict[Path, tuple[str, tuple[int, int]]] = {}
+
+        # Browse directory
+        for json_fp in sorted(self.directory.glob("*/db.json")):
+            path = json_fp.parent
+            version = file_version(json_fp)
+            if version is None:
+                continue
+
+            # Read dataset ID only if info file has changed
+            if path in self._ids and self._ids[path][1] == version:
+                ds_id = self._ids[path][0]
+            else:
+                ds_id = DatasetInfo.from_json(json_fp).id
+
+            ids[path] = (ds_id, version)
+            paths.setdefault(ds_id, path)
+
+        self._paths = paths
+        self._ids = ids
+
+        # Drop cached datasets that are not in the library anymore
+        for path in list(self._datasets):
+            if path not in ids:
+                del self._datasets[path]
+
+    def _load(self, path: Path) -> Dataset:
+        """Return cached Dataset, or load it if its files have changed
+
+        Args:
+            path (Path): Dataset path
+
+        Returns:
+            Dataset: Dataset
+        """
+
+        versions = tuple(
+            file_version(path / file)
+            for file in ["db.json", "stats.json", "preview.png"]
+        )
+
+        cached = self._datasets.get(path)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+
+        dataset = Dataset(path)
+        self._datasets[path] = (versions, dataset)
+        return dataset
@@ -16,6 +16,8 @@ from typing import Optional
 
 from pydantic import BaseModel
 
+from pixano.data.dataset.dataset_index import DatasetIndex
+
 
 class DatasetTable(BaseModel):
     """DatasetTable
@@ -25,9 +27,13 @@ class DatasetTable(BaseModel):
         fields (dict[str, str]): Table fields
         source (str, optional): Table source
         type (str, optional): Table type
+        indexes (list[DatasetIndex], optional): Table vector indexes
+        scales (dict[str, float], optional): int8 vector fields quantization scales
     """
 
     name: str
     fields: dict[str, str]
     source: Optional[str] = None
     type: Optional[str] = None
+    indexes: Optional[list[DatasetIndex]] = None
+    scales: Optional[dict[str, float]] = None
@@ -13,7 +13,6 @@
 
 import datetime
 import json
-import shutil
 from math import ceil
 from pathlib import Path
 from urllib.parse import urlparse
@@ -23,6 +22,7 @@ from tqdm.auto import tqdm
 from pixano.core import Image
 from pixano.data import Dataset
 from pixano.data.exporters.exporter import Exporter
+from pixano.utils import ingest_media
 
 
 class COCOExporter(Exporter):
@@ -70,7 +70,8 @@ class COCOExporter(Exporter):
         ann_dir.mkdir(parents=True, exist_ok=True)
 
         # Iterate on splits
-        with tqdm(desc="Processing dataset", total=self.dataset.num_rows) as progress:
+        num_rows = self.dataset.num_rows
+        with tqdm(desc="Processing dataset", total=num_rows) as progress:
             for split in splits:
                 # Create COCO json
                 coco_json = {
@@ -98,11 +99,29 @@ class COCOExporter(Exporter):
                 category_ids = [cat.id for cat in self.dataset.info.categories]
                 batch_size = 1024
 
-                for i in range(ceil(self.dataset.num_rows / batch_size)):
+                for i in range(ceil(num_rows / batch_size)):
                     # Load items
                     offset = i * batch_size
-                    limit = min(self.dataset.num_rows, offset + batch_size)
-                    items = self.dataset.load_items(limit, offset)
+                    limit = min(num_rows, offset + batch_size)
+                    items = self.dataset.load_items(
+                        limit,
+                        offset,
+                        load_active_learning=False,
+                        columns={"main": []},
+                    )
+
+                    # Load objects of items in selected splits
+                    items_objects = {
+                        item.id: item.objects
+                        for item in self.dataset.load_items_by_ids(
+                            [item.id for item in items if item.split in splits],
+                            load_media=False,
+                            load_objects=True,
+                            load_active_learning=False,
+                            columns={"main": []},
+                        )
+                        or []
+                    }
 
                     # Iterate on items
                     for item in items:
@@ -120,10 +139,16 @@ class COCOExporter(Exporter):
                                         if urlparse(view.uri).scheme == ""
                                         else view.uri
                                     )
-                                    # Create image from URI
+                                    # Create image from URI, with stored size if available
                                     images[view.id] = Image(
                                         uri=uri,
                                         uri_prefix=self.dataset.media_dir.absolute().as_uri(),
+                                        width=view.features["width"].value
+                                        if "width" in view.features
+                                        else None,
+                                        height=view.features["height"].value
+                                        if "height" in view.features
+                                        else None,
                                     )
                                     # Append image info
                                     coco_json["images"].append(
@@ -138,8 +163,7 @@ class COCOExporter(Exporter):
                                     )
 
                             # Export objects
-                            item = self.dataset.load_item(item.id, load_objects=True)
-                            for obj in item.objects.values():
+                            for obj in items_objects.get(item.id, {}).values():
                                 # Filter by views and object sources
                                 if (
                                     obj.view_id in images.keys()
@@ -215,6 +239,5 @@ class COCOExporter(Exporter):
                 self.dataset.media_dir.exists()
                 and self.dataset.media_dir != export_dir / "media"
             ):
-                shutil.copytree(
-                    self.dataset.media_dir, export_dir / "media", dirs_exist_ok=True
-                )
+                # Linked media files are exported as copies of their source files
+                ingest_media(self.dataset.media_dir, export_dir / "media", "copy")
@@ -11,6 +11,8 @@
 #
 # http://www.cecill.info
 
+from typing import Optional
+
 import pyarrow as pa
 from pydantic import BaseModel
 
@@ -24,6 +26,31 @@ from pixano.core import (
     PoseType,
 )
 
+VECTOR_PA_TYPES = {"float32": pa.float32(), "float16": pa.float16(), "int8": pa.int8()}
+
+
+def parse_vector_type(field_type: str) -> Optional[tuple[int, str]]:
+    """Parse vector field type, written as vector(size) or vector(size, dtype)
+    with dtype "float32" (default), "float16" or "int8"
+
+    Args:
+        field_type (str): Field type
+
+    Returns:
+        tuple[int, str]: Vector size and data type, None if not a vector field type
+    """
+
+    if not (field_type.startswith("vector(") and field_type.endswith(")")):
+        return None
+
+    args = field_type.removeprefix("vector(").removesuffix(")").split(",")
+    size = args[0].strip()
+    dtype = args[1].strip() if len(args) == 2 else "float32"
+    if len(args) > 2 or not size.isnumeric() or dtype not in VECTOR_PA_TYPES:
+        return None
+
+    return int(size), dtype
+
 
 class Fields(BaseModel):
     """Dataset PyArrow fields as string dictionary
@@ -85,10 +112,10 @@ class Fields(BaseModel):
                             input_type.removeprefix("[").removesuffix("]").lower()
                         ]
                     )
-                if input_type.startswith("vector(") and input_type.endswith(")"):
-                    size_str = input_type.removeprefix("vector(").removesuffix(")")
-                    if size_str.isnumeric():
-                        return pa.list_(pa.float32(), list_size=int(size_str))
+                vector_type = parse_vector_type(input_type)
+                if vector_type is not None:
+                    size, dtype = vector_type
+                    return pa.list_(VECTOR_PA_TYPES[dtype], list_size=size)
                 return pa_type_mapping[input_type.lower()]
 
         fields = []
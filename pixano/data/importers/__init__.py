@@ -14,10 +14,13 @@
 from pixano.data.importers.coco_importer import COCOImporter
 from pixano.data.importers.dota_importer import DOTAImporter
 from pixano.data.importers.image_importer import ImageImporter
-from pixano.data.importers.importer import Importer
+from pixano.data.importers.importer import ImageTask, Importer
+from pixano.data.importers.table_builder import TableBuilder
 
 __all__ = [
     "Importer",
+    "ImageTask",
+    "TableBuilder",
     "ImageImporter",
     "DOTAImporter",
     "COCOImporter",
@@ -12,15 +12,42 @@
 # http://www.cecill.info
 
 import json
-from collections import defaultdict
+import tempfile
 from collections.abc import Iterator
 from pathlib import Path
 from urllib.parse import urlparse
 
-from pixano.core import BBox, CompressedRLE, Image
+import duckdb
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from pixano.core import BBox
 from pixano.data.dataset import DatasetCategory, DatasetTable
-from pixano.data.importers.importer import Importer
-from pixano.utils import image_to_thumbnail, natural_key
+from pixano.data.importers.importer import ImageTask, Importer
+from pixano.utils import encode_rle_batch, iter_json_object, natural_key
+
+# Images and annotations spilled to Parquet files while reading annotation files
+IMAGES_SCHEMA = pa.schema(
+    [
+        pa.field("id", pa.string()),
+        pa.field("file_name", pa.string()),
+        pa.field("width", pa.int64()),
+        pa.field("height", pa.int64()),
+    ]
+)
+ANNOTATIONS_SCHEMA = pa.schema(
+    [
+        pa.field("index", pa.int64()),
+        pa.field("id", pa.string()),
+        pa.field("image_id", pa.string()),
+        pa.field("bbox", pa.list_(pa.float64())),
+        pa.field("segmentation", pa.string()),
+        pa.field("category_id", pa.int64()),
+    ]
+)
+SPILL_BATCH_SIZE = 10000
+# Images whose masks are encoded at once, masks of images of the same size sharing encoding calls
+MASK_BATCH_IMAGES = 64
 
 
 class COCOImporter(Importer):
@@ -106,102 +133,245 @@ class COCOImporter(Importer):
             if not any(source_path.iterdir()):
                 raise FileNotFoundError(f"{source_path} is empty.")
 
-        # Get COCO categories
-        categories = []
+        # Check annotation files
         for split in splits:
-            with open(input_dirs["objects"] / f"instances_{split}.json", "r") as f:
-                coco_instances = json.load(f)
-                for category in coco_instances["categories"]:
-                    categories.append(DatasetCategory.model_validate(category))
+            instances_path = input_dirs["objects"] / f"instances_{split}.json"
+            if not instances_path.exists():
+                raise FileNotFoundError(f"{instances_path} does not exist.")
 
         # Initialize Importer
-        super().__init__(name, description, tables, splits, categories)
+        super().__init__(name, description, tables, splits)
+
+    def spill_instances(
+        self, split: str, spill_dir: Path
+    ) -> dict[int, DatasetCategory]:
+        """Read split annotation file in a single streaming pass,
+        spilling images and annotations to Parquet files,
+        and add split categories to dataset info
+
+        Args:
+            split (str): Dataset split
+            spill_dir (Path): Directory for images.parquet and annotations.parquet
+
+        Returns:
+            dict[int, DatasetCategory]: Categories by category ID
+        """
+
+        writers = {
+            "images": pq.ParquetWriter(spill_dir / "images.parquet", IMAGES_SCHEMA),
+            "annotations": pq.ParquetWriter(
+                spill_dir / "annotations.parquet", ANNOTATIONS_SCHEMA
+            ),
+        }
+        schemas = {"images": IMAGES_SCHEMA, "annotations": ANNOTATIONS_SCHEMA}
+        batches = {"images": [], "annotations": []}
+        num_annotations = 0
+
+        def spill(key: str):
+            writers[key].write_table(
+                pa.Table.from_pylist(batches[key], schema=schemas[key])
+            )
+            batches[key] = []
+
+        categories = []
+        with open(
+            self.input_dirs["objects"] / f"instances_{split}.json",
+            "r",
+            encoding="utf-8",
+        ) as f:
+            for key, value in iter_json_object(f):
+                if key == "images":
+                    batches[key].append(
+                        {
+                            "id": str(value["id"]),
+                            "file_name": value["file_name"],
+                            "width": value["width"],
+                            "height": value["height"],
+                        }
+                    )
+                elif key == "annotations":
+                    batches[key].append(
+                        {
+                            "index": num_annotations,
+                            "id": str(value["id"]),
+                            "image_id": str(value["image_id"]),
+                            "bbox": value.get("bbox") or None,
+                            "segmentation": json.dumps(value["segmentation"])
+                            if value.get("segmentation")
+                            else None,
+                            "category_id": value["category_id"],
+                        }
+                    )
+                    num_annotations += 1
+                elif key == "categories":
+                    categories.append(DatasetCategory.model_validate(value))
+                if key in batches and len(batches[key]) >= SPILL_BATCH_SIZE:
+                    spill(key)
+
+        for key, writer in writers.items():
+            spill(key)
+            writer.close()
+
+        # Add split categories to dataset info
+        self.info.categories = self.info.categories or []
+        for category in categories:
+            if category not in self.info.categories:
+                self.info.categories.append(category)
+
+        return {category.id: category for category in categories}
 
     def import_rows(self) -> Iterator:
         """Process dataset rows for import
 
+        Annotation files are read in a single streaming pass. Images and their
+        annotations are streamed in image order with out-of-core DuckDB joins on
+        spilled Parquet files, so memory only grows with the number of image IDs.
+
         Yields:
             Iterator: Processed rows
         """
 
         # Iterate on splits
         for split in self.info.splits:
-            # Open annotation files
-            with open(self.input_dirs["objects"] / f"instances_{split}.json", "r") as f:
-                coco_instances = json.load(f)
-
-            # Group annotations by image ID
-            annotations = defaultdict(list)
-            for ann in coco_instances["annotations"]:
-                annotations[ann["image_id"]].append(ann)
-
-            # Create a COCO category id to COCO category dictionary
-            categories = {}
-            for cat in coco_instances["categories"]:
-                categories[cat["id"]] = cat
-
-            # Process rows
-            for im in sorted(
-                coco_instances["images"], key=lambda x: natural_key(str(x["id"]))
-            ):
-                # Load image annotations
-                im_anns = annotations[im["id"]]
-                # Load image
-                file_name_uri = urlparse(im["file_name"])
-                if file_name_uri.scheme == "":
-                    im_path = self.input_dirs["image"] / split / im["file_name"]
-                else:
-                    im_path = Path(file_name_uri.path)
-
-                # Create image thumbnail
-                im_thumb = image_to_thumbnail(im_path.read_bytes())
-
-                # Set image URI
-                im_uri = f"image/{split}/{im_path.name}"
-
-                # Return rows
-                rows = {
-                    "main": {
-                        "db": [
-                            {
-                                "id": str(im["id"]),
-                                "views": ["image"],
-                                "split": split,
-                            }
-                        ]
-                    },
-                    "media": {
-                        "image": [
-                            {
-                                "id": str(im["id"]),
-                                "image": Image(im_uri, None, im_thumb).to_dict(),
-                            }
-                        ]
-                    },
-                    "objects": {
-                        "objects": [
-                            {
-                                "id": str(ann["id"]),
-                                "item_id": str(im["id"]),
-                                "view_id": "image",
-                                "bbox": BBox.from_xywh(ann["bbox"])
-                                .normalize(im["height"], im["width"])
-                                .to_dict()
-                                if ann["bbox"]
-                                else None,
-                                "mask": CompressedRLE.encode(
-                                    ann["segmentation"], im["height"], im["width"]
-                                ).to_dict()
-                                if ann["segmentation"]
-                                else None,
-                                "category_id": int(ann["category_id"]),
-                                "category_name": str(
-                                    categories[ann["category_id"]]["name"]
-                                ),
-                            }
-                            for ann in im_anns
-                        ]
-                    },
-                }
+            with tempfile.TemporaryDirectory() as spill_dir:
+                spill_dir = Path(spill_dir)
+                categories = self.spill_instances(split, spill_dir)
+
+                # Sort images by natural ID order, reading only their IDs
+                image_ids = pq.read_table(spill_dir / "images.parquet", columns=["id"])[
+                    "id"
+                ]
+                order = sorted(
+                    range(len(image_ids)),
+                    key=lambda i: natural_key(image_ids[i].as_py()),
+                )
+                ranks = pa.table(
+                    {
+                        "id": image_ids.take(order),
+                        "rank": pa.array(range(len(order)), type=pa.int64()),
+                    }
+                )
+
+                # Stream images in natural ID order, and annotations in image order,
+                # in file order for each image
+                con = duckdb.connect(config={"temp_directory": str(spill_dir)})
+                con.register("ranks", ranks)
+                images_path = (spill_dir / "images.parquet").as_posix()
+                images_reader = (
+                    con.cursor()
+                    .execute(
+                        f"SELECT images.* FROM read_parquet('{images_path}') "
+                        "AS images JOIN ranks ON images.id = ranks.id "
+                        "ORDER BY ranks.rank",
+                    )
+                    .fetch_record_batch(SPILL_BATCH_SIZE)
+                )
+                images = (im for batch in images_reader for im in batch.to_pylist())
+                annotations_path = (spill_dir / "annotations.parquet").as_posix()
+                reader = con.execute(
+                    f"SELECT annotations.*, ranks.rank FROM read_parquet('{annotations_path}') "
+                    "AS annotations JOIN ranks ON annotations.image_id = ranks.id "
+                    "ORDER BY ranks.rank, annotations.index",
+                ).fetch_record_batch(SPILL_BATCH_SIZE)
+                annotations = (ann for batch in reader for ann in batch.to_pylist())
+                ann = next(annotations, None)
+
+                # Process rows, encoding the masks of several images at once
+                chunk = []
+                for rank, im in enumerate(images):
+                    # Load image annotations
+                    im_anns = []
+                    while ann is not None and ann["rank"] == rank:
+                        im_anns.append(ann)
+                        ann = next(annotations, None)
+
+                    chunk.append((im, im_anns))
+                    if len(chunk) >= MASK_BATCH_IMAGES:
+                        yield from self.image_rows(split, chunk, categories)
+                        chunk = []
+                yield from self.image_rows(split, chunk, categories)
+
+                con.close()
+
+    def image_rows(
+        self,
+        split: str,
+        images: list[tuple[dict, list[dict]]],
+        categories: dict[int, DatasetCategory],
+    ) -> Iterator:
+        """Process rows of several images, encoding all their masks at once
+
+        Args:
+            split (str): Dataset split
+            images (list[tuple[dict, list[dict]]]): Spilled images, with their spilled annotations
+            categories (dict[int, DatasetCategory]): Categories by category ID
+
+        Yields:
+            Iterator: Processed rows
+        """
+
+        # Encode masks of all images at once
+        masks = encode_rle_batch(
+            [
+                json.loads(ann["segmentation"]) if ann["segmentation"] else None
+                for _, im_anns in images
+                for ann in im_anns
+            ],
+            [im["height"] for im, im_anns in images for _ in im_anns],
+            [im["width"] for im, im_anns in images for _ in im_anns],
+        )
+        masks = iter(masks)
+
+        for im, im_anns in images:
+            im_masks = [next(masks) for _ in im_anns]
+
+            # Load image
+            file_name_uri = urlparse(im["file_name"])
+            if file_name_uri.scheme == "":
+                im_path = self.input_dirs["image"] / split / im["file_name"]
+            else:
+                im_path = Path(file_name_uri.path)
+
+            # Set image URI
+            im_uri = f"image/{split}/{im_path.name}"
+
+            # Return rows
+            rows = {
+                "main": {
+                    "db": [
+                        {
+                            "id": im["id"],
+                            "views": ["image"],
+                            "split": split,
+                        }
+                    ]
+                },
+                "media": {
+                    "image": [
+                        {
+                            "id": im["id"],
+                            "image": ImageTask(uri=im_uri, path=im_path),
+                        }
+                    ]
+                },
+                "objects": {
+                    "objects": [
+                        {
+                            "id": ann["id"],
+                            "item_id": im["id"],
+                            "view_id": "image",
+                            "bbox": BBox.from_xywh(ann["bbox"])
+                            .normalize(im["height"], im["width"])
+                            .to_dict()
+                            if ann["bbox"]
+                            else None,
+                            "mask": mask,
+                            "category_id": int(ann["category_id"]),
+                            "category_name": str(categories[ann["category_id"]].name),
+                        }
+                        for ann, mask in zip(im_anns, im_masks)
+                    ]
+                },
+            }
 
-                yield rows
+            yield rows
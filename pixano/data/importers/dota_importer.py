@@ -18,10 +18,13 @@ from pathlib import Path
 import shortuuid
 from PIL import Image as PILImage
 
-from pixano.core import BBox, Image
+from pixano.core import BBox
 from pixano.data.dataset import DatasetCategory, DatasetTable
-from pixano.data.importers.importer import Importer
-from pixano.utils import dota_ids, image_to_thumbnail, natural_key
+from pixano.data.importers.importer import ImageTask, Importer
+from pixano.utils import dota_ids, max_image_pixels, natural_key
+
+# Pillow decompression bomb limit allowing DOTA largest images
+DOTA_MAX_PIXELS = 806504000
 
 
 class DOTAImporter(Importer):
@@ -140,13 +143,9 @@ class DOTAImporter(Importer):
                 with open(im_anns_file) as f:
                     im_anns = [line.strip().split() for line in f]
 
-                # Allow DOTA largest images
-                PILImage.MAX_IMAGE_PIXELS = 806504000
-
-                # Get image dimensions and thumbnail
-                with PILImage.open(im_path) as im:
+                # Get image dimensions, reading only image header
+                with max_image_pixels(DOTA_MAX_PIXELS), PILImage.open(im_path) as im:
                     im_w, im_h = im.size
-                    im_thumb = image_to_thumbnail(im)
 
                 # Set image URI
                 im_uri = f"image/{split}/{im_path.name}"
@@ -166,7 +165,11 @@ class DOTAImporter(Importer):
                         "image": [
                             {
                                 "id": im_path.stem,
-                                "image": Image(im_uri, None, im_thumb).to_dict(),
+                                "image": ImageTask(
+                                    uri=im_uri,
+                                    path=im_path,
+                                    max_pixels=DOTA_MAX_PIXELS,
+                                ),
                             }
                         ]
                     },
@@ -15,10 +15,9 @@ import glob
 from collections.abc import Iterator
 from pathlib import Path
 
-from pixano.core import Image
 from pixano.data.dataset import DatasetTable
-from pixano.data.importers.importer import Importer
-from pixano.utils import image_to_thumbnail, natural_key
+from pixano.data.importers.importer import ImageTask, Importer
+from pixano.utils import natural_key
 
 
 class ImageImporter(Importer):
@@ -117,9 +116,6 @@ class ImageImporter(Importer):
 
             # Process rows
             for im_path in image_paths:
-                # Create image thumbnail
-                im_thumb = image_to_thumbnail(im_path.read_bytes())
-
                 # Set image URI
                 im_uri = (
                     f"image/{im_path.name}"
@@ -143,7 +139,7 @@ class ImageImporter(Importer):
                         "image": [
                             {
                                 "id": im_path.name,
-                                "image": Image(im_uri, None, im_thumb).to_dict(),
+                                "image": ImageTask(uri=im_uri, path=im_path),
                             }
                         ]
                     },
@@ -14,21 +14,76 @@
 import random
 import shutil
 from abc import ABC, abstractmethod
-from collections import defaultdict
+from collections import defaultdict, deque
 from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import timedelta
 from io import BytesIO
 from pathlib import Path
+from typing import Optional
 
 import lance
 import lancedb
-import pyarrow as pa
 import shortuuid
-from PIL import Image
+from PIL import Image as PILImage
+from pydantic import BaseModel
 from tqdm.auto import tqdm
 
-from pixano.data import Dataset, DatasetCategory, DatasetInfo, DatasetTable, Fields
-from pixano.utils import estimate_size
+from pixano.core import Image
+from pixano.data import (
+    Dataset,
+    DatasetCategory,
+    DatasetInfo,
+    DatasetMedia,
+    DatasetTable,
+    Fields,
+)
+from pixano.data.importers.table_builder import TableBuilder
+from pixano.utils import (
+    INGEST_METHODS,
+    LINK_METHODS,
+    estimate_size,
+    image_header,
+    image_to_thumbnail,
+    ingest_media,
+    max_image_pixels,
+)
+
+
+class ImageTask(BaseModel):
+    """Image media processing deferred by importers to Importer.import_dataset,
+    which can run it in worker processes
+
+    Attributes:
+        uri (str): Image URI
+        path (Path): Image file path
+        max_pixels (int, optional): Pillow decompression bomb limit raised for this image only
+    """
+
+    uri: str
+    path: Path
+    max_pixels: Optional[int] = None
+
+    def process(self) -> dict:
+        """Create image with thumbnail, width, height and format
+
+        Returns:
+            dict: Image as dictionary
+        """
+
+        image_bytes = self.path.read_bytes()
+        with max_image_pixels(self.max_pixels):
+            width, height, format = image_header(image_bytes)
+            thumbnail = image_to_thumbnail(image_bytes)
+
+        return Image(
+            self.uri,
+            None,
+            thumbnail,
+            width=width,
+            height=height,
+            format=format,
+        ).to_dict()
 
 
 class Importer(ABC):
@@ -72,18 +127,85 @@ class Importer(ABC):
     def create_info(
         self,
         import_dir: Path,
+        info: DatasetInfo = None,
     ):
         """Create dataset info file
 
         Args:
             import_dir (Path): Import directory
+            info (DatasetInfo, optional): Dataset info to save. Defaults to None for importer dataset info.
         """
 
         # Save DatasetInfo
         with tqdm(desc="Creating dataset info file", total=1) as progress:
-            self.info.save(import_dir)
+            (info if info is not None else self.info).save(import_dir)
             progress.update(1)
 
+    def merge_info(self, existing_info: DatasetInfo) -> DatasetInfo:
+        """Merge importer dataset info into the info of an existing dataset
+
+        Args:
+            existing_info (DatasetInfo): Existing dataset info
+
+        Returns:
+            DatasetInfo: Merged dataset info
+        """
+
+        info = existing_info.model_copy(deep=True)
+
+        # Add new splits, categories, tables, and media sources
+        info.splits += [split for split in self.info.splits if split not in info.splits]
+        if self.info.categories:
+            category_ids = {category.id for category in info.categories or []}
+            info.categories = (info.categories or []) + [
+                category
+                for category in self.info.categories
+                if category.id not in category_ids
+            ]
+        for group_name, table_group in self.info.tables.items():
+            table_names = {table.name for table in info.tables.get(group_name, [])}
+            info.tables[group_name] = info.tables.get(group_name, []) + [
+                table for table in table_group if table.name not in table_names
+            ]
+        if self.info.media:
+            info.media = info.media or {}
+            for field_name, field_media in self.info.media.items():
+                info.media[field_name] = info.media.get(field_name, []) + [
+                    media
+                    for media in field_media
+                    if media not in info.media.get(field_name, [])
+                ]
+
+        return info
+
+    @staticmethod
+    def skip_imported_rows(
+        rows_iterator: Iterator,
+        imported: dict[str, dict[str, tuple[str, set]]],
+    ) -> Iterator:
+        """Skip rows already imported, and items with no rows left to import
+
+        Args:
+            rows_iterator (Iterator): Rows by table group and table name
+            imported (dict[str, dict[str, tuple[str, set]]]): Key column and imported keys by table group and table name
+
+        Yields:
+            Iterator: Rows left to import
+        """
+
+        for rows in rows_iterator:
+            remaining = False
+            for group_name, tables in rows.items():
+                for table_name, table_rows in tables.items():
+                    if table_name in imported.get(group_name, {}):
+                        key, keys = imported[group_name][table_name]
+                        tables[table_name] = [
+                            row for row in table_rows if row.get(key) not in keys
+                        ]
+                    remaining = remaining or len(tables[table_name]) > 0
+            if remaining:
+                yield rows
+
     def create_preview(
         self,
         import_dir: Path,
@@ -107,12 +229,14 @@ class Importer(ABC):
                     with tqdm(desc="Creating dataset thumbnail", total=1) as progress:
                         tile_w = 64
                         tile_h = 64
-                        preview = Image.new("RGB", (4 * tile_w, 2 * tile_h))
+                        preview = PILImage.new("RGB", (4 * tile_w, 2 * tile_h))
                         for i in range(8):
                             field = image_fields[i % len(image_fields)]
                             item_id = random.randrange(len(image_table))
                             item = image_table.to_lance().take([item_id]).to_pylist()[0]
-                            with Image.open(BytesIO(item[field].preview_bytes)) as im:
+                            with PILImage.open(
+                                BytesIO(item[field].preview_bytes)
+                            ) as im:
                                 preview.paste(
                                     im,
                                     ((i % 4) * tile_w, (int(i / 4) % 2) * tile_h),
@@ -124,79 +248,192 @@ class Importer(ABC):
     def import_rows(self) -> Iterator:
         """Process dataset rows for import
 
+        Media fields can be yielded as ImageTask, to be processed by Importer.import_dataset
+
+        Yields:
+            Iterator: Processed rows
+        """
+
+    @staticmethod
+    def _media_tasks(rows: dict) -> Iterator[tuple[dict, str, ImageTask]]:
+        """Find media tasks in rows
+
+        Args:
+            rows (dict): Rows by table group and table name
+
+        Yields:
+            Iterator[tuple[dict, str, ImageTask]]: Row, field name, and media task
+        """
+
+        for tables in rows.values():
+            for table_rows in tables.values():
+                for row in table_rows:
+                    for field_name, value in row.items():
+                        if isinstance(value, ImageTask):
+                            yield row, field_name, value
+
+    def process_media(self, rows_iterator: Iterator, num_workers: int = 1) -> Iterator:
+        """Process media tasks of dataset rows, in worker processes if more than one worker
+
+        Rows are yielded in import order. At most a few rows per worker are
+        pending at once, so memory does not grow with the dataset size.
+
+        Args:
+            rows_iterator (Iterator): Rows by table group and table name
+            num_workers (int, optional): Number of worker processes. Defaults to 1 to process media in the current process.
+
         Yields:
             Iterator: Processed rows
         """
 
+        if num_workers <= 1:
+            for rows in rows_iterator:
+                for row, field_name, task in self._media_tasks(rows):
+                    row[field_name] = task.process()
+                yield rows
+            return
+
+        max_pending = 4 * num_workers
+        pending: deque[tuple[dict, list[tuple[dict, str, Future]]]] = deque()
+
+        def complete(rows: dict, futures: list[tuple[dict, str, Future]]) -> dict:
+            for row, field_name, future in futures:
+                row[field_name] = future.result()
+            return rows
+
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            for rows in rows_iterator:
+                pending.append(
+                    (
+                        rows,
+                        [
+                            (row, field_name, executor.submit(task.process))
+                            for row, field_name, task in self._media_tasks(rows)
+                        ],
+                    )
+                )
+                # Wait for oldest rows when queue is full
+                while len(pending) >= max_pending:
+                    yield complete(*pending.popleft())
+            while pending:
+                yield complete(*pending.popleft())
+
     def import_dataset(
         self,
         import_dir: Path,
         copy: bool = True,
+        num_workers: int = 1,
+        mode: str = "overwrite",
+        link: Optional[str] = None,
     ) -> Dataset:
         """Import dataset to Pixano format
 
+        Rows are written to tables every 1024 rows, so tables always hold the
+        rows of whole items, which lets an interrupted import be resumed.
+
         Args:
             import_dir (Path): Import directory
             copy (bool, optional): True to copy files to the import directory, False to move them. Defaults to True.
+            num_workers (int, optional): Number of worker processes for media processing. Defaults to 1.
+            mode (str, optional): Import mode. Defaults to "overwrite".
+                                  - 'overwrite' to create new tables
+                                  - 'resume' to continue an interrupted import, skipping rows already written
+                                  - 'append' to add new splits or files to an existing dataset, skipping rows already imported
+            link (str, optional): Link media files instead of copying or moving them. Defaults to None.
+                                  - 'auto' to use reflinks, then hardlinks, whichever the filesystem supports first
+                                  - 'reflink', 'hardlink' or 'symlink' to use this link type
+                                  Media files are copied in parallel when links are not supported.
 
         Returns:
             Dataset: Imported dataset
         """
 
+        if mode not in ["overwrite", "resume", "append"]:
+            raise ValueError(
+                f"Invalid import mode '{mode}', please choose 'overwrite', 'resume' or 'append'"
+            )
+        if link is not None and link not in INGEST_METHODS:
+            raise ValueError(
+                f"Invalid link method '{link}', please choose from {INGEST_METHODS}"
+            )
+
+        # Load existing dataset info
+        existing_info = None
+        if mode != "overwrite" and (import_dir / "db.json").exists():
+            existing_info = DatasetInfo.from_json(import_dir / "db.json")
+        elif mode == "append":
+            raise FileNotFoundError(f"No dataset to append to in {import_dir}")
+
+        # Store image info in existing media tables, to append rows with current schema
+        if existing_info is not None:
+            Dataset(import_dir).backfill_image_info()
+
         # Connect to dataset
         import_dir.mkdir(parents=True, exist_ok=True)
         ds = lancedb.connect(import_dir)
 
         # Initialize dataset tables
         ds_tables: dict[str, dict[str, lancedb.db.LanceTable]] = defaultdict(dict)
-        ds_batches: dict[str, dict[str, list]] = defaultdict(dict)
+        ds_builders: dict[str, dict[str, TableBuilder]] = defaultdict(dict)
+        imported: dict[str, dict[str, tuple[str, set]]] = defaultdict(dict)
 
-        # Create tables
+        # Create tables, or open existing tables and load keys of imported rows
+        table_names = ds.table_names() if mode != "overwrite" else []
         for group_name, table_group in self.info.tables.items():
             for table in table_group:
-                ds_tables[group_name][table.name] = ds.create_table(
-                    table.name,
-                    schema=Fields(table.fields).to_schema(),
-                    mode="overwrite",
-                )
-                ds_batches[group_name][table.name] = []
+                schema = Fields(table.fields).to_schema()
+                if table.name in table_names:
+                    ds_tables[group_name][table.name] = ds.open_table(table.name)
+                    # Objects are checked by item, as their IDs can be random
+                    key = "item_id" if "item_id" in schema.names else "id"
+                    keys = (
+                        ds_tables[group_name][table.name]
+                        .to_lance()
+                        .to_table(columns=[key])[key]
+                        .to_pylist()
+                    )
+                    imported[group_name][table.name] = (key, set(keys))
+                else:
+                    ds_tables[group_name][table.name] = ds.create_table(
+                        table.name,
+                        schema=schema,
+                        mode="overwrite",
+                    )
+                ds_builders[group_name][table.name] = TableBuilder(schema)
         save_batch_size = 1024
 
+        # Skip rows already imported before processing their media
+        rows_iterator = self.import_rows()
+        if imported:
+            rows_iterator = self.skip_imported_rows(rows_iterator, imported)
+
         # Add rows to tables
-        for rows in tqdm(self.import_rows(), desc="Importing dataset"):
+        for rows in tqdm(
+            self.process_media(rows_iterator, num_workers), desc="Importing dataset"
+        ):
             for group_name, table_group in self.info.tables.items():
                 for table in table_group:
                     # Store rows in a batch
-                    ds_batches[group_name][table.name].extend(
-                        rows[group_name][table.name]
-                    )
+                    builder = ds_builders[group_name][table.name]
+                    builder.extend(rows[group_name][table.name])
                     # If batch reaches 1024 rows, store in table
-                    if len(ds_batches[group_name][table.name]) >= save_batch_size:
-                        pa_batch = pa.Table.from_pylist(
-                            ds_batches[group_name][table.name],
-                            schema=Fields(table.fields).to_schema(),
-                        )
+                    if len(builder) >= save_batch_size:
                         lance.write_dataset(
-                            pa_batch,
+                            builder.flush(),
                             uri=ds_tables[group_name][table.name].to_lance().uri,
                             mode="append",
                         )
-                        ds_batches[group_name][table.name] = []
 
         # Store final batches
         for group_name, table_group in self.info.tables.items():
             for table in table_group:
-                if len(ds_batches[group_name][table.name]) > 0:
-                    pa_batch = pa.Table.from_pylist(
-                        ds_batches[group_name][table.name],
-                        schema=Fields(table.fields).to_schema(),
-                    )
+                builder = ds_builders[group_name][table.name]
+                if len(builder) > 0:
                     lance.write_dataset(
-                        pa_batch,
+                        builder.flush(),
                         uri=ds_tables[group_name][table.name].to_lance().uri,
                         mode="append",
                     )
-                    ds_batches[group_name][table.name] = []
 
         # Optimize and clear creation history
         for tables in ds_tables.values():
@@ -215,38 +452,52 @@ class Importer(ABC):
                 "Generated dataset is empty. Please make sure that the paths to your media files are correct, and that they each contain subfolders for your splits."
             )
 
-        # Copy or move media directories
+        # Link, copy or move media directories, and record how in dataset info
         if "media" in ds_tables:
-            if copy:
-                for table in tqdm(
-                    ds_tables["media"].values(), desc="Copying media directories"
-                ):
-                    for field in table.schema:
-                        if field.name in self.input_dirs:
-                            field_dir = import_dir / "media" / field.name
-                            field_dir.mkdir(parents=True, exist_ok=True)
-                            if self.input_dirs[field.name] != field_dir:
-                                shutil.copytree(
-                                    self.input_dirs[field.name],
-                                    field_dir,
-                                    dirs_exist_ok=True,
-                                )
-            else:
-                for table in tqdm(
-                    ds_tables["media"].values(), desc="Moving media directories"
-                ):
-                    for field in table.schema:
-                        if field.name in self.input_dirs:
-                            field_dir = import_dir / "media" / field.name
-                            if self.input_dirs[field.name] != field_dir:
-                                self.input_dirs[field.name].rename(field_dir)
-
-        # Create DatasetInfo
-        self.info.num_elements = len(ds_tables["main"]["db"])
-        self.info.estimated_size = estimate_size(import_dir)
-        self.create_info(import_dir)
+            media: dict[str, list[DatasetMedia]] = {}
+            for table in ds_tables["media"].values():
+                for field in table.schema:
+                    if field.name in self.input_dirs:
+                        input_dir = self.input_dirs[field.name]
+                        field_dir = import_dir / "media" / field.name
+                        if input_dir == field_dir:
+                            continue
+                        if link is not None or copy:
+                            method = ingest_media(
+                                input_dir, field_dir, link if link else "copy"
+                            )
+                        elif field_dir.exists():
+                            # Merge into existing media directory
+                            shutil.copytree(input_dir, field_dir, dirs_exist_ok=True)
+                            shutil.rmtree(input_dir)
+                            method = "move"
+                        else:
+                            field_dir.parent.mkdir(parents=True, exist_ok=True)
+                            input_dir.rename(field_dir)
+                            method = "move"
+                        media[field.name] = [
+                            DatasetMedia(
+                                method=method,
+                                source=str(input_dir.absolute())
+                                if method in LINK_METHODS
+                                else None,
+                            )
+                        ]
+            self.info.media = media or None
+
+        # Create DatasetInfo, keeping existing dataset ID and tables
+        info = self.info
+        if existing_info is not None:
+            info = self.merge_info(existing_info)
+        info.num_elements = len(ds_tables["main"]["db"])
+        info.estimated_size = estimate_size(import_dir)
+        self.create_info(import_dir, info)
 
         # Create thumbnail
         self.create_preview(import_dir, ds_tables)
 
-        return Dataset(import_dir)
+        # Create item order table
+        dataset = Dataset(import_dir)
+        dataset.build_order()
+
+        return dataset
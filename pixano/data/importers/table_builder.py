@@ -0,0 +1,174 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+from collections.abc import Iterable
+from typing import Any
+
+import pyarrow as pa
+
+
+def has_extension_type(pa_type: pa.DataType) -> bool:
+    """Check if PyArrow type is or contains an ExtensionType
+
+    Args:
+        pa_type (pa.DataType): PyArrow type
+
+    Returns:
+        bool: True if type is or contains an ExtensionType
+    """
+
+    if isinstance(pa_type, pa.ExtensionType):
+        return True
+    if pa.types.is_struct(pa_type):
+        return any(has_extension_type(field.type) for field in pa_type)
+    if pa.types.is_list(pa_type) or pa.types.is_fixed_size_list(pa_type):
+        return has_extension_type(pa_type.value_type)
+    return False
+
+
+def build_array(values: list, pa_type: pa.DataType) -> pa.Array:
+    """Build PyArrow array from Python values, converting ExtensionTypes through their storage type
+
+    Args:
+        values (list): Python values, None for nulls
+        pa_type (pa.DataType): PyArrow type
+
+    Returns:
+        pa.Array: PyArrow array
+    """
+
+    # Types without ExtensionTypes are converted natively
+    if not has_extension_type(pa_type):
+        return pa.array(values, type=pa_type)
+
+    if isinstance(pa_type, pa.ExtensionType):
+        storage = build_array(values, pa_type.storage_type)
+        return pa.ExtensionArray.from_storage(pa_type, storage)
+
+    mask = pa.array([value is None for value in values], type=pa.bool_())
+
+    if pa.types.is_struct(pa_type):
+        return pa.StructArray.from_arrays(
+            [
+                build_array(
+                    [
+                        value.get(field.name) if value is not None else None
+                        for value in values
+                    ],
+                    field.type,
+                )
+                for field in pa_type
+            ],
+            fields=list(pa_type),
+            mask=mask,
+        )
+
+    # List types
+    offsets = [0]
+    flat_values = []
+    for value in values:
+        if value is not None:
+            flat_values.extend(value)
+        offsets.append(len(flat_values))
+    flat_array = build_array(flat_values, pa_type.value_type)
+    if pa.types.is_fixed_size_list(pa_type):
+        return pa.FixedSizeListArray.from_arrays(
+            flat_array, pa_type.list_size, mask=mask
+        )
+    return pa.ListArray.from_arrays(
+        pa.array(offsets, type=pa.int32()), flat_array, mask=mask
+    )
+
+
+class TableBuilder:
+    """PyArrow table builder, to which importers append rows
+
+    The schema is computed once. Columns are converted by PyArrow natively,
+    except columns with ExtensionTypes nested in other types, which PyArrow
+    cannot convert from Python and are built through their storage types.
+
+    Attributes:
+        schema (pa.Schema): Table schema
+    """
+
+    def __init__(self, schema: pa.Schema):
+        """Initialize TableBuilder
+
+        Args:
+            schema (pa.Schema): Table schema
+        """
+
+        self.schema = schema
+        self._rows: list[dict[str, Any]] = []
+
+        # Fields with ExtensionTypes nested in other types
+        self._nested_fields = [
+            field.name
+            for field in schema
+            if has_extension_type(
+                field.type.storage_type
+                if isinstance(field.type, pa.ExtensionType)
+                else field.type
+            )
+        ]
+        self._native_schema = pa.schema(
+            [field for field in schema if field.name not in self._nested_fields]
+        )
+
+    def __len__(self) -> int:
+        """Return number of rows not yet flushed
+
+        Returns:
+            int: Number of rows
+        """
+
+        return len(self._rows)
+
+    def append(self, row: dict[str, Any]):
+        """Append row, fields that are not in schema being ignored
+
+        Args:
+            row (dict[str, Any]): Row
+        """
+
+        self._rows.append(row)
+
+    def extend(self, rows: Iterable[dict[str, Any]]):
+        """Append rows, fields that are not in schema being ignored
+
+        Args:
+            rows (Iterable[dict[str, Any]]): Rows
+        """
+
+        self._rows.extend(rows)
+
+    def flush(self) -> pa.Table:
+        """Build table from appended rows, and clear them
+
+        Returns:
+            pa.Table: Table
+        """
+
+        native_table = pa.Table.from_pylist(self._rows, schema=self._native_schema)
+        table = pa.Table.from_arrays(
+            [
+                build_array([row.get(field.name) for row in self._rows], field.type)
+                if field.name in self._nested_fields
+                else native_table[field.name]
+                for field in self.schema
+            ],
+            schema=self.schema,
+        )
+
+        self._rows = []
+        return table
@@ -12,11 +12,13 @@
 # http://www.cecill.info
 
 import base64
+from typing import Any
 
 import pyarrow as pa
 from pydantic import BaseModel
 
 from pixano.core import is_binary
+from pixano.utils import convert_npy
 
 
 class ItemEmbedding(BaseModel):
@@ -42,16 +44,32 @@ class ItemEmbedding(BaseModel):
             dict[str, ItemEmbedding]: Dictionary of ItemEmbedding
         """
 
-        item = table.to_pylist()[0]
+        return ItemEmbedding.from_row(table.to_pylist()[0], schema)
+
+    @staticmethod
+    def from_row(item: dict[str, Any], schema: pa.schema) -> dict[str, "ItemEmbedding"]:
+        """Create dictionary of ItemEmbedding from PyArrow row as dictionary
+
+        Args:
+            item (dict[str, Any]): PyArrow row
+            schema (pa.schema): PyArrow schema
+
+        Returns:
+            dict[str, ItemEmbedding]: Dictionary of ItemEmbedding
+        """
+
         embeddings = {}
 
         # Iterate on fields
         for field in schema:
             # Image
             if is_binary(field.type):
+                # Embeddings stored as float16 are sent as float32
                 embeddings[field.name] = ItemEmbedding(
                     view_id=field.name,
-                    data=base64.b64encode(item[field.name]).decode("ascii"),
+                    data=base64.b64encode(
+                        convert_npy(item[field.name], "float32")
+                    ).decode("ascii"),
                 )
 
         return embeddings
@@ -11,7 +11,7 @@
 #
 # http://www.cecill.info
 
-from typing import Optional
+from typing import Any, Optional
 
 import pyarrow as pa
 from pydantic import BaseModel
@@ -47,7 +47,23 @@ class ItemFeature(BaseModel):
             dict[str, ItemFeature]: Dictionary of ItemFeature
         """
 
-        item = table.to_pylist()[0]
+        return ItemFeature.from_row(table.to_pylist()[0], schema)
+
+    @staticmethod
+    def from_row(
+        item: dict[str, Any],
+        schema: pa.schema,
+    ) -> dict[str, "ItemFeature"]:
+        """Create dictionary of ItemFeature from PyArrow row as dictionary
+
+        Args:
+            item (dict[str, Any]): PyArrow row
+            schema (pa.schema): PyArrow schema
+
+        Returns:
+            dict[str, ItemFeature]: Dictionary of ItemFeature
+        """
+
         features = {}
         ignored_fields = ["id", "item_id", "view_id", "source_id", "split"]
 
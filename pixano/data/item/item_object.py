@@ -152,11 +152,29 @@ class ItemObject(BaseModel):
             dict[str, ItemObject]: Dictionary of ItemObject
         """
 
-        items = table.to_pylist()
+        return ItemObject.from_rows(table.to_pylist(), schema, source_id)
+
+    @staticmethod
+    def from_rows(
+        items: list[dict[str, Any]],
+        schema: pa.schema,
+        source_id: str,
+    ) -> dict[str, "ItemObject"]:
+        """Create dictionary of ItemObject from PyArrow rows as dictionaries
+
+        Args:
+            items (list[dict[str, Any]]): PyArrow rows
+            schema (pa.schema): PyArrow schema
+            source_id (str): Objects source ID
+
+        Returns:
+            dict[str, ItemObject]: Dictionary of ItemObject
+        """
+
         objects = {}
 
         # Iterate on objects
-        for index, item in enumerate(items):
+        for item in items:
             # Create object
             object = ItemObject(
                 id=item["id"],
@@ -171,7 +189,7 @@ class ItemObject(BaseModel):
                 elif field.name == "mask" and item["mask"]:
                     object.mask = ItemURLE.from_pyarrow(item["mask"])
             # Add features
-            object.features = ItemFeature.from_pyarrow(table.take([index]), schema)
+            object.features = ItemFeature.from_row(item, schema)
             # Append object
             objects[item["id"]] = object
 
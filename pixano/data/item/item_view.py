@@ -12,7 +12,7 @@
 # http://www.cecill.info
 
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 from urllib.parse import urlparse
 
 import pyarrow as pa
@@ -56,14 +56,36 @@ class ItemView(BaseModel):
             table (dict[str, Any]): PyArrow table
             schema (pa.schema): PyArrow schema
             media_dir (Path): Dataset media directory
-            media_features (bool, optional): Load media features like image width and height (slow for large item batches)
+            media_features (bool, optional): Load media features like image width and height even when they are not stored in the dataset (slow for large item batches)
+
+        Returns:
+            dict[ItemView]: Dictionary of ItemView
+        """
+
+        return ItemView.from_row(
+            table.to_pylist()[0], schema, media_dir, media_features
+        )
+
+    @staticmethod
+    def from_row(
+        item: dict[str, Any],
+        schema: pa.schema,
+        media_dir: Path,
+        media_features: bool = False,
+    ) -> dict[str, "ItemView"]:
+        """Create dictionary of ItemView from PyArrow row as dictionary
+
+        Args:
+            item (dict[str, Any]): PyArrow row
+            schema (pa.schema): PyArrow schema
+            media_dir (Path): Dataset media directory
+            media_features (bool, optional): Load media features like image width and height even when they are not stored in the dataset (slow for large item batches)
 
         Returns:
             dict[ItemView]: Dictionary of ItemView
         """
 
         # TODO: Flattened view fields with one row per view?
-        item = table.to_pylist()[0]
         views = {}
 
         # Iterate on fields
@@ -85,7 +107,8 @@ class ItemView(BaseModel):
                     thumbnail=im.preview_url,
                 )
                 image_view.features = {}
-                if media_features:
+                # Stored image size is free, otherwise it is read from image header
+                if im.has_size or media_features:
                     image_view.features["width"] = ItemFeature(
                         name="width",
                         dtype="number",
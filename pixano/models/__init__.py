@@ -11,8 +11,10 @@
 #
 # http://www.cecill.info
 
+from pixano.models.encoder_registry import EncoderRegistry
 from pixano.models.inference_model import InferenceModel
 
 __all__ = [
+    "EncoderRegistry",
     "InferenceModel",
 ]
@@ -0,0 +1,175 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any, Optional
+
+
+def load_clip() -> Any:
+    """Load CLIP text encoder from pixano-inference
+
+    Returns:
+        Any: CLIP model
+    """
+
+    try:
+        from pixano_inference.transformers import CLIP
+    except ImportError as e:
+        raise ImportError(
+            "Please install the pixano-inference module to perform semantic search with CLIP"
+        ) from e
+
+    return CLIP()
+
+
+class EncoderRegistry:
+    """Process-wide registry of text encoders for semantic search
+
+    Encoders are loaded once on first use and shared across requests, and query
+    embeddings are kept in an LRU cache so repeated and paginated searches skip encoding.
+    Models without a registered encoder use the fallback encoder, if any.
+
+    Attributes:
+        cache_size (int): Maximum number of cached query embeddings
+        fallback (Callable[[], Any], optional): Function loading the encoder of unregistered models
+    """
+
+    def __init__(
+        self,
+        cache_size: int = 1024,
+        fallback: Optional[Callable[[], Any]] = None,
+    ):
+        """Initialize EncoderRegistry
+
+        Args:
+            cache_size (int, optional): Maximum number of cached query embeddings. Defaults to 1024.
+            fallback (Callable[[], Any], optional): Function loading the encoder of unregistered models. Defaults to None to reject unregistered models.
+        """
+
+        self.cache_size = cache_size
+        self.fallback = fallback
+
+        # Lock on registry state, never held while an encoder loads
+        self._lock = threading.Lock()
+        # Encoder name to encoder loading function
+        self._loaders: dict[str, Callable[[], Any]] = {}
+        # Encoder name, or None for fallback encoder, to loaded encoder
+        self._encoders: dict[Optional[str], Any] = {}
+        # Encoder name, or None for fallback encoder, to lock held while it loads
+        self._load_locks: dict[Optional[str], threading.Lock] = {}
+        # Encoder name and query text to query embedding, least recently used first
+        self._embeddings: OrderedDict[tuple[str, str], Any] = OrderedDict()
+
+    @staticmethod
+    @lru_cache
+    def default() -> "EncoderRegistry":
+        """Return the registry shared by the whole process, with default encoders registered
+
+        Returns:
+            EncoderRegistry: Encoder registry
+        """
+
+        # Unregistered models keep using CLIP, as semantic search did before the registry
+        registry = EncoderRegistry(fallback=load_clip)
+        registry.register("CLIP", load_clip)
+        return registry
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """Register text encoder
+
+        Args:
+            name (str): Encoder name, matching the source of its embeddings tables
+            loader (Callable[[], Any]): Function loading the encoder, which must provide a semantic_search(text) method
+        """
+
+        with self._lock:
+            self._loaders[name] = loader
+            self._encoders.pop(name, None)
+            for key in [key for key in self._embeddings if key[0] == name]:
+                del self._embeddings[key]
+
+    def get_encoder(self, name: str) -> Any:
+        """Return text encoder, loading it on first use
+
+        Only requests for the same encoder wait while it loads.
+
+        Args:
+            name (str): Encoder name
+
+        Returns:
+            Any: Text encoder
+        """
+
+        with self._lock:
+            if name in self._loaders:
+                key, loader = name, self._loaders[name]
+            elif self.fallback is not None:
+                key, loader = None, self.fallback
+            else:
+                raise ValueError(f"No text encoder registered for model '{name}'")
+            if key in self._encoders:
+                return self._encoders[key]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            # Encoder may have been loaded while waiting
+            with self._lock:
+                if key in self._encoders:
+                    return self._encoders[key]
+            encoder = loader()
+            with self._lock:
+                self._encoders[key] = encoder
+            return encoder
+
+    def encode(self, name: str, text: str) -> Any:
+        """Return query embedding, from cache if query was already encoded
+
+        Args:
+            name (str): Encoder name
+            text (str): Query text
+
+        Returns:
+            Any: Query embedding
+        """
+
+        key = (name, text)
+        with self._lock:
+            if key in self._embeddings:
+                self._embeddings.move_to_end(key)
+                return self._embeddings[key]
+
+        embedding = self.get_encoder(name).semantic_search(text)
+
+        with self._lock:
+            self._embeddings[key] = embedding
+            self._embeddings.move_to_end(key)
+            while len(self._embeddings) > self.cache_size:
+                self._embeddings.popitem(last=False)
+
+        return embedding
+
+    def warm(self, names: Optional[list[str]] = None):
+        """Load encoders ahead of first search, skipping encoders whose dependencies are not installed
+
+        Args:
+            names (list[str], optional): Names of encoders to load, all registered encoders if None. Defaults to None.
+        """
+
+        for name in names if names is not None else list(self._loaders):
+            try:
+                self.get_encoder(name)
+            except ImportError:
+                continue
@@ -20,9 +20,16 @@ import duckdb
 import lance
 import lancedb
 import pyarrow as pa
+import pyarrow.compute as pc
 from tqdm.auto import tqdm
 
-from pixano.data import Dataset, DatasetTable, Fields
+from pixano.data import Dataset, DatasetFilter, DatasetTable, Fields
+from pixano.data.fields import parse_vector_type
+from pixano.utils import convert_npy, quantize_vectors
+
+# int8 vectors have no ANN index and are searched exhaustively,
+# so they are only faster to search than float vectors in small tables
+INT8_MAX_ROWS = 50000
 
 
 class InferenceModel(ABC):
@@ -95,6 +102,126 @@ class InferenceModel(ABC):
             list[dict]: Embedding rows
         """
 
+    @staticmethod
+    def _quantize_embeddings(
+        rows: list[dict],
+        table: DatasetTable,
+        vector_type: str,
+    ) -> list[dict]:
+        """Convert embedding rows to storage type
+
+        int8 vectors need a scale computed over all vectors, see _quantize_table.
+
+        Args:
+            rows (list[dict]): Embedding rows
+            table (DatasetTable): Embeddings table
+            vector_type (str): Storage type, "float32" or "float16"
+
+        Returns:
+            list[dict]: Embedding rows
+        """
+
+        if vector_type == "float32":
+            return rows
+
+        for field_name, field_type in table.fields.items():
+            # Segmentation embeddings, stored as NumPy array files
+            if field_type == "bytes":
+                for row in rows:
+                    if row.get(field_name) is not None:
+                        row[field_name] = convert_npy(row[field_name], vector_type)
+            # Semantic search embeddings
+            elif parse_vector_type(field_type) is not None:
+                vector_rows = [row for row in rows if row.get(field_name) is not None]
+                if not vector_rows:
+                    continue
+                vectors, _ = quantize_vectors(
+                    [row[field_name] for row in vector_rows], vector_type
+                )
+                for row, vector in zip(vector_rows, vectors):
+                    row[field_name] = vector.tolist()
+
+        return rows
+
+    @staticmethod
+    def _quantize_table(
+        lance_table: lance.LanceDataset,
+        table: DatasetTable,
+    ) -> lance.LanceDataset:
+        """Quantize float32 vectors of a written embeddings table to int8, recording quantization scales in table
+
+        A first pass reads the largest absolute value of each vector column, so
+        no value is clipped, and a second pass rewrites the table batch by batch.
+
+        Args:
+            lance_table (lance.LanceDataset): Embeddings table, with float32 vectors
+            table (DatasetTable): Embeddings table info, with int8 vector fields
+
+        Returns:
+            lance.LanceDataset: Embeddings table, with int8 vectors
+        """
+
+        vector_fields = [
+            field_name
+            for field_name, field_type in table.fields.items()
+            if parse_vector_type(field_type) is not None
+        ]
+
+        # Compute scales over all vectors
+        max_abs = dict.fromkeys(vector_fields, 0.0)
+        for batch in lance_table.to_batches(columns=vector_fields):
+            for field_name in vector_fields:
+                values = batch[field_name].flatten()
+                if len(values) > 0:
+                    max_abs[field_name] = max(
+                        max_abs[field_name], pc.max(pc.abs(values)).as_py()
+                    )
+        table.scales = {
+            field_name: value / 127 if value > 0 else 1.0
+            for field_name, value in max_abs.items()
+        }
+
+        # Quantize vectors
+        schema = Fields(table.fields).to_schema()
+
+        def quantize_batches():
+            for batch in lance_table.to_batches():
+                columns = []
+                for field in schema:
+                    column = batch[field.name]
+                    if field.name in vector_fields:
+                        vectors, _ = quantize_vectors(
+                            column.flatten()
+                            .to_numpy()
+                            .reshape(-1, field.type.list_size),
+                            "int8",
+                            table.scales[field.name],
+                        )
+                        if column.null_count > 0:
+                            rows = iter(vectors.tolist())
+                            column = pa.array(
+                                [
+                                    next(rows) if valid else None
+                                    for valid in column.is_valid().to_pylist()
+                                ],
+                                type=field.type,
+                            )
+                        else:
+                            column = pa.FixedSizeListArray.from_arrays(
+                                pa.array(vectors.flatten(), type=pa.int8()),
+                                field.type.list_size,
+                            )
+                    columns.append(column)
+                yield pa.RecordBatch.from_arrays(columns, schema=schema)
+
+        # Readers keep the float32 version until the table is overwritten
+        return lance.write_dataset(
+            pa.RecordBatchReader.from_batches(schema, quantize_batches()),
+            uri=lance_table.uri,
+            schema=schema,
+            mode="overwrite",
+        )
+
     def process_dataset(
         self,
         dataset_dir: Path,
@@ -103,6 +230,8 @@ class InferenceModel(ABC):
         splits: list[str] = None,
         batch_size: int = 1,
         threshold: float = 0.0,
+        skip_duplicates: bool = False,
+        vector_type: str = "float32",
     ) -> Dataset:
         """Process dataset for preannotation or embedding precomputing
 
@@ -116,6 +245,8 @@ class InferenceModel(ABC):
             splits (list[str], optional): Dataset splits, all if None. Defaults to None.
             batch_size (int, optional): Rows per batch. Defaults to 1.
             threshold (float, optional): Confidence threshold for predictions. Defaults to 0.0.
+            skip_duplicates (bool, optional): Skip items marked as duplicates by pixano.analytics.find_duplicates. Defaults to False.
+            vector_type (str, optional): Embeddings storage type, "float32", "float16", or "int8" for semantic search embeddings of at most INT8_MAX_ROWS items. Defaults to "float32".
 
         Returns:
             Dataset: Dataset
@@ -128,6 +259,12 @@ class InferenceModel(ABC):
                 "Please choose a valid process type ('obj' for preannotation, 'segment_emb' or 'search_emb'"
                 "for segmentation or semantic search embedding precomputing)"
             )
+        if vector_type not in ["float32", "float16", "int8"] or (
+            vector_type == "int8" and process_type != "search_emb"
+        ):
+            raise ValueError(
+                f"Invalid embeddings storage type '{vector_type}' for process type '{process_type}'"
+            )
 
         output_filename = (
             f"emb_{self.id}" if "emb" in process_type else f"obj_{self.id}"
@@ -136,10 +273,29 @@ class InferenceModel(ABC):
         # Load dataset
         dataset = Dataset(dataset_dir)
         ds = dataset.connect()
+        if vector_type == "int8" and dataset.num_rows > INT8_MAX_ROWS:
+            raise ValueError(
+                f"int8 embeddings are searched exhaustively, please use float16 embeddings "
+                f"for datasets over {INT8_MAX_ROWS} items"
+            )
 
         # Load dataset tables
         ds_tables = dataset.open_tables()
 
+        # Load duplicate items to skip
+        if skip_duplicates:
+            try:
+                duplicate_ids = pa.array(
+                    dataset.filter_item_ids(
+                        [DatasetFilter(field="is_duplicate", value=True)]
+                    ),
+                    type=pa.string(),
+                )
+            except ValueError as e:
+                raise ValueError(
+                    "Please run pixano.analytics.find_duplicates before skipping duplicates"
+                ) from e
+
         # Create URI prefix
         uri_prefix = dataset.media_dir.absolute().as_uri()
 
@@ -171,7 +327,11 @@ class InferenceModel(ABC):
             table_fields = {"id": "str"}
             # Add vector column for each selected view
             for view in views:
-                table_fields[view] = "vector(512)"
+                table_fields[view] = (
+                    "vector(512)"
+                    if vector_type == "float32"
+                    else f"vector(512, {vector_type})"
+                )
 
         # Add new table to DatasetInfo
         table = DatasetTable(
@@ -187,21 +347,31 @@ class InferenceModel(ABC):
             dataset.info.tables[table_group] = [table]
         dataset.save_info()
 
-        # Create new Lance table
+        # Create new Lance table, with float32 vectors until int8 scales are known
+        write_type = "float32" if vector_type == "int8" else vector_type
+        write_schema = Fields(
+            {
+                field_name: "vector(512)"
+                if vector_type == "int8" and parse_vector_type(field_type) is not None
+                else field_type
+                for field_name, field_type in table_fields.items()
+            }
+        ).to_schema()
         ds_table: lancedb.db.LanceTable = ds.create_table(
             output_filename,
-            schema=Fields(table_fields).to_schema(),
+            schema=write_schema,
             mode="overwrite",
         )
         output_batch = []
         save_batch_size = 1024
 
         # Add rows to tables
-        with tqdm(desc="Processing dataset", total=dataset.num_rows) as progress:
-            for i in range(ceil(dataset.num_rows / save_batch_size)):
+        num_rows = dataset.num_rows
+        with tqdm(desc="Processing dataset", total=num_rows) as progress:
+            for i in range(ceil(num_rows / save_batch_size)):
                 # Load rows
                 offset = i * save_batch_size
-                limit = min(dataset.num_rows, offset + save_batch_size)
+                limit = min(num_rows, offset + save_batch_size)
                 pyarrow_table = ds_tables["main"]["db"].to_lance()
                 pyarrow_table = duckdb.query(
                     f"SELECT * FROM pyarrow_table ORDER BY len(id), id LIMIT {limit} OFFSET {offset}"
@@ -221,6 +391,13 @@ class InferenceModel(ABC):
                     pyarrow_table = duckdb.query(
                         f"SELECT * FROM pyarrow_table WHERE split in ({split_ids})"
                     ).to_arrow_table()
+                # Filter duplicates
+                if skip_duplicates:
+                    pyarrow_table = pyarrow_table.filter(
+                        pc.invert(
+                            pc.is_in(pyarrow_table["id"], value_set=duplicate_ids)
+                        )
+                    )
                 # Convert to RecordBatch
                 input_batches = pyarrow_table.to_batches(max_chunksize=batch_size)
 
@@ -238,8 +415,8 @@ class InferenceModel(ABC):
                 # If batch reaches 1024 rows, store in table
                 if len(output_batch) >= save_batch_size:
                     pa_batch = pa.Table.from_pylist(
-                        output_batch,
-                        schema=Fields(table.fields).to_schema(),
+                        self._quantize_embeddings(output_batch, table, write_type),
+                        schema=write_schema,
                     )
                     lance.write_dataset(
                         pa_batch,
@@ -251,8 +428,8 @@ class InferenceModel(ABC):
         # Store final batch
         if len(output_batch) > 0:
             pa_batch = pa.Table.from_pylist(
-                output_batch,
-                schema=Fields(table.fields).to_schema(),
+                self._quantize_embeddings(output_batch, table, write_type),
+                schema=write_schema,
             )
             lance.write_dataset(
                 pa_batch,
@@ -261,10 +438,18 @@ class InferenceModel(ABC):
             )
             output_batch = []
 
+        # Quantize int8 vectors and save their scales
+        if vector_type == "int8":
+            self._quantize_table(ds_table.to_lance(), table)
+            dataset.save_info()
+
         # Optimize and clear creation history
         ds_table.to_lance().optimize.compact_files()
         ds_table.to_lance().cleanup_old_versions(older_than=timedelta(0))
 
+        # Create vector indexes
+        dataset.create_vector_indexes([output_filename])
+
         return dataset
 
     def export_to_onnx(self, library_dir: Path):
@@ -19,15 +19,19 @@ from pixano.utils.boxes import (
     xywh_to_xyxy,
     xyxy_to_xywh,
 )
+from pixano.utils.files import INGEST_METHODS, LINK_METHODS, ingest_media
 from pixano.utils.image import (
     binary_to_url,
     depth_array_to_gray,
     depth_file_to_binary,
     encode_rle,
+    encode_rle_batch,
     image_to_binary,
+    image_header,
     image_to_thumbnail,
     mask_to_polygons,
     mask_to_rle,
+    max_image_pixels,
     polygons_to_rle,
     rle_to_mask,
     rle_to_polygons,
@@ -41,7 +45,9 @@ from pixano.utils.labels import (
     dota_ids,
     voc_names,
 )
-from pixano.utils.python import estimate_size, natural_key
+from pixano.utils.json_stream import iter_json_object
+from pixano.utils.python import TTLCache, estimate_size, file_version, natural_key
+from pixano.utils.vectors import convert_npy, dequantize_vectors, quantize_vectors
 
 __all__ = [
     "normalize_coords",
@@ -50,12 +56,18 @@ __all__ = [
     "urle_to_bbox",
     "xywh_to_xyxy",
     "xyxy_to_xywh",
+    "INGEST_METHODS",
+    "LINK_METHODS",
+    "ingest_media",
     "image_to_binary",
+    "image_header",
     "image_to_thumbnail",
+    "max_image_pixels",
     "binary_to_url",
     "depth_array_to_gray",
     "depth_file_to_binary",
     "encode_rle",
+    "encode_rle_batch",
     "mask_to_rle",
     "rle_to_mask",
     "polygons_to_rle",
@@ -68,6 +80,12 @@ __all__ = [
     "coco_names_91",
     "dota_ids",
     "voc_names",
+    "iter_json_object",
     "estimate_size",
+    "file_version",
     "natural_key",
+    "TTLCache",
+    "quantize_vectors",
+    "dequantize_vectors",
+    "convert_npy",
 ]
@@ -0,0 +1,157 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+
+import errno
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from tqdm.auto import tqdm
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Linux FICLONE ioctl request, to share file extents on copy-on-write filesystems
+FICLONE = 0x40049409
+
+LINK_METHODS = ["reflink", "hardlink", "symlink"]
+INGEST_METHODS = ["auto", "copy"] + LINK_METHODS
+
+
+def reflink(src: Path, dst: Path):
+    """Create a copy-on-write clone of a file, on filesystems which support it (Btrfs, XFS, ...)
+
+    Args:
+        src (Path): Source file
+        dst (Path): Destination file
+
+    Raises:
+        OSError: Reflinks not supported
+    """
+
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported on this system")
+
+    try:
+        with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+    except OSError:
+        dst.unlink(missing_ok=True)
+        raise
+
+
+def ingest_file(src: Path, dst: Path, method: str):
+    """Copy or link a file, replacing existing destination file
+
+    Args:
+        src (Path): Source file
+        dst (Path): Destination file
+        method (str): "copy", "reflink", "hardlink" or "symlink"
+
+    Raises:
+        OSError: Method not supported for these files
+    """
+
+    if dst.is_symlink() or dst.exists():
+        dst.unlink()
+
+    if method == "reflink":
+        reflink(src, dst)
+    elif method == "hardlink":
+        os.link(src, dst)
+    elif method == "symlink":
+        dst.symlink_to(src.absolute())
+    else:
+        shutil.copy2(src, dst)
+
+
+def ingest_media(
+    src_dir: Path,
+    dst_dir: Path,
+    method: str = "auto",
+    num_workers: int = 8,
+) -> str:
+    """Copy or link media files from a source directory to a destination directory
+
+    The method is chosen on the first file. Files that cannot be linked with it,
+    for instance on another filesystem, are copied instead.
+
+    Args:
+        src_dir (Path): Source directory
+        dst_dir (Path): Destination directory
+        method (str, optional): Ingestion method. Defaults to "auto".
+                                - 'auto' to use reflinks, then hardlinks, then copies, whichever the filesystem supports first
+                                - 'reflink', 'hardlink' or 'symlink' to use this link type, or copies if not supported
+                                - 'copy' to copy files
+        num_workers (int, optional): Number of threads for copies and links. Defaults to 8.
+
+    Returns:
+        str: Method used
+    """
+
+    if method not in INGEST_METHODS:
+        raise ValueError(
+            f"Invalid media ingestion method '{method}', please choose from {INGEST_METHODS}"
+        )
+
+    # Create directory tree
+    files = sorted(path for path in src_dir.rglob("*") if path.is_file())
+    dst_dir.mkdir(parents=True, exist_ok=True)
+    for parent in {file.parent.relative_to(src_dir) for file in files}:
+        (dst_dir / parent).mkdir(parents=True, exist_ok=True)
+
+    def ingest(file: Path):
+        dst = dst_dir / file.relative_to(src_dir)
+        # Skip files already linked or copied, for resumed imports
+        if dst.exists():
+            src_stat, dst_stat = file.stat(), dst.stat()
+            if os.path.samestat(src_stat, dst_stat) or (
+                method == "copy"
+                and not dst.is_symlink()
+                and src_stat.st_size == dst_stat.st_size
+                and src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+            ):
+                return
+        try:
+            ingest_file(file, dst, method)
+        except OSError:
+            if method == "copy":
+                raise
+            ingest_file(file, dst, "copy")
+
+    with tqdm(desc=f"Ingesting {src_dir.name} media", total=len(files)) as progress:
+        # Find the first supported method on the first file
+        if files and method != "copy":
+            candidates = ["reflink", "hardlink"] if method == "auto" else [method]
+            first_dst = dst_dir / files[0].relative_to(src_dir)
+            for candidate in candidates + ["copy"]:
+                try:
+                    ingest_file(files[0], first_dst, candidate)
+                    method = candidate
+                    break
+                except OSError:
+                    if candidate == "copy":
+                        raise
+            progress.update(1)
+            files = files[1:]
+
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            for _ in executor.map(ingest, files):
+                progress.update(1)
+
+    # No file to ingest
+    return method if method != "auto" else "copy"
@@ -12,8 +12,12 @@
 # http://www.cecill.info
 
 import base64
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
 from io import BytesIO
 from itertools import groupby
+from typing import IO, Optional
 
 import cv2
 import numpy as np
@@ -42,6 +46,50 @@ def image_to_binary(image: Image.Image, format: str = "PNG") -> bytes:
     return im_bytes
 
 
+@contextmanager
+def max_image_pixels(limit: Optional[int]) -> Iterator[None]:
+    """Raise Pillow decompression bomb limit while opening large images, restoring it afterwards
+
+    Args:
+        limit (int, optional): Maximum number of image pixels, None to keep the current limit
+
+    Yields:
+        Iterator[None]: Context with raised limit
+    """
+
+    previous = Image.MAX_IMAGE_PIXELS
+    if limit is not None and (previous is None or limit > previous):
+        Image.MAX_IMAGE_PIXELS = limit
+    try:
+        yield
+    finally:
+        Image.MAX_IMAGE_PIXELS = previous
+
+
+def image_header(image: bytes | IO) -> tuple[int, int, str]:
+    """Read image width, height and format from image header, without decoding pixels
+
+    Args:
+        image (bytes | IO): Image as binary or as file object
+
+    Returns:
+        tuple[int, int, str]: Image width, height and format
+    """
+
+    if isinstance(image, bytes):
+        image = BytesIO(image)
+
+    # Pixels are not decoded, so large images are not a decompression bomb:
+    # disable the limit, which raises an error above twice its value
+    previous = Image.MAX_IMAGE_PIXELS
+    Image.MAX_IMAGE_PIXELS = None
+    try:
+        with Image.open(image) as im:
+            return im.width, im.height, im.format
+    finally:
+        Image.MAX_IMAGE_PIXELS = previous
+
+
 def image_to_thumbnail(image: bytes | Image.Image) -> bytes:
     """Generate image thumbnail
 
@@ -153,6 +201,64 @@ def encode_rle(mask: list[list] | dict, height: int, width: int) -> dict:
     return rle
 
 
+def encode_rle_batch(
+    masks: list[list[list] | dict],
+    heights: int | list[int],
+    widths: int | list[int],
+) -> list[dict]:
+    """Encode masks from polygons / uncompressed RLE / RLE to RLE, with one
+    encoding call for all polygons and one for all uncompressed RLEs of a given image size
+
+    Args:
+        masks (list[list[list] | dict]): Masks as polygons / uncompressed RLE / RLE, or None
+        heights (int | list[int]): Image height, or image height of each mask
+        widths (int | list[int]): Image width, or image width of each mask
+
+    Returns:
+        list[dict]: Masks as RLE, None for masks that are None
+    """
+
+    if isinstance(heights, int):
+        heights = [heights] * len(masks)
+    if isinstance(widths, int):
+        widths = [widths] * len(masks)
+
+    rles = [None] * len(masks)
+
+    # Group polygons and uncompressed RLEs to encode by type and image size
+    groups: dict[tuple[str, int, int], tuple[list, list[int]]] = defaultdict(
+        lambda: ([], [])
+    )
+    for i, (mask, height, width) in enumerate(zip(masks, heights, widths)):
+        if isinstance(mask, list):
+            # Polygons with 4 coordinates would be encoded as boxes in a batch
+            if mask and all(len(polygon) > 4 for polygon in mask):
+                objs, owners = groups[("polygons", height, width)]
+                objs.extend(mask)
+                owners.extend([i] * len(mask))
+            else:
+                rles[i] = encode_rle(mask, height, width)
+        elif isinstance(mask, dict):
+            if isinstance(mask["counts"], list):
+                objs, owners = groups[("urle", *mask["size"])]
+                objs.append(mask)
+                owners.append(i)
+            else:
+                rles[i] = mask
+
+    # Encode groups, merging polygons of each mask
+    for (_, height, width), (objs, owners) in groups.items():
+        mask_rles = defaultdict(list)
+        for owner, rle in zip(owners, mask_api.frPyObjects(objs, height, width)):
+            mask_rles[owner].append(rle)
+        for owner, owner_rles in mask_rles.items():
+            rles[owner] = (
+                owner_rles[0] if len(owner_rles) == 1 else mask_api.merge(owner_rles)
+            )
+
+    return rles
+
+
 def mask_to_rle(mask: Image.Image) -> dict:
     """Encode mask from Pillow or NumPy array to RLE
 
@@ -0,0 +1,149 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+import json
+from collections.abc import Iterator
+from typing import Any, TextIO
+
+_decoder = json.JSONDecoder()
+_whitespace = " \t\n\r"
+
+
+class _JSONBuffer:
+    """Text buffer over a JSON file, read chunk by chunk
+
+    Attributes:
+        file (TextIO): JSON file
+        chunk_size (int): Number of characters read at once
+        text (str): Buffered text
+        pos (int): Current position in buffered text
+        eof (bool): True if file has been read entirely
+    """
+
+    def __init__(self, file: TextIO, chunk_size: int):
+        """Initialize _JSONBuffer
+
+        Args:
+            file (TextIO): JSON file
+            chunk_size (int): Number of characters read at once
+        """
+
+        self.file = file
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def read_more(self) -> bool:
+        """Read next chunk, dropping text before current position
+
+        Returns:
+            bool: False if file has been read entirely
+        """
+
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        self.text = self.text[self.pos :] + chunk
+        self.pos = 0
+        self.eof = chunk == ""
+        return not self.eof
+
+    def peek(self) -> str:
+        """Return next character that is not whitespace, without consuming it
+
+        Returns:
+            str: Next character, "" at end of file
+        """
+
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _whitespace:
+                self.pos += 1
+            if self.pos < len(self.text) or not self.read_more():
+                return self.text[self.pos : self.pos + 1]
+
+    def expect(self, char: str):
+        """Consume next character that is not whitespace, checking its value
+
+        Args:
+            char (str): Expected character
+        """
+
+        if self.peek() != char:
+            raise ValueError(
+                f"Invalid JSON: expected '{char}' but found '{self.peek()}'"
+            )
+        self.pos += 1
+
+    def decode(self) -> Any:
+        """Decode next JSON value, reading more chunks until it is complete
+
+        Returns:
+            Any: Decoded value
+        """
+
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+                # Value may continue in next chunk, for instance a number
+                if end < len(self.text) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.read_more()
+
+
+def iter_json_object(
+    file: TextIO,
+    chunk_size: int = 1 << 20,
+) -> Iterator[tuple[str, Any]]:
+    """Iterate over a JSON object file in a single streaming pass
+
+    Top-level array values are yielded element by element, so memory only
+    depends on the size of the largest element.
+
+    Args:
+        file (TextIO): JSON file, opened in text mode
+        chunk_size (int, optional): Number of characters read at once. Defaults to 1 MiB.
+
+    Yields:
+        Iterator[tuple[str, Any]]: Top-level key, and value or array element
+    """
+
+    buffer = _JSONBuffer(file, chunk_size)
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        return
+
+    while True:
+        key = buffer.decode()
+        buffer.expect(":")
+        if buffer.peek() == "[":
+            buffer.expect("[")
+            if buffer.peek() != "]":
+                while True:
+                    yield key, buffer.decode()
+                    if buffer.peek() != ",":
+                        break
+                    buffer.expect(",")
+            buffer.expect("]")
+        else:
+            yield key, buffer.decode()
+        if buffer.peek() != ",":
+            break
+        buffer.expect(",")
+
+    buffer.expect("}")
@@ -13,7 +13,12 @@
 
 import os
 import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
 from pathlib import Path
+from typing import Any, Optional
 
 
 def natural_key(string: str) -> list:
@@ -58,3 +63,104 @@ def estimate_size(folder_path: Path) -> str:
     readable_size = "%s %s" % (f, suffixes[i])
 
     return readable_size
+
+
+def file_version(file_path: Path) -> Optional[tuple[int, int]]:
+    """Return file version from its modification time and size
+
+    Args:
+        file_path (Path): File path
+
+    Returns:
+        tuple[int, int]: File modification time in nanoseconds and file size, None if file does not exist
+    """
+
+    try:
+        stat = file_path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class TTLCache:
+    """Thread-safe cache bounded in size and entry lifetime
+
+    Entries expire ttl seconds after being set, and the least recently used
+    entries are evicted first when the cache is full.
+
+    Attributes:
+        maxsize (int): Maximum number of entries
+        ttl (float): Entry lifetime in seconds
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 600.0):
+        """Initialize TTLCache
+
+        Args:
+            maxsize (int, optional): Maximum number of entries. Defaults to 128.
+            ttl (float, optional): Entry lifetime in seconds. Defaults to 600.0.
+        """
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        # Key to expiration time and value, least recently used first
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return cached value, or default if key is missing or expired
+
+        Args:
+            key (Hashable): Key
+            default (Any, optional): Default value. Defaults to None.
+
+        Returns:
+            Any: Cached value
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        """Cache value
+
+        Args:
+            key (Hashable): Key
+            value (Any): Value
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+
+            # Evict expired entries, then least recently used ones
+            for expired_key in [
+                k for k, (exp, _) in self._entries.items() if exp < now
+            ]:
+                del self._entries[expired_key]
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries"""
+
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Return number of entries, including expired ones not evicted yet
+
+        Returns:
+            int: Number of entries
+        """
+
+        return len(self._entries)
@@ -0,0 +1,106 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+import io
+from typing import Optional
+
+import numpy as np
+
+VECTOR_DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+
+
+def quantize_vectors(
+    vectors: np.ndarray,
+    dtype: str,
+    scale: Optional[float] = None,
+) -> tuple[np.ndarray, Optional[float]]:
+    """Quantize float vectors for compact storage
+
+    float16 vectors are cast. int8 vectors are scaled symmetrically, so that the
+    largest absolute value maps to 127 if no scale is given, and values beyond
+    the scale range are clipped.
+
+    Args:
+        vectors (np.ndarray): Float vectors
+        dtype (str): Storage type, "float32", "float16" or "int8"
+        scale (float, optional): int8 quantization scale. Defaults to None to compute it from vectors.
+
+    Returns:
+        tuple[np.ndarray, Optional[float]]: Quantized vectors, and int8 quantization scale (None for float types)
+    """
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+
+    if dtype == "float32":
+        return vectors, None
+    if dtype == "float16":
+        return vectors.astype(np.float16), None
+    if dtype == "int8":
+        if scale is None:
+            max_abs = float(np.abs(vectors).max()) if vectors.size > 0 else 0.0
+            scale = max_abs / 127 if max_abs > 0 else 1.0
+        return np.clip(np.rint(vectors / scale), -127, 127).astype(np.int8), scale
+
+    raise ValueError(f"Unsupported vector type '{dtype}'")
+
+
+def dequantize_vectors(
+    vectors: np.ndarray,
+    scale: Optional[float] = None,
+) -> np.ndarray:
+    """Convert quantized vectors back to float32
+
+    Args:
+        vectors (np.ndarray): Quantized vectors
+        scale (float, optional): int8 quantization scale. Defaults to None.
+
+    Returns:
+        np.ndarray: Float vectors
+    """
+
+    vectors = np.asarray(vectors)
+
+    if vectors.dtype == np.int8:
+        return vectors.astype(np.float32) * np.float32(scale if scale else 1.0)
+    return vectors.astype(np.float32)
+
+
+def convert_npy(data: bytes, dtype: str) -> bytes:
+    """Convert NumPy array file bytes to another data type, only reading the header if it already has it
+
+    Args:
+        data (bytes): NumPy array file bytes
+        dtype (str): Data type, "float32" or "float16"
+
+    Returns:
+        bytes: NumPy array file bytes, unchanged if not a NumPy array file
+    """
+
+    buffer = io.BytesIO(data)
+    try:
+        version = np.lib.format.read_magic(buffer)
+        if version == (1, 0):
+            _, _, array_dtype = np.lib.format.read_array_header_1_0(buffer)
+        else:
+            _, _, array_dtype = np.lib.format.read_array_header_2_0(buffer)
+    except ValueError:
+        return data
+
+    if array_dtype == VECTOR_DTYPES[dtype]:
+        return data
+
+    buffer.seek(0)
+    array = np.load(buffer).astype(VECTOR_DTYPES[dtype])
+    output = io.BytesIO()
+    np.save(output, array)
+    return output.getvalue()
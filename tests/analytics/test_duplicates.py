@@ -0,0 +1,129 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import lance
+import numpy as np
+import pyarrow as pa
+
+from pixano.analytics import duplicates, find_duplicates
+from pixano.data import COCOImporter, DatasetFilter, DatasetTable, Fields
+
+
+class FindDuplicatesTestCase(unittest.TestCase):
+    def setUp(self):
+        # Create temporary directory
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.library_dir = Path(self.temp_dir.name)
+
+        # Create a COCO dataset
+        input_dirs = {
+            "image": Path("tests/assets/coco_dataset/image"),
+            "objects": Path("tests/assets/coco_dataset"),
+        }
+        importer = COCOImporter(
+            name="coco",
+            description="COCO dataset",
+            input_dirs=input_dirs,
+            splits=["val"],
+        )
+        self.dataset = importer.import_dataset(self.library_dir / "coco", copy=True)
+
+        # Add semantic search embeddings table, with two near-identical items
+        table = DatasetTable(
+            name="emb_test",
+            fields={"id": "str", "image": "vector(4)"},
+            source="test",
+            type="search",
+        )
+        self.dataset.info.tables["embeddings"] = [table]
+        self.dataset.save_info()
+        self.dataset.connect().create_table(
+            "emb_test",
+            pa.Table.from_pylist(
+                [
+                    {"id": "139", "image": [0.0, 0.0, 0.0, 0.0]},
+                    {"id": "285", "image": [3.0, 3.0, 3.0, 3.0]},
+                    {"id": "632", "image": [0.01, 0.0, 0.0, 0.0]},
+                ],
+                schema=Fields(table.fields).to_schema(),
+            ),
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_find_duplicates(self):
+        duplicates = find_duplicates(self.dataset, batch_size=2)
+
+        clusters = dict(
+            zip(
+                duplicates["id"].to_pylist(),
+                duplicates["duplicate_cluster"].to_pylist(),
+            )
+        )
+        self.assertEqual(clusters, {"139": "139", "285": "285", "632": "139"})
+
+        # Duplicates can be filtered on
+        filters = [DatasetFilter(field="is_duplicate", value=True)]
+        self.assertEqual(self.dataset.filter_item_ids(filters), ["632"])
+
+    def test_find_duplicates_ann(self):
+        # Replace embeddings with a table large enough for an ANN index
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(300, 32)).astype(np.float32) * 10
+        vectors[2] = vectors[0] + 0.01
+        ids = ["139", "285", "632"] + [f"other_{i}" for i in range(297)]
+        table = DatasetTable(
+            name="emb_test",
+            fields={"id": "str", "image": "vector(32)"},
+            source="test",
+            type="search",
+        )
+        self.dataset.info.tables["embeddings"] = [table]
+        self.dataset.save_info()
+        self.dataset.connect().create_table(
+            "emb_test",
+            pa.Table.from_pydict(
+                {"id": ids, "image": [list(vector) for vector in vectors]},
+                schema=Fields(table.fields).to_schema(),
+            ),
+            mode="overwrite",
+        )
+
+        with mock.patch.object(duplicates, "EXACT_MAX_ROWS", 100):
+            result = find_duplicates(self.dataset, nprobes=16)
+
+        # Index was created and searched
+        self.assertEqual(
+            [
+                index.column
+                for index in self.dataset.info.tables["embeddings"][0].indexes
+            ],
+            ["image"],
+        )
+        clusters = dict(
+            zip(result["id"].to_pylist(), result["duplicate_cluster"].to_pylist())
+        )
+        self.assertEqual(clusters, {"139": "139", "285": "285", "632": "139"})
+
+        # Order table was rebuilt with the duplicates table
+        self.assertIsInstance(self.dataset.load_order(), lance.LanceDataset)
+
+    def test_find_duplicates_unknown_model(self):
+        with self.assertRaises(ValueError):
+            find_duplicates(self.dataset, model="unknown")
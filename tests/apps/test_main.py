@@ -22,7 +22,15 @@ from fastapi.testclient import TestClient
 from pixano_inference import transformers
 
 from pixano.apps import create_app
-from pixano.data import COCOImporter, DatasetInfo, DatasetItem, DatasetStat, Settings
+from pixano.apps.api.items import ITEM_GROUPS, LIST_GROUPS, item_columns
+from pixano.data import (
+    COCOImporter,
+    Dataset,
+    DatasetInfo,
+    DatasetItem,
+    DatasetStat,
+    Settings,
+)
 
 
 class AppTestCase(unittest.TestCase):
@@ -121,6 +129,87 @@ class AppTestCase(unittest.TestCase):
             ds_item = DatasetItem.model_validate(item)
             self.assertIsInstance(ds_item, DatasetItem)
 
+    def test_get_dataset_items_cursor(self):
+        response = self.client.get("/datasets/coco_dataset/items/cursor?size=2")
+        output = response.json()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(output["items"]), 2)
+        self.assertIsNotNone(output["next_page"])
+
+        # Next page resumes after the last item seen
+        response = self.client.get(
+            f"/datasets/coco_dataset/items/cursor?size=2&cursor={output['next_page']}"
+        )
+        next_output = response.json()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(next_output["items"]), 1)
+        self.assertIsNone(next_output["next_page"])
+        self.assertNotIn(
+            next_output["items"][0]["id"],
+            [item["id"] for item in output["items"]],
+        )
+
+    def test_query_dataset_items(self):
+        response = self.client.post(
+            "/datasets/coco_dataset/query?size=2",
+            headers={
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            },
+            json={"filters": [{"field": "split", "value": "val"}]},
+        )
+        output = response.json()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["id"] for item in output["items"]], ["139", "285"])
+
+        # Unknown feature
+        response = self.client.post(
+            "/datasets/coco_dataset/query",
+            headers={
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            },
+            json={"order_by": "unknown_feature"},
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_dataset_items_batch(self):
+        response = self.client.post(
+            "/datasets/coco_dataset/items/batch",
+            headers={
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            },
+            json=["632", "139"],
+        )
+        output = response.json()
+
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(len(output), 2)
+        self.assertEqual(output[0]["id"], "632")
+        self.assertEqual(output[1]["id"], "139")
+
+        for item in output:
+            ds_item = DatasetItem.model_validate(item)
+            self.assertIsInstance(ds_item, DatasetItem)
+
+        # Too many IDs
+        response = self.client.post(
+            "/datasets/coco_dataset/items/batch",
+            headers={
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            },
+            json=[str(i) for i in range(101)],
+        )
+
+        self.assertEqual(response.status_code, 400)
+
     def test_search_dataset_items(self):
         # Without embeddings
         response = self.client.post(
@@ -166,6 +255,25 @@ class AppTestCase(unittest.TestCase):
             ds_item = DatasetItem.model_validate(item)
             self.assertIsInstance(ds_item, DatasetItem)
 
+        # Filtered search total only counts matching items
+        response = self.client.post(
+            "/datasets/coco_dataset/search",
+            headers={
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            },
+            json={
+                "model": "CLIP",
+                "search": "bear",
+                "filters": [{"field": "category_name", "value": "bear"}],
+            },
+        )
+        output = response.json()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(output["total"], 1)
+        self.assertEqual([item["id"] for item in output["items"]], ["285"])
+
     def test_get_dataset_item(self):
         response = self.client.get("/datasets/coco_dataset/items/139")
         output = response.json()
@@ -175,6 +283,14 @@ class AppTestCase(unittest.TestCase):
         ds_item = DatasetItem.model_validate(output)
         self.assertIsInstance(ds_item, DatasetItem)
 
+        # Item endpoint reads objects, list endpoints only read key columns of objects tables
+        dataset = Dataset(self.temp_dir / "coco")
+        self.assertIn("bbox", item_columns(dataset, ITEM_GROUPS)["objects"])
+        self.assertEqual(item_columns(dataset, LIST_GROUPS)["objects"], [])
+        self.assertEqual(item_columns(dataset, LIST_GROUPS)["embeddings"], [])
+        self.assertTrue(ds_item.views)
+        self.assertTrue(ds_item.objects)
+
     def test_post_dataset_item(self):
         response_1 = self.client.get("/datasets/coco_dataset/items/139")
         output = response_1.json()
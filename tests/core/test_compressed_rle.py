@@ -87,6 +87,27 @@ class CompressedRLETestCase(unittest.TestCase):
         self.assertEqual(rle.size, expected_rle.size)
         self.assertEqual(rle.counts, expected_rle.counts)
 
+    def test_encode_batch(self):
+        masks = [
+            [[1, 1, 2, 2, 2, 1], [3, 3, 4, 4, 4, 3]],
+            None,
+            {"counts": [1, 2, 3, 2, 4, 1], "size": [10, 10]},
+            [[5, 5, 8, 5, 8, 8]],
+            self.rle.to_dict(),
+        ]
+        height, width = 10, 10
+
+        array = CompressedRLE.encode_batch(masks, height, width)
+
+        self.assertEqual(array.type, CompressedRLEType)
+        self.assertEqual(len(array), len(masks))
+        self.assertFalse(array[1].is_valid)
+        for rle, mask in zip(array, masks):
+            if mask is not None:
+                expected_rle = CompressedRLE.encode(mask, height, width)
+                self.assertEqual(rle.as_py().size, expected_rle.size)
+                self.assertEqual(rle.as_py().counts, expected_rle.counts)
+
 
 class TestParquetCompressedRLE(unittest.TestCase):
     def setUp(self) -> None:
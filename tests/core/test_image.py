@@ -14,6 +14,7 @@
 import tempfile
 import unittest
 from io import BytesIO
+from pathlib import Path
 from urllib.parse import urlparse
 from urllib.request import urlopen
 
@@ -97,6 +98,9 @@ class ImageTestCase(unittest.TestCase):
             "uri": self.uri,
             "bytes": self.bytes,
             "preview_bytes": self.preview_bytes,
+            "width": None,
+            "height": None,
+            "format": None,
         }
         self.assertEqual(self.image.to_dict(), expected_dict)
 
@@ -104,6 +108,29 @@ class ImageTestCase(unittest.TestCase):
         self.assertEqual(self.image.file_name, self.file_name)
 
 
+class ImageInfoTestCase(unittest.TestCase):
+    def setUp(self):
+        self.image_dir = Path("tests/assets/coco_dataset/image")
+        self.uri = "val/000000000139.png"
+
+    def test_image_probe(self):
+        image = Image(self.uri, uri_prefix=self.image_dir.absolute().as_uri())
+
+        self.assertFalse(image.has_size)
+        self.assertEqual(image.size, (640, 426))
+        self.assertEqual(image.format, "PNG")
+        self.assertTrue(image.has_size)
+
+    def test_image_stored_info(self):
+        # Stored info is used without reading the image
+        image = Image("missing.png", width=32, height=16, format="JPEG")
+
+        self.assertEqual(image.size, (32, 16))
+        self.assertEqual(image.format, "JPEG")
+        self.assertEqual(image.to_dict()["width"], 32)
+        self.assertEqual(Image.from_dict(image.to_dict()).height, 16)
+
+
 class TestParquetImage(unittest.TestCase):
     def setUp(self) -> None:
         uri_prefix = "http://farm3.staticflickr.com"
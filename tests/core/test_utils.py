@@ -38,6 +38,21 @@ class IsImageTypeTestCase(unittest.TestCase):
         pa_im_field = pa.field("some images", ImageType)
         self.assertTrue(is_image_type(pa_im_field.type))
 
+        # Image struct of previous versions
+        pa_old_im_field = pa.field(
+            "some images",
+            pa.struct(
+                [
+                    pa.field("uri", pa.utf8()),
+                    pa.field("bytes", pa.binary()),
+                    pa.field("preview_bytes", pa.binary()),
+                ]
+            ),
+        )
+        self.assertTrue(is_image_type(pa_old_im_field.type))
+
+        self.assertFalse(is_image_type(pa.utf8()))
+
 
 class TestPaArrayConversion(unittest.TestCase):
     def test_extension_type_conversion(self):
@@ -15,20 +15,37 @@ import json
 import tempfile
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
 
+import lance
 import lancedb
+import numpy as np
+import pyarrow as pa
 from pixano_inference import transformers
 
 from pixano.core import Image
 from pixano.data import (
     COCOImporter,
     Dataset,
+    DatasetFilter,
+    DatasetIndex,
     DatasetInfo,
     DatasetItem,
     DatasetStat,
+    DatasetTable,
+    Fields,
+    ItemFeature,
     ItemObject,
     ItemView,
 )
+from pixano.data.dataset.dataset import (
+    brute_force_search,
+    create_vector_index,
+    merge_search_results,
+)
+from pixano.models import EncoderRegistry
+from pixano.utils import quantize_vectors
 
 
 class DatasetTestCase(unittest.TestCase):
@@ -120,6 +137,10 @@ class DatasetTestCase(unittest.TestCase):
         self.assertIsInstance(self.dataset.num_rows, int)
         self.assertEqual(self.dataset.num_rows, 3)
 
+        # Row count is cached for the current main table version
+        version = self.dataset.open_table("db").to_lance().version
+        self.assertEqual(self.dataset._num_rows, (version, 3))
+
     def test_load_info(self):
         loaded_info = self.dataset.load_info()
 
@@ -133,6 +154,21 @@ class DatasetTestCase(unittest.TestCase):
         self.assertEqual(full_loaded_info.stats, self.stats)
         self.assertEqual(full_loaded_info.preview, self.thumbnail.url)
 
+    def test_reload_info(self):
+        info = self.dataset.info
+
+        # Info is not reloaded while info file does not change
+        self.assertIs(self.dataset.reload_info(), info)
+
+        # Info is reloaded after info file changes
+        other_dataset = Dataset(self.import_dir)
+        other_dataset.info.id = "coco_dataset_2"
+        other_dataset.save_info()
+
+        reloaded_info = self.dataset.reload_info()
+        self.assertIsNot(reloaded_info, info)
+        self.assertEqual(reloaded_info.id, "coco_dataset_2")
+
     def test_save_info(self):
         # Edit DatasetInfo
         self.dataset.info.id = "coco_dataset_2"
@@ -162,6 +198,210 @@ class DatasetTestCase(unittest.TestCase):
         self.assertIsInstance(ds_tables["main"]["db"], lancedb.db.LanceTable)
         self.assertIsInstance(ds_tables["media"]["image"], lancedb.db.LanceTable)
 
+    def test_create_vector_index(self):
+        vectors = np.random.rand(300, 32).astype(np.float32)
+        table = lance.write_dataset(
+            pa.table(
+                {
+                    "id": [str(i) for i in range(300)],
+                    "image": pa.FixedSizeListArray.from_arrays(
+                        pa.array(vectors.flatten()), 32
+                    ),
+                }
+            ),
+            self.library_dir / "vectors.lance",
+        )
+
+        index = create_vector_index(table, "image")
+
+        self.assertIsInstance(index, DatasetIndex)
+        self.assertEqual(index.type, "IVF_PQ")
+        self.assertEqual(index.num_partitions, 17)
+        self.assertEqual(index.num_sub_vectors, 2)
+        self.assertFalse(index.is_stale(300))
+        self.assertTrue(index.is_stale(301))
+
+        # Too few rows to train index
+        small_table = lance.write_dataset(
+            table.to_table(limit=10), self.library_dir / "small_vectors.lance"
+        )
+        self.assertIsNone(create_vector_index(small_table, "image"))
+
+    def test_quantized_vector_search(self):
+        vectors = np.random.rand(300, 32).astype(np.float32)
+        int8_vectors, scale = quantize_vectors(vectors, "int8")
+        table = lance.write_dataset(
+            pa.table(
+                {
+                    "id": [str(i) for i in range(300)],
+                    "image": pa.FixedSizeListArray.from_arrays(
+                        pa.array(int8_vectors.flatten()), 32
+                    ),
+                }
+            ),
+            self.library_dir / "int8_vectors.lance",
+        )
+
+        # No ANN index on int8 vectors
+        self.assertIsNone(create_vector_index(table, "image"))
+
+        results = brute_force_search(table, "image", vectors[0], 5, scale=scale)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(results[0][1], "0")
+        self.assertEqual(results, sorted(results))
+
+        # Search through dataset with int8 scales, restricted to item IDs
+        results = Dataset._vector_search(
+            table,
+            ["image"],
+            vectors[0],
+            5,
+            ids=["1", "2", "3"],
+            scales={"image": scale},
+        )
+        self.assertEqual(sorted(id for _, id in results), ["1", "2", "3"])
+
+        # Search restricted to item IDs over several batches and fragments
+        fragmented_table = lance.write_dataset(
+            table.to_table(),
+            self.library_dir / "int8_fragments.lance",
+            max_rows_per_file=100,
+        )
+        self.assertGreater(len(fragmented_table.get_fragments()), 1)
+        ids = pa.array(["1", "150", "299"])
+        results = brute_force_search(
+            fragmented_table,
+            "image",
+            vectors[0],
+            5,
+            scale=scale,
+            ids=ids,
+            batch_size=32,
+        )
+        self.assertEqual(sorted(id for _, id in results), ["1", "150", "299"])
+        results = Dataset._vector_search(
+            fragmented_table,
+            ["image"],
+            vectors[0],
+            2,
+            ids={"1", "150", "299"},
+            scales={"image": scale},
+        )
+        self.assertEqual(len(results), 2)
+
+    def test_backfill_image_info(self):
+        # Imported images already store their info
+        self.assertEqual(self.dataset.backfill_image_info(), [])
+
+        # Rewrite media table with the image struct of previous versions
+        media_ds = self.dataset.open_table("image").to_lance()
+        media = media_ds.to_table()
+        old_type = pa.struct(
+            [
+                pa.field("uri", pa.utf8()),
+                pa.field("bytes", pa.binary()),
+                pa.field("preview_bytes", pa.binary()),
+            ]
+        )
+        old_images = pa.array(
+            [
+                {field.name: im[field.name] for field in old_type}
+                for im in media["image"].combine_chunks().storage.to_pylist()
+            ],
+            type=old_type,
+        )
+        media = media.set_column(
+            media.schema.get_field_index("image"), "image", old_images
+        )
+        lance.write_dataset(media, media_ds.uri, mode="overwrite")
+
+        self.assertEqual(self.dataset.backfill_image_info(), ["image"])
+        self.assertIsInstance(self.dataset.load_order(), lance.LanceDataset)
+
+        images = self.dataset.open_table("image").to_lance().to_table()["image"]
+        for im in images.to_pylist():
+            self.assertTrue(im.has_size)
+            self.assertIn(im.format, ["PNG", "JPEG"])
+        item = self.dataset.load_item("139")
+        self.assertEqual(item.views["image"].features["width"].value, 640)
+        self.assertEqual(item.views["image"].features["height"].value, 426)
+
+    def test_build_order(self):
+        order_ds = self.dataset.build_order()
+        order = order_ds.to_table()
+
+        self.assertEqual(order.num_rows, 3)
+        self.assertEqual(order["id"].to_pylist(), ["139", "285", "632"])
+        self.assertIn("db", order.column_names)
+        self.assertIn("image", order.column_names)
+
+        # Positions point to item rows
+        main_ids = self.dataset.open_table("db").to_lance().to_table(columns=["id"])
+        for item_id, position in zip(order["id"], order["db"]):
+            self.assertEqual(main_ids["id"][position.as_py()], item_id)
+
+    def test_load_order(self):
+        order_ds = self.dataset.load_order()
+        self.assertEqual(order_ds.count_rows(), 3)
+
+        # Order is updated when saving an item moves its main table row
+        item = self.dataset.load_item("139", load_objects=True)
+        item.features["label"] = ItemFeature(name="label", dtype="text", value="cat")
+        self.dataset.save_item(item)
+
+        # Move is recorded without rewriting the order table
+        order_version = order_ds.version
+        order_ds = self.dataset.load_order()
+        self.assertIsInstance(order_ds, lance.LanceDataset)
+        self.assertEqual(order_ds.version, order_version)
+        order = self.dataset._take_order_page(order_ds, [0, 1, 2])
+        self.assertEqual(order["id"].to_pylist(), ["139", "285", "632"])
+        self.assertEqual(order["db"].to_pylist(), [2, 0, 1])
+        items = self.dataset.load_items(limit=3, offset=0)
+        self.assertEqual([item.id for item in items], ["139", "285", "632"])
+        self.assertEqual(items[0].features["label"].value, "cat")
+        # Same order as a rebuilt order
+        order_ds = self.dataset.build_order()
+        self.assertEqual(order_ds.to_table(), order)
+
+        # Order is built again and stored once when tables change outside of dataset updates
+        order_version = order_ds.version
+        self.dataset.open_table("db").to_lance().delete("id = '285'")
+        order_ds = self.dataset.load_order()
+        self.assertEqual(order_ds.to_table()["id"].to_pylist(), ["139", "632"])
+        self.assertGreater(order_ds.version, order_version)
+        self.assertEqual(self.dataset.load_order().version, order_ds.version)
+        items = self.dataset.load_items(limit=2, offset=0)
+        self.assertEqual([item.id for item in items], ["139", "632"])
+
+    def test_order_moves(self):
+        for item_id, label in [("139", "cat"), ("285", "dog"), ("139", "bird")]:
+            item = self.dataset.load_item(item_id, load_objects=True)
+            item.features["label"] = ItemFeature(
+                name="label", dtype="text", value=label
+            )
+            self.dataset.save_item(item)
+
+        # Moves are applied in order to main table positions
+        order_ds = self.dataset.load_order()
+        order = self.dataset._take_order_page(order_ds, [0, 1, 2])
+        self.assertEqual(order, self.dataset.build_order().to_table())
+
+        # Order table is built again once moves reach the limit
+        with mock.patch("pixano.data.dataset.dataset.ORDER_MAX_MOVES", 1):
+            for item_id, num_moves in [("632", 1), ("285", None)]:
+                item = self.dataset.load_item(item_id, load_objects=True)
+                item.features["label"] = ItemFeature(
+                    name="label", dtype="text", value="cat"
+                )
+                self.dataset.save_item(item)
+                moves = self.dataset._order_moves(self.dataset.load_order())
+                self.assertEqual(moves and len(moves["moves"]), num_moves)
+        items = self.dataset.load_items(limit=3, offset=0)
+        self.assertEqual(
+            [item.features["label"].value for item in items], ["bird", "cat", "cat"]
+        )
+
     def test_load_items(self):
         items = self.dataset.load_items(limit=2, offset=0)
 
@@ -188,6 +428,15 @@ class DatasetTestCase(unittest.TestCase):
         self.assertEqual(items[0].split, "val")
         self.assertIsInstance(items[0].views["image"], ItemView)
 
+    def test_load_items_join(self):
+        items = self.dataset.load_items(limit=3, offset=0)
+
+        self.assertEqual([item.id for item in items], ["139", "285", "632"])
+
+        # Each item gets its own media rows
+        for item in items:
+            self.assertIn(item.id, item.views["image"].uri)
+
     def test_search_items(self):
         # Without embeddings
         items = self.dataset.search_items(limit=1, offset=0, query={"query": "bear"})
@@ -223,6 +472,259 @@ class DatasetTestCase(unittest.TestCase):
 
         self.assertEqual(item, None)
 
+    def test_load_items_after(self):
+        items = self.dataset.load_items(3, 0)
+
+        # First page
+        page = self.dataset.load_items_after(2)
+        self.assertEqual([item.id for item in page], [item.id for item in items[:2]])
+
+        # Page following last item seen
+        page = self.dataset.load_items_after(2, page[-1].id)
+        self.assertEqual([item.id for item in page], [items[2].id])
+
+        # Cursor not in dataset resumes at its sort position
+        page = self.dataset.load_items_after(2, "0")
+        self.assertEqual(page[0].id, items[0].id)
+
+        # No items after last item
+        self.assertIsNone(self.dataset.load_items_after(2, items[2].id))
+
+    def test_query_items(self):
+        # Sort by ID without filters
+        items = self.dataset.query_items(3)
+        self.assertEqual([item.id for item in items], ["139", "285", "632"])
+
+        # Filter pushed into main table, sorted by feature then ID
+        filters = [DatasetFilter(field="split", operator="in", value=["val"])]
+        items = self.dataset.query_items(
+            2, filters=filters, order_by="split", descending=True
+        )
+        self.assertEqual([item.id for item in items], ["139", "285"])
+
+        # Resume after cursor
+        items = self.dataset.query_items(
+            2, filters=filters, order_by="split", descending=True, cursor="285"
+        )
+        self.assertEqual([item.id for item in items], ["632"])
+
+        # No matching items
+        filters = [DatasetFilter(field="split", value="train")]
+        self.assertIsNone(self.dataset.query_items(2, filters=filters))
+
+        # Unknown feature
+        with self.assertRaises(ValueError):
+            self.dataset.query_items(2, order_by="unknown_feature")
+
+    def test_vector_search_filters(self):
+        vectors = np.random.rand(300, 32).astype(np.float32)
+        table = lance.write_dataset(
+            pa.table(
+                {
+                    "id": [str(i) for i in range(300)],
+                    "image": pa.FixedSizeListArray.from_arrays(
+                        pa.array(vectors.flatten()), 32
+                    ),
+                    "parity": ["even" if i % 2 == 0 else "odd" for i in range(300)],
+                }
+            ),
+            self.library_dir / "filtered_vectors.lance",
+        )
+
+        # Filter pushed into embeddings table scan
+        results = Dataset._vector_search(
+            table, ["image"], vectors[0], 5, filter="parity = 'odd'"
+        )
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(int(id) % 2 == 1 for _, id in results))
+
+        # Search results matched against few item IDs
+        ids = {"7", "150", "299"}
+        results = Dataset._vector_search(table, ["image"], vectors[0], 5, ids=ids)
+        self.assertEqual({id for _, id in results}, ids)
+
+        # Both filters
+        results = Dataset._vector_search(
+            table, ["image"], vectors[0], 5, ids=ids, filter="parity = 'odd'"
+        )
+        self.assertEqual({id for _, id in results}, {"7", "299"})
+
+    def test_filter_item_ids(self):
+        # Main table filter
+        filters = [DatasetFilter(field="split", value="val")]
+        self.assertEqual(self.dataset.filter_item_ids(filters), ["139", "285", "632"])
+
+        # Objects table filter
+        filters = [DatasetFilter(field="category_name", value="book")]
+        self.assertEqual(self.dataset.filter_item_ids(filters), ["139", "632"])
+
+        # Main and objects tables filters
+        filters = [
+            DatasetFilter(field="split", value="val"),
+            DatasetFilter(field="category_name", operator="in", value=["bear"]),
+        ]
+        self.assertEqual(self.dataset.filter_item_ids(filters), ["285"])
+
+        # Unknown feature
+        with self.assertRaises(ValueError):
+            self.dataset.filter_item_ids([DatasetFilter(field="unknown", value=1)])
+
+    def test_similar_items(self):
+        # Add semantic search embeddings table
+        table = DatasetTable(
+            name="emb_test",
+            fields={"id": "str", "image": "vector(4)"},
+            source="test",
+            type="search",
+        )
+        self.dataset.info.tables["embeddings"] = [table]
+        self.dataset.save_info()
+        self.dataset.connect().create_table(
+            "emb_test",
+            pa.Table.from_pylist(
+                [
+                    {"id": "139", "image": [0.0, 0.0, 0.0, 0.0]},
+                    {"id": "285", "image": [3.0, 3.0, 3.0, 3.0]},
+                    {"id": "632", "image": [1.0, 1.0, 1.0, 1.0]},
+                ],
+                schema=Fields(table.fields).to_schema(),
+            ),
+        )
+
+        items = self.dataset.similar_items("139", "image", 2)
+
+        # Item itself is left out, similar items are sorted by distance
+        self.assertEqual([item.id for item in items], ["632", "285"])
+        self.assertIn("search distance", items[0].features)
+
+        # Unknown item or view
+        self.assertIsNone(self.dataset.similar_items("unknown", "image", 2))
+        self.assertIsNone(self.dataset.similar_items("139", "unknown", 2))
+
+    def test_search_items_cache(self):
+        # Add semantic search embeddings table, with a query encoder
+        table = DatasetTable(
+            name="emb_test",
+            fields={"id": "str", "image": "vector(4)"},
+            source="test_encoder",
+            type="search",
+        )
+        self.dataset.info.tables["embeddings"] = [table]
+        self.dataset.save_info()
+        self.dataset.connect().create_table(
+            "emb_test",
+            pa.Table.from_pylist(
+                [
+                    {"id": "139", "image": [0.0, 0.0, 0.0, 0.0]},
+                    {"id": "285", "image": [3.0, 3.0, 3.0, 3.0]},
+                    {"id": "632", "image": [1.0, 1.0, 1.0, 1.0]},
+                ],
+                schema=Fields(table.fields).to_schema(),
+            ),
+        )
+        EncoderRegistry.default().register(
+            "test_encoder",
+            lambda: SimpleNamespace(semantic_search=lambda text: [0.0] * 4),
+        )
+        query = {"model": "test_encoder", "search": "bear"}
+        filters = [DatasetFilter(field="category_name", value="bear")]
+
+        items = self.dataset.search_items(3, 0, query, filters=filters)
+        self.assertEqual([item.id for item in items], ["285"])
+        self.assertEqual(self.dataset.count_search_items("test_encoder", filters), 1)
+
+        # Saving a matching object invalidates cached results of filtered search
+        item = self.dataset.load_item("139", load_objects=True)
+        item.objects["added_object"] = ItemObject(
+            id="added_object",
+            item_id="139",
+            view_id="image",
+            source_id="Ground Truth",
+            bbox=dict(coords=[0.1, 0.1, 0.3, 0.3], format="xywh"),
+            features={
+                "category_name": ItemFeature(
+                    name="category_name", dtype="text", value="bear"
+                )
+            },
+        )
+        self.dataset.save_item(item)
+
+        items = self.dataset.search_items(3, 0, query, filters=filters)
+        self.assertEqual([item.id for item in items], ["139", "285"])
+        self.assertEqual(self.dataset.count_search_items("test_encoder", filters), 2)
+
+    def test_merge_search_results(self):
+        view_results = [
+            [(0.1, "139"), (0.5, "285"), (0.9, "632")],
+            [(0.2, "285"), (0.3, "139")],
+            [(0.05, "632"), (0.4, "285")],
+        ]
+
+        # Items are kept once, at their best distance over all views
+        self.assertEqual(
+            merge_search_results(view_results, 3),
+            [(0.05, "632"), (0.1, "139"), (0.2, "285")],
+        )
+        self.assertEqual(
+            merge_search_results(view_results, 2),
+            [(0.05, "632"), (0.1, "139")],
+        )
+
+    def test_load_items_by_ids(self):
+        items = self.dataset.load_items_by_ids(["632", "139"], load_objects=True)
+
+        self.assertIsInstance(items, list)
+        self.assertEqual(len(items), 2)
+
+        # Items are returned in the order of the given IDs
+        self.assertEqual(items[0].id, "632")
+        self.assertEqual(items[1].id, "139")
+        self.assertIsInstance(items[0].views["image"], ItemView)
+        self.assertEqual(len(items[0].objects.values()), 18)
+
+        # Unknown IDs are ignored
+        items = self.dataset.load_items_by_ids(["632", "unknown"])
+        self.assertEqual([item.id for item in items], ["632"])
+
+        items = self.dataset.load_items_by_ids(["unknown"])
+        self.assertEqual(items, None)
+
+    def test_load_items_by_ids_take(self):
+        # Items are taken at their positions in main and media tables, without scans
+        with mock.patch.object(
+            lance.LanceDataset,
+            "scanner",
+            autospec=True,
+            side_effect=lance.LanceDataset.scanner,
+        ) as scanner:
+            items = self.dataset.load_items_by_ids(["632", "139"])
+        scanner.assert_not_called()
+        self.assertEqual([item.id for item in items], ["632", "139"])
+        self.assertIsInstance(items[0].views["image"], ItemView)
+
+    def test_load_items_columns(self):
+        items = self.dataset.load_items_by_ids(
+            ["632"],
+            load_objects=True,
+            columns={"media": [], "objects": ["bbox"]},
+        )
+
+        # Key columns are always read
+        self.assertEqual(items[0].id, "632")
+        self.assertEqual(items[0].split, "val")
+
+        # Only projected columns are formatted
+        self.assertEqual(items[0].views, {})
+        obj = next(iter(items[0].objects.values()))
+        self.assertIsNotNone(obj.bbox)
+        self.assertIsNone(obj.mask)
+        self.assertNotIn("category_id", obj.features)
+
+        # Same projection on a page of items
+        items = self.dataset.load_items(2, 0, columns={"media": []})
+        self.assertEqual(len(items), 2)
+        self.assertEqual(items[0].views, {})
+
     def test_save_item(self):
         # Original item has 18 objects
         item_1 = self.dataset.load_item("632", load_objects=True)
@@ -0,0 +1,176 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+
+import time
+import unittest
+from collections import defaultdict
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.dataset as pa_ds
+
+from pixano.core import Image
+from pixano.data import DatasetInfo, DatasetItem, DatasetTable, Fields
+from pixano.data.importers.table_builder import TableBuilder
+
+
+def synthetic_dataset(num_items: int) -> tuple[DatasetInfo, dict]:
+    """Create dataset info and PyArrow tables of a synthetic page of items
+
+    Args:
+        num_items (int): Number of items
+
+    Returns:
+        tuple[DatasetInfo, dict]: Dataset info and PyArrow items
+    """
+
+    tables = {
+        "main": [
+            DatasetTable(
+                name="db",
+                fields={"id": "str", "views": "[str]", "split": "str", "label": "str"},
+            )
+        ],
+        "media": [
+            DatasetTable(name="image", fields={"id": "str", "image": "image"}),
+            DatasetTable(name="depth", fields={"id": "str", "depth": "image"}),
+        ],
+        "active_learning": [
+            DatasetTable(
+                name="al_round",
+                source="Round",
+                fields={"id": "str", "round": "int"},
+            )
+        ],
+    }
+    info = DatasetInfo(
+        id="synthetic",
+        name="Synthetic",
+        description="Synthetic dataset",
+        estimated_size="N/A",
+        num_elements=num_items,
+        splits=["train"],
+        tables=tables,
+    )
+
+    ids = [str(i) for i in range(num_items)]
+    rows = {
+        "db": [
+            {"id": id, "views": ["image", "depth"], "split": "train", "label": "cat"}
+            for id in ids
+        ],
+        "image": [
+            {"id": id, "image": Image(f"image/{id}.jpg", None, b"preview").to_dict()}
+            for id in ids
+        ],
+        "depth": [
+            {"id": id, "depth": Image(f"depth/{id}.png", None, b"preview").to_dict()}
+            for id in ids
+        ],
+        "al_round": [{"id": id, "round": 1} for id in ids],
+    }
+
+    pyarrow_items: dict[str, dict[str, pa.Table]] = defaultdict(dict)
+    for group_name, table_group in tables.items():
+        for table in table_group:
+            builder = TableBuilder(Fields(table.fields).to_schema())
+            builder.extend(rows[table.name])
+            source = table.source if group_name == "active_learning" else table.name
+            pyarrow_items[group_name][source] = builder.flush()
+
+    return info, pyarrow_items
+
+
+def from_pyarrow_per_item(
+    pyarrow_items: dict[str, dict[str, pa.Table]],
+    info: DatasetInfo,
+    media_dir: Path,
+) -> list[DatasetItem]:
+    """Format PyArrow items one by one, with one filter scan per item and table,
+    as load_items did before DatasetItem.from_pyarrow_batch
+
+    Args:
+        pyarrow_items (dict[str, dict[str, pa.Table]]): PyArrow items
+        info (DatasetInfo): Dataset info
+        media_dir (Path): Dataset media directory
+
+    Returns:
+        list[DatasetItem]: Formatted items
+    """
+
+    items = []
+    for index in range(pyarrow_items["main"]["db"].num_rows):
+        pyarrow_item = defaultdict(dict)
+        pyarrow_item["main"]["db"] = pyarrow_items["main"]["db"].take([index])
+        item_id = pyarrow_item["main"]["db"].to_pylist()[0]["id"]
+        for group_name in ["media", "active_learning"]:
+            for source, table in pyarrow_items[group_name].items():
+                pyarrow_item[group_name][source] = (
+                    pa_ds.dataset(table)
+                    .scanner(filter=pa_ds.field("id") == item_id)
+                    .to_table()
+                )
+        items.append(DatasetItem.from_pyarrow(pyarrow_item, info, media_dir))
+
+    return items
+
+
+def benchmark(limits: list[int], repeat: int = 3) -> list[tuple[int, float, float]]:
+    """Time per item and batch formatting of pages of increasing size
+
+    Args:
+        limits (list[int]): Page sizes
+        repeat (int, optional): Number of runs, the best one is kept. Defaults to 3.
+
+    Returns:
+        list[tuple[int, float, float]]: Page size, per item and batch formatting times in seconds
+    """
+
+    media_dir = Path("media")
+    results = []
+    for limit in limits:
+        info, pyarrow_items = synthetic_dataset(limit)
+        timings = []
+        for convert in [from_pyarrow_per_item, DatasetItem.from_pyarrow_batch]:
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                convert(pyarrow_items, info, media_dir)
+                best = min(best, time.perf_counter() - start)
+            timings.append(best)
+        results.append((limit, *timings))
+
+    return results
+
+
+class DatasetItemTestCase(unittest.TestCase):
+    def test_from_pyarrow_batch(self):
+        info, pyarrow_items = synthetic_dataset(20)
+        media_dir = Path("media")
+
+        items = DatasetItem.from_pyarrow_batch(pyarrow_items, info, media_dir)
+
+        # Same items as when formatting them one by one
+        self.assertEqual(items, from_pyarrow_per_item(pyarrow_items, info, media_dir))
+        self.assertEqual([item.id for item in items], [str(i) for i in range(20)])
+        self.assertEqual(set(items[0].views), {"image", "depth"})
+        self.assertEqual(items[0].features["round"].value, 1)
+
+
+if __name__ == "__main__":
+    # Benchmark, not run by the test suite as timings vary between machines
+    # python tests/data/dataset/test_dataset_item.py
+    print("limit  per item (ms)  batch (ms)")
+    for limit, per_item, batch in benchmark([10, 50, 100, 200, 500]):
+        print(f"{limit:5d}  {1000 * per_item:13.1f}  {1000 * batch:10.1f}")
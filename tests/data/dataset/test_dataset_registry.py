@@ -0,0 +1,87 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from pixano.data import COCOImporter, Dataset, DatasetRegistry
+
+
+class DatasetRegistryTestCase(unittest.TestCase):
+    def setUp(self):
+        # Create temporary directory
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.library_dir = Path(self.temp_dir.name)
+
+        # Create a COCO dataset
+        self.import_dir = self.library_dir / "coco"
+        input_dirs = {
+            "image": Path("tests/assets/coco_dataset/image"),
+            "objects": Path("tests/assets/coco_dataset"),
+        }
+        importer = COCOImporter(
+            name="coco",
+            description="COCO dataset",
+            input_dirs=input_dirs,
+            splits=["val"],
+        )
+        dataset = importer.import_dataset(self.import_dir, copy=True)
+
+        # Set dataset ID
+        dataset.info.id = "coco_dataset"
+        dataset.save_info()
+
+        self.registry = DatasetRegistry(self.library_dir)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_from_directory(self):
+        registry = DatasetRegistry.from_directory(self.library_dir)
+
+        self.assertIsInstance(registry, DatasetRegistry)
+        self.assertIs(registry, DatasetRegistry.from_directory(self.library_dir))
+
+    def test_find(self):
+        found_dataset = self.registry.find("coco_dataset")
+
+        self.assertIsInstance(found_dataset, Dataset)
+        self.assertEqual(found_dataset.path, self.import_dir)
+
+        # Dataset is cached while its files do not change
+        self.assertIs(self.registry.find("coco_dataset"), found_dataset)
+
+        # Unknown dataset
+        self.assertIsNone(self.registry.find("unknown_dataset"))
+
+    def test_find_after_change(self):
+        found_dataset = self.registry.find("coco_dataset")
+
+        # Change dataset ID
+        found_dataset.info.id = "coco_dataset_2"
+        found_dataset.save_info()
+
+        self.assertIsNone(self.registry.find("coco_dataset"))
+
+        updated_dataset = self.registry.find("coco_dataset_2")
+        self.assertIsInstance(updated_dataset, Dataset)
+        self.assertIsNot(updated_dataset, found_dataset)
+        self.assertEqual(updated_dataset.info.id, "coco_dataset_2")
+
+    def test_open_table(self):
+        dataset = self.registry.find("coco_dataset")
+
+        # Table is reused while its Lance version does not change
+        table = dataset.open_table("db")
+        self.assertIs(dataset.open_table("db"), table)
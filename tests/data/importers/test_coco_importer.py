@@ -14,6 +14,7 @@
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 import pyarrow as pa
 
@@ -34,6 +35,27 @@ class COCOImporterTestCase(unittest.TestCase):
             splits=["val"],
         )
 
+    def test_categories(self):
+        # Categories are read with the annotations, before their rows are yielded
+        rows_iterator = self.importer.import_rows()
+        next(rows_iterator)
+        self.assertEqual(91, len(self.importer.info.categories))
+        self.assertEqual("person", self.importer.info.categories[0].name)
+
+    def test_import_rows_masks(self):
+        def masks(rows_iterator):
+            return [
+                obj["mask"]
+                for rows in rows_iterator
+                for obj in rows["objects"]["objects"]
+            ]
+
+        # Masks encoded for several images at once match masks encoded image by image
+        image_masks = masks(self.importer.import_rows())
+        with mock.patch("pixano.data.importers.coco_importer.MASK_BATCH_IMAGES", 1):
+            self.assertEqual(masks(self.importer.import_rows()), image_masks)
+        self.assertTrue(any(mask is not None for mask in image_masks))
+
     def test_import_dataset(self):
         with tempfile.TemporaryDirectory() as temp_dir:
             # Set import directory
@@ -84,3 +106,78 @@ class COCOImporterTestCase(unittest.TestCase):
             self.assertIn(pa.field("id", pa.string()), table.schema)
             self.assertIn(pa.field("bbox", BBoxType), table.schema)
             self.assertIn(pa.field("mask", CompressedRLEType), table.schema)
+
+    def test_import_dataset_workers(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Import dataset with media processed in one and two processes
+            dataset = self.importer.import_dataset(Path(temp_dir) / "coco", copy=True)
+            parallel_dataset = self.importer.import_dataset(
+                Path(temp_dir) / "coco_parallel", copy=True, num_workers=2
+            )
+
+            # Same rows in same order
+            for table_name in ["db", "image", "objects"]:
+                self.assertEqual(
+                    dataset.open_table(table_name).to_lance().to_table(),
+                    parallel_dataset.open_table(table_name).to_lance().to_table(),
+                )
+
+    def test_import_dataset_resume(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            import_dir = Path(temp_dir) / "coco"
+            dataset = self.importer.import_dataset(import_dir, copy=True)
+
+            # Simulate an interrupted import, with the last item not written
+            dataset.open_table("db").to_lance().delete("id = '632'")
+            dataset.open_table("image").to_lance().delete("id = '632'")
+            dataset.open_table("objects").to_lance().delete("item_id = '632'")
+            (import_dir / "db.json").unlink()
+
+            dataset = self.importer.import_dataset(import_dir, mode="resume")
+
+            self.assertEqual(dataset.info.num_elements, 3)
+            self.assertEqual(len(dataset.open_table("db")), 3)
+            self.assertEqual(len(dataset.open_table("image")), 3)
+            self.assertEqual(len(dataset.open_table("objects")), 39)
+
+    def test_import_dataset_append(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            import_dir = Path(temp_dir) / "coco"
+
+            # No dataset to append to
+            with self.assertRaises(FileNotFoundError):
+                self.importer.import_dataset(import_dir, mode="append")
+
+            dataset = self.importer.import_dataset(import_dir, copy=True)
+            dataset.info.id = "coco_dataset"
+            dataset.save_info()
+
+            # Rows already imported are skipped, dataset ID is kept
+            dataset = self.importer.import_dataset(import_dir, mode="append")
+
+            self.assertEqual(dataset.info.id, "coco_dataset")
+            self.assertEqual(dataset.info.splits, ["val"])
+            self.assertEqual(dataset.info.num_elements, 3)
+            self.assertEqual(len(dataset.open_table("objects")), 39)
+
+            with self.assertRaises(ValueError):
+                self.importer.import_dataset(import_dir, mode="update")
+
+    def test_import_dataset_link(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            import_dir = Path(temp_dir) / "coco"
+            image_dir = Path("tests/assets/coco_dataset/image")
+            dataset = self.importer.import_dataset(import_dir, link="symlink")
+
+            # Media files are linked, and recorded in dataset info
+            media_file = import_dir / "media" / "image" / "val" / "000000000139.png"
+            self.assertTrue(media_file.is_symlink())
+            self.assertTrue(media_file.samefile(image_dir / "val" / "000000000139.png"))
+            self.assertEqual(dataset.info.media["image"][0].method, "symlink")
+            self.assertEqual(
+                dataset.info.media["image"][0].source, str(image_dir.absolute())
+            )
+            self.assertEqual(dataset.broken_media_links(), [])
+
+            with self.assertRaises(ValueError):
+                self.importer.import_dataset(import_dir, link="junction")
@@ -16,9 +16,12 @@ import unittest
 from pathlib import Path
 
 import pyarrow as pa
+from PIL import Image as PILImage
 
 from pixano.core import BBoxType, ImageType
 from pixano.data import DOTAImporter
+from pixano.data.importers.dota_importer import DOTA_MAX_PIXELS
+from pixano.utils import max_image_pixels
 
 
 class DOTAImporterTestCase(unittest.TestCase):
@@ -34,6 +37,18 @@ class DOTAImporterTestCase(unittest.TestCase):
             splits=["val"],
         )
 
+    def test_max_image_pixels(self):
+        default_max_pixels = PILImage.MAX_IMAGE_PIXELS
+
+        # DOTA limit is only raised while reading DOTA images
+        with max_image_pixels(DOTA_MAX_PIXELS):
+            self.assertEqual(PILImage.MAX_IMAGE_PIXELS, DOTA_MAX_PIXELS)
+        self.assertEqual(PILImage.MAX_IMAGE_PIXELS, default_max_pixels)
+
+        list(self.importer.import_rows())
+        self.assertEqual(PILImage.MAX_IMAGE_PIXELS, default_max_pixels)
+        self.assertLess(default_max_pixels, DOTA_MAX_PIXELS)
+
     def test_import_dataset(self):
         with tempfile.TemporaryDirectory() as temp_dir:
             # Set import directory
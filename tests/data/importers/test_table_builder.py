@@ -0,0 +1,86 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+import unittest
+
+import pyarrow as pa
+
+from pixano.core import BBox, GtInfo, Image
+from pixano.data import Fields
+from pixano.data.importers import TableBuilder
+
+
+class TableBuilderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.fields = {
+            "id": "str",
+            "views": "[str]",
+            "image": "image",
+            "bbox": "bbox",
+            "vector": "vector(4)",
+        }
+        self.schema = Fields(self.fields).to_schema()
+        self.rows = [
+            {
+                "id": "1",
+                "views": ["image"],
+                "image": Image("image/1.jpg", None, b"preview").to_dict(),
+                "bbox": BBox.from_xywh([0.1, 0.2, 0.3, 0.4]).to_dict(),
+                "vector": [0.0, 1.0, 2.0, 3.0],
+                "label": "",
+            },
+            {
+                "id": "2",
+                "views": None,
+                "image": None,
+                "bbox": None,
+                "vector": None,
+            },
+        ]
+
+    def test_flush(self):
+        builder = TableBuilder(self.schema)
+        builder.extend(self.rows)
+        self.assertEqual(len(builder), 2)
+
+        table = builder.flush()
+
+        # Same table as row-oriented conversion, without fields out of schema
+        self.assertEqual(table.schema, self.schema)
+        self.assertEqual(table, pa.Table.from_pylist(self.rows, schema=self.schema))
+        self.assertEqual(table["image"][0].as_py().uri, "image/1.jpg")
+        self.assertFalse(table["bbox"][1].is_valid)
+
+        # Builder is cleared
+        self.assertEqual(len(builder), 0)
+        self.assertEqual(builder.flush().num_rows, 0)
+
+    def test_flush_nested_extension_types(self):
+        bbox = BBox.from_xywh([0.1, 0.2, 0.3, 0.4])
+        builder = TableBuilder(Fields({"id": "str", "gt_info": "gtinfo"}).to_schema())
+        builder.extend(
+            [
+                {"id": "1", "gt_info": GtInfo(bbox, bbox, 10, 8, 6, 0.6).to_dict()},
+                {"id": "2", "gt_info": None},
+            ]
+        )
+
+        # GtInfo contains BBox ExtensionTypes
+        table = builder.flush()
+
+        self.assertEqual(table.num_rows, 2)
+        gt_info = table["gt_info"][0].as_py()
+        self.assertEqual(gt_info.px_count_all, 10)
+        for value, expected in zip(gt_info.bbox_obj.coords, bbox.coords):
+            self.assertAlmostEqual(value, expected)
+        self.assertFalse(table["gt_info"][1].is_valid)
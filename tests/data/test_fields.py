@@ -17,6 +17,7 @@ import pyarrow as pa
 
 from pixano.core import ImageType
 from pixano.data import Fields
+from pixano.data.fields import parse_vector_type
 
 
 class FieldsTestCase(unittest.TestCase):
@@ -44,3 +45,21 @@ class FieldsTestCase(unittest.TestCase):
         for pyarrow_field in schema:
             self.assertIsInstance(pyarrow_field, pa.Field)
         self.assertEqual(schema, pa.schema(self.pyarrow_list))
+
+    def test_vector_types(self):
+        schema = Fields(
+            {
+                "view_1": "vector(512)",
+                "view_2": "vector(512, float16)",
+                "view_3": "vector(512, int8)",
+            }
+        ).to_schema()
+
+        self.assertEqual(schema.field("view_1").type, pa.list_(pa.float32(), 512))
+        self.assertEqual(schema.field("view_2").type, pa.list_(pa.float16(), 512))
+        self.assertEqual(schema.field("view_3").type, pa.list_(pa.int8(), 512))
+
+        self.assertEqual(parse_vector_type("vector(512)"), (512, "float32"))
+        self.assertEqual(parse_vector_type("vector(512, int8)"), (512, "int8"))
+        self.assertIsNone(parse_vector_type("vector(512, uint4)"))
+        self.assertIsNone(parse_vector_type("bytes"))
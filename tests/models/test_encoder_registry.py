@@ -0,0 +1,107 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+import threading
+import unittest
+
+from pixano.models import EncoderRegistry
+
+
+class CountingEncoder:
+    def __init__(self):
+        self.num_calls = 0
+
+    def semantic_search(self, text: str) -> list[float]:
+        self.num_calls += 1
+        return [float(len(text))]
+
+
+class EncoderRegistryTestCase(unittest.TestCase):
+    def setUp(self):
+        self.num_loads = 0
+        self.encoder = CountingEncoder()
+
+        def load_encoder():
+            self.num_loads += 1
+            return self.encoder
+
+        self.registry = EncoderRegistry(cache_size=2)
+        self.registry.register("counting", load_encoder)
+
+    def test_default(self):
+        registry = EncoderRegistry.default()
+
+        self.assertIsInstance(registry, EncoderRegistry)
+        self.assertIs(registry, EncoderRegistry.default())
+
+    def test_get_encoder(self):
+        # Encoder is loaded once
+        self.assertIs(self.registry.get_encoder("counting"), self.encoder)
+        self.assertIs(self.registry.get_encoder("counting"), self.encoder)
+        self.assertEqual(self.num_loads, 1)
+
+        # Unknown encoder
+        with self.assertRaises(ValueError):
+            self.registry.get_encoder("unknown")
+
+    def test_get_encoder_fallback(self):
+        fallback_encoder = CountingEncoder()
+        registry = EncoderRegistry(fallback=lambda: fallback_encoder)
+        registry.register("counting", lambda: self.encoder)
+
+        # Unregistered models share the fallback encoder
+        self.assertIs(registry.get_encoder("counting"), self.encoder)
+        self.assertIs(registry.get_encoder("unknown"), fallback_encoder)
+        self.assertIs(registry.get_encoder("other"), fallback_encoder)
+        self.assertEqual(registry.encode("unknown", "bear"), [4.0])
+
+    def test_get_encoder_loading(self):
+        loading = threading.Event()
+        loaded = threading.Event()
+
+        def load_slow_encoder():
+            loading.set()
+            loaded.wait(timeout=10)
+            return CountingEncoder()
+
+        self.registry.register("slow", load_slow_encoder)
+        self.registry.get_encoder("counting")
+        thread = threading.Thread(target=self.registry.get_encoder, args=("slow",))
+        thread.start()
+        loading.wait(timeout=10)
+
+        # Other encoders are available while an encoder loads
+        self.assertIs(self.registry.get_encoder("counting"), self.encoder)
+        self.assertEqual(self.registry.encode("counting", "bear"), [4.0])
+        self.assertFalse(loaded.is_set())
+
+        loaded.set()
+        thread.join()
+
+    def test_encode(self):
+        self.assertEqual(self.registry.encode("counting", "bear"), [4.0])
+        self.assertEqual(self.registry.encode("counting", "bear"), [4.0])
+        self.assertEqual(self.encoder.num_calls, 1)
+
+        # Least recently used query is evicted
+        self.registry.encode("counting", "cat")
+        self.registry.encode("counting", "bear")
+        self.registry.encode("counting", "zebra")
+        self.assertEqual(self.encoder.num_calls, 3)
+
+        self.registry.encode("counting", "cat")
+        self.assertEqual(self.encoder.num_calls, 4)
+
+    def test_warm(self):
+        self.registry.warm()
+        self.assertEqual(self.num_loads, 1)
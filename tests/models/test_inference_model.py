@@ -0,0 +1,62 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import lance
+import numpy as np
+import pyarrow as pa
+
+from pixano.data import DatasetTable, Fields
+from pixano.models import InferenceModel
+from pixano.utils import dequantize_vectors
+
+
+class InferenceModelTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.library_dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_quantize_table(self):
+        table = DatasetTable(
+            name="emb_test",
+            fields={"id": "str", "image": "vector(4, int8)"},
+            source="test",
+            type="search",
+        )
+        vectors = [[0.1, 0.2, 0.3, 0.4], [0.5, 0.5, 0.5, 0.5], [0.0, -0.5, 10.0, 1.0]]
+        lance_table = lance.write_dataset(
+            pa.Table.from_pylist(
+                [{"id": str(i), "image": v} for i, v in enumerate(vectors)],
+                schema=Fields({"id": "str", "image": "vector(4)"}).to_schema(),
+            ),
+            self.library_dir / "emb_test.lance",
+            max_rows_per_group=1,
+        )
+
+        quantized = InferenceModel._quantize_table(lance_table, table)
+
+        # Scale covers the largest value of all rows, so none is clipped
+        self.assertAlmostEqual(table.scales["image"], 10.0 / 127)
+        self.assertEqual(quantized.schema, Fields(table.fields).to_schema())
+        rows = quantized.to_table()["image"].to_pylist()
+        np.testing.assert_allclose(
+            dequantize_vectors(np.array(rows[2], dtype=np.int8), table.scales["image"]),
+            vectors[2],
+            atol=table.scales["image"],
+        )
@@ -0,0 +1,80 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from pixano.utils import ingest_media
+
+
+class IngestMediaTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.src_dir = Path(self.temp_dir.name) / "src"
+        (self.src_dir / "val").mkdir(parents=True)
+        for i in range(5):
+            (self.src_dir / "val" / f"{i}.png").write_bytes(bytes([i]) * 16)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def check_files(self, dst_dir: Path):
+        for i in range(5):
+            self.assertEqual(
+                (dst_dir / "val" / f"{i}.png").read_bytes(), bytes([i]) * 16
+            )
+
+    def test_copy(self):
+        dst_dir = Path(self.temp_dir.name) / "copy"
+
+        self.assertEqual(ingest_media(self.src_dir, dst_dir, "copy"), "copy")
+        self.check_files(dst_dir)
+        self.assertFalse(
+            os.path.samefile(self.src_dir / "val" / "0.png", dst_dir / "val" / "0.png")
+        )
+
+    def test_hardlink(self):
+        dst_dir = Path(self.temp_dir.name) / "hardlink"
+
+        self.assertEqual(ingest_media(self.src_dir, dst_dir, "hardlink"), "hardlink")
+        self.check_files(dst_dir)
+        self.assertTrue(
+            os.path.samefile(self.src_dir / "val" / "0.png", dst_dir / "val" / "0.png")
+        )
+
+        # Ingesting again keeps linked files
+        self.assertEqual(ingest_media(self.src_dir, dst_dir, "hardlink"), "hardlink")
+        self.check_files(dst_dir)
+
+    def test_symlink(self):
+        dst_dir = Path(self.temp_dir.name) / "symlink"
+
+        self.assertEqual(ingest_media(self.src_dir, dst_dir, "symlink"), "symlink")
+        self.check_files(dst_dir)
+        self.assertTrue((dst_dir / "val" / "0.png").is_symlink())
+
+    def test_auto(self):
+        dst_dir = Path(self.temp_dir.name) / "auto"
+
+        # Reflinks or hardlinks on the same filesystem
+        self.assertIn(
+            ingest_media(self.src_dir, dst_dir, "auto"), ["reflink", "hardlink"]
+        )
+        self.check_files(dst_dir)
+
+    def test_invalid_method(self):
+        with self.assertRaises(ValueError):
+            ingest_media(self.src_dir, Path(self.temp_dir.name) / "dst", "move")
@@ -0,0 +1,46 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+
+import struct
+import unittest
+import zlib
+
+from PIL import Image
+
+from pixano.utils import image_header
+
+
+def png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(data))
+        + chunk_type
+        + data
+        + struct.pack(">I", zlib.crc32(chunk_type + data))
+    )
+
+
+class ImageHeaderTestCase(unittest.TestCase):
+    def test_image_header_oversized(self):
+        # PNG header of a 40000x40000 image, above twice the Pillow limit
+        png = (
+            b"\x89PNG\r\n\x1a\n"
+            + png_chunk(b"IHDR", struct.pack(">IIBBBBB", 40000, 40000, 8, 0, 0, 0, 0))
+            + png_chunk(b"IDAT", zlib.compress(b""))
+            + png_chunk(b"IEND", b"")
+        )
+        max_pixels = Image.MAX_IMAGE_PIXELS
+        self.assertGreater(40000 * 40000, 2 * max_pixels)
+
+        self.assertEqual(image_header(png), (40000, 40000, "PNG"))
+        self.assertEqual(Image.MAX_IMAGE_PIXELS, max_pixels)
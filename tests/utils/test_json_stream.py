@@ -0,0 +1,53 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+import io
+import json
+import unittest
+
+from pixano.utils import iter_json_object
+
+
+class IterJSONObjectTestCase(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "info": {"year": 2017},
+            "images": [{"id": i, "file_name": f"{i}.jpg"} for i in range(100)],
+            "annotations": [],
+            "num_images": 100,
+            "categories": [{"id": 1, "name": "person"}],
+        }
+
+    def test_iter_json_object(self):
+        for indent in [None, 2]:
+            text = json.dumps(self.data, indent=indent)
+            # Values and array elements split over several chunks
+            for chunk_size in [1, 7, 1 << 20]:
+                items = list(iter_json_object(io.StringIO(text), chunk_size))
+
+                self.assertEqual(items[0], ("info", {"year": 2017}))
+                self.assertEqual(
+                    [value for key, value in items if key == "images"],
+                    self.data["images"],
+                )
+                self.assertNotIn("annotations", [key for key, _ in items])
+                self.assertIn(("num_images", 100), items)
+                self.assertEqual(items[-1], ("categories", {"id": 1, "name": "person"}))
+
+    def test_invalid_json(self):
+        self.assertEqual(list(iter_json_object(io.StringIO("{}"))), [])
+
+        with self.assertRaises(ValueError):
+            list(iter_json_object(io.StringIO('{"images": [{"id": 1}')))
+        with self.assertRaises(ValueError):
+            list(iter_json_object(io.StringIO('["images"]')))
@@ -0,0 +1,70 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from pixano.utils import TTLCache, file_version
+
+
+class FileVersionTestCase(unittest.TestCase):
+    def test_file_version(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = Path(temp_dir) / "db.json"
+            self.assertIsNone(file_version(file_path))
+
+            file_path.write_text("{}")
+            version = file_version(file_path)
+            self.assertEqual(version[1], 2)
+
+            file_path.write_text('{"id": "dataset"}')
+            self.assertNotEqual(file_version(file_path), version)
+
+
+class TTLCacheTestCase(unittest.TestCase):
+    def test_get_set(self):
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("b", 0), 0)
+
+    def test_maxsize(self):
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        # Least recently used entry is evicted
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+
+    def test_ttl(self):
+        cache = TTLCache(ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_clear(self):
+        cache = TTLCache()
+        cache.set("a", 1)
+        cache.clear()
+
+        self.assertEqual(len(cache), 0)
@@ -0,0 +1,85 @@
+# @Copyright: CEA-LIST/DIASI/SIALV/LVA (2023)
+# @Author: CEA-LIST/DIASI/SIALV/LVA <pixano@cea.fr>
+# @License: CECILL-C
+#
+# This software is a collaborative computer program whose purpose is to
+# generate and explore labeled data for computer vision applications.
+# This software is governed by the CeCILL-C license under French law and
+# abiding by the rules of distribution of free software. You can use,
+# modify and/ or redistribute the software under the terms of the CeCILL-C
+# license as circulated by CEA, CNRS and INRIA at the following URL
+#
+# http://www.cecill.info
+
+import io
+import unittest
+
+import numpy as np
+
+from pixano.utils import convert_npy, dequantize_vectors, quantize_vectors
+
+
+class VectorsTestCase(unittest.TestCase):
+    def setUp(self):
+        # Normalized vectors, like CLIP embeddings
+        rng = np.random.default_rng(0)
+        self.vectors = rng.standard_normal((2000, 512)).astype(np.float32)
+        self.vectors /= np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        self.queries = self.vectors[:50] + 0.02 * rng.standard_normal((50, 512)).astype(
+            np.float32
+        )
+
+    def test_quantize_vectors(self):
+        float16_vectors, scale = quantize_vectors(self.vectors, "float16")
+        self.assertEqual(float16_vectors.dtype, np.float16)
+        self.assertIsNone(scale)
+
+        int8_vectors, scale = quantize_vectors(self.vectors, "int8")
+        self.assertEqual(int8_vectors.dtype, np.int8)
+        self.assertAlmostEqual(scale, np.abs(self.vectors).max() / 127, places=6)
+
+        # Quantization error is at most half a step
+        dequantized = dequantize_vectors(int8_vectors, scale)
+        self.assertLessEqual(np.abs(dequantized - self.vectors).max(), scale / 2 + 1e-6)
+
+        # Values beyond the given scale are clipped
+        clipped, _ = quantize_vectors(np.array([[2.0, -2.0]]), "int8", scale=0.01)
+        self.assertEqual(clipped.tolist(), [[127, -127]])
+
+        with self.assertRaises(ValueError):
+            quantize_vectors(self.vectors, "uint4")
+
+    def test_recall(self):
+        k = 10
+
+        def nearest(vectors: np.ndarray) -> list[set]:
+            distances = np.square(vectors[None, :, :] - self.queries[:, None, :]).sum(
+                axis=2
+            )
+            return [set(row) for row in np.argsort(distances, axis=1)[:, :k]]
+
+        exact = nearest(self.vectors)
+        for dtype in ["float16", "int8"]:
+            vectors, scale = quantize_vectors(self.vectors, dtype)
+            results = nearest(dequantize_vectors(vectors, scale))
+            recall = np.mean([len(r & e) / k for r, e in zip(results, exact)])
+
+            # Recall budget of quantized storage
+            self.assertGreaterEqual(recall, 0.95, dtype)
+
+    def test_convert_npy(self):
+        buffer = io.BytesIO()
+        np.save(buffer, self.vectors[:4])
+        data = buffer.getvalue()
+
+        # Unchanged if already in requested type
+        self.assertIs(convert_npy(data, "float32"), data)
+
+        float16_data = convert_npy(data, "float16")
+        self.assertLess(len(float16_data), len(data))
+        array = np.load(io.BytesIO(convert_npy(float16_data, "float32")))
+        self.assertEqual(array.dtype, np.float32)
+        np.testing.assert_allclose(array, self.vectors[:4], atol=1e-3)
+
+        # Not a NumPy array file
+        self.assertEqual(convert_npy(b"data", "float32"), b"data")